@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
+
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository
+
+
+class PriceHistorySink(Protocol):
+    """What a backfill needs from a store (see ``ColumnarPriceStore``)."""
+
+    def completed(self) -> List[str]: ...
+
+    def write(self, symbol: str, df: pd.DataFrame) -> Dict: ...
+
+    def record_failure(self, symbol: str, detail: str) -> None: ...
+
+
+@dataclass
+class BackfillReport:
+    requested: int = 0
+    skipped: int = 0
+    written: int = 0
+    rows: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+def backfill_prices(
+    repo: PriceDataRepository,
+    store: PriceHistorySink,
+    symbols: Sequence[str],
+    days: int = 3650,
+    max_concurrency: int = 8,
+    refresh: bool = False,
+    on_progress: Optional[Callable[[str, Optional[str]], None]] = None,
+) -> BackfillReport:
+    """Download ``days`` of history for ``symbols`` into a columnar ``store``.
+
+    Fetches run on ``max_concurrency`` workers and each symbol is written as
+    soon as it arrives. Symbols already recorded in the store's manifest are
+    skipped unless ``refresh`` is set, so an interrupted run resumes where it
+    stopped. Failures are recorded in the manifest and retried on the next run.
+    ``on_progress(symbol, error)`` is called after every symbol.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    started = time.perf_counter()
+    unique_symbols = list(dict.fromkeys(symbols))
+    done = set() if refresh else set(store.completed())
+    pending = [symbol for symbol in unique_symbols if symbol not in done]
+    report = BackfillReport(
+        requested=len(unique_symbols), skipped=len(unique_symbols) - len(pending)
+    )
+
+    def load(symbol: str) -> int:
+        return store.write(symbol, repo.get_stock_data(symbol, days))["rows"]
+
+    if pending:
+        workers = min(max_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(load, symbol): symbol for symbol in pending}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                exc = future.exception()
+                if exc is not None:
+                    store.record_failure(symbol, str(exc))
+                    report.errors.append({"symbol": symbol, "detail": str(exc)})
+                else:
+                    report.written += 1
+                    report.rows += future.result()
+                if on_progress is not None:
+                    on_progress(symbol, str(exc) if exc is not None else None)
+
+    report.duration_seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository
+from app.domain.services.resample import get_default_resampler
+from app.domain.services.stop_loss_backtest import backtest_stops, stop_levels
+from app.domain.services.stop_loss_strategies import MACD_STRATEGY, validate_strategy
+
+from .get_stop_loss import _ensure_datetime_index
+
+
+def backtest_frame(
+    symbol: str,
+    stock_data: pd.DataFrame,
+    periodicity: str = "W",
+    num_elements: int = 20,
+    strategy: str = MACD_STRATEGY,
+) -> Dict:
+    """Backtest one symbol's stop-loss policy over its whole price history.
+
+    ``stock_data`` is the newest-first frame the repositories return. It is
+    resampled once and the stop level as of every bar comes from one sweep
+    (see ``stop_loss_backtest.stop_levels``), instead of evaluating the
+    policy again for each as-of date.
+    """
+    bars = get_default_resampler().resample(
+        _ensure_datetime_index(stock_data), periodicity, symbol=symbol
+    )
+    result = backtest_stops(bars, stop_levels(bars, strategy, num_elements))
+    return {
+        "symbol": symbol,
+        "period": periodicity,
+        "strategy": strategy,
+        **result.as_dict(),
+    }
+
+
+def _backtest_symbol(
+    repo: PriceDataRepository,
+    symbol: str,
+    periodicity: str,
+    num_elements: int,
+    strategy: str,
+    days: int,
+) -> Dict:
+    df = repo.get_stock_data(symbol, days)
+    return backtest_frame(symbol, df, periodicity, num_elements, strategy)
+
+
+def backtest_stop_loss(
+    repo: PriceDataRepository,
+    symbols: List[str],
+    periodicity: str = "W",
+    num_elements: int = 20,
+    strategy: str = MACD_STRATEGY,
+    days: int = 3650,
+    max_concurrency: int = 8,
+) -> Dict[str, List[Dict]]:
+    """Backtest a stop-loss strategy on many symbols concurrently.
+
+    Like ``get_stop_loss_batch``: symbols are fetched and evaluated on a pool
+    of ``max_concurrency`` workers, duplicates are evaluated once, and the
+    result maps ``results`` (one ``backtest_frame`` summary per symbol, in
+    input order) and ``errors`` (``{"symbol", "detail"}``).
+    """
+    validate_strategy(strategy)
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return {"results": [], "errors": []}
+
+    workers = min(max_concurrency, len(unique_symbols))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _backtest_symbol,
+                repo,
+                symbol,
+                periodicity,
+                num_elements,
+                strategy,
+                days,
+            )
+            for symbol in unique_symbols
+        ]
+
+    results: List[Dict] = []
+    errors: List[Dict] = []
+    for symbol, future in zip(unique_symbols, futures):
+        exc = future.exception()
+        if exc is not None:
+            errors.append({"symbol": symbol, "detail": str(exc)})
+        else:
+            results.append(future.result())
+
+    return {"results": results, "errors": errors}
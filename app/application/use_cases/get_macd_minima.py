@@ -1,12 +1,31 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
-from app.domain.repositories import PriceDataRepository
+from app.domain.repositories import (
+    AsyncPriceDataRepository,
+    IndicatorKey,
+    IndicatorStore,
+    MacdCalculator,
+    PriceDataRepository,
+)
 from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.fused_macd import DTYPES, FusedMacdCalculator
 from app.domain.services.macd_minima import get_macd_minima_from_macd
+from app.domain.services.panel_macd import (
+    ClosePanel,
+    build_close_panel,
+    macd_panel,
+    panel_latest_minima,
+    panel_macd_minima,
+)
+from app.domain.services.resample import get_default_resampler
+from app.domain.services.streaming_macd import resume_macd
 
 
 def _ensure_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
@@ -16,20 +35,6 @@ def _ensure_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _resample(df: pd.DataFrame, periodicity: str) -> pd.DataFrame:
-    logic = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
-    df_local = df.set_index("date").resample(periodicity).apply(logic)
-    df_local["date"] = df_local.index
-    df_local.index = range(1, len(df_local) + 1)
-    return df_local
-
-
 def get_macd_minima(
     repo: PriceDataRepository,
     symbol: str,
@@ -46,12 +51,116 @@ def get_macd_minima(
     later be replaced with a pluggable MACD calculator.
     """
     df = repo.get_stock_data(symbol, days)
+    return macd_minima_rows(df, symbol, periodicity=periodicity, window=window)
+
+
+async def get_macd_minima_async(
+    repo: AsyncPriceDataRepository,
+    symbol: str,
+    days: int,
+    periodicity: str = "W",
+    window: int = 1,
+    offload: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> List[Dict]:
+    """Async variant of ``get_macd_minima`` that awaits the repository fetch.
+
+    With ``offload(fn, *args)`` the minima are computed through it, off the
+    event loop, instead of inline.
+    """
+    frame = await get_macd_minima_frame_async(
+        repo, symbol, days, periodicity=periodicity, window=window, offload=offload
+    )
+    return minima_frame_rows(frame, symbol, periodicity)
+
+
+async def get_macd_minima_frame_async(
+    repo: AsyncPriceDataRepository,
+    symbol: str,
+    days: int,
+    periodicity: str = "W",
+    window: int = 1,
+    offload: Optional[Callable[..., Awaitable[Any]]] = None,
+    calculator: Optional[MacdCalculator] = None,
+) -> pd.DataFrame:
+    """Like ``get_macd_minima_async`` but return the minima frame itself.
+
+    The frame has columns date, macd and price, sorted by date, so callers can
+    serialize it column by column instead of going through per-row dicts.
+    ``calculator`` replaces the default 12/26 EMA MACD on closes.
+    """
+    df = await repo.get_stock_data(symbol, days)
+    args = (df, symbol, periodicity, window, calculator)
+    if offload is None:
+        return macd_minima_frame(*args)
+    return await offload(macd_minima_frame, *args)
+
+
+async def get_macd_lines_async(
+    repo: AsyncPriceDataRepository,
+    symbol: str,
+    days: int,
+    periodicity: str = "W",
+    calculator: Optional[FusedMacdCalculator] = None,
+    offload: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> pd.DataFrame:
+    """MACD, signal and histogram of a symbol's resampled history.
+
+    Returns a frame with columns date, macd, signal and histogram, sorted by
+    date; ``offload`` is as in ``get_macd_minima_async``.
+    """
+    df = await repo.get_stock_data(symbol, days)
+    args = (df, symbol, periodicity, calculator or FusedMacdCalculator())
+    if offload is None:
+        return macd_lines_frame(*args)
+    return await offload(macd_lines_frame, *args)
+
+
+def macd_minima_rows(
+    df: pd.DataFrame, symbol: str, periodicity: str = "W", window: int = 1
+) -> List[Dict]:
+    """Compute MACD minima rows from an already fetched OHLCV frame."""
+    frame = macd_minima_frame(df, symbol, periodicity=periodicity, window=window)
+    return minima_frame_rows(frame, symbol, periodicity)
+
+
+def macd_minima_frame(
+    df: pd.DataFrame,
+    symbol: str,
+    periodicity: str = "W",
+    window: int = 1,
+    calculator: Optional[MacdCalculator] = None,
+) -> pd.DataFrame:
+    """Compute the MACD minima frame (date, macd, price) of an OHLCV frame."""
     df = _ensure_datetime_index(df).reset_index(drop=True)
-    df_resampled = _resample(df, periodicity)
+    df_resampled = get_default_resampler().resample(df, periodicity, symbol=symbol)
 
-    macd_series = EmaMacdCalculator().get_macd(df_resampled)
-    minima_df = get_macd_minima_from_macd(df_resampled, macd_series, window=window)
+    macd_series = (calculator or EmaMacdCalculator()).get_macd(df_resampled)
+    return get_macd_minima_from_macd(df_resampled, macd_series, window=window)
+
+
+def macd_lines_frame(
+    df: pd.DataFrame,
+    symbol: str,
+    periodicity: str,
+    calculator: FusedMacdCalculator,
+) -> pd.DataFrame:
+    """Resample an OHLCV frame and compute its MACD lines in one pass."""
+    df = _ensure_datetime_index(df).reset_index(drop=True)
+    df_resampled = get_default_resampler().resample(df, periodicity, symbol=symbol)
+    lines = calculator.lines(df_resampled)
+    return pd.DataFrame(
+        {
+            "date": df_resampled["date"].to_numpy(),
+            "macd": lines.macd,
+            "signal": lines.signal,
+            "histogram": lines.histogram,
+        }
+    )
 
+
+def minima_frame_rows(
+    minima_df: pd.DataFrame, symbol: str, periodicity: str
+) -> List[Dict]:
     rows: List[Dict] = []
     for _, row in minima_df.iterrows():
         rows.append(
@@ -65,3 +174,100 @@ def get_macd_minima(
         )
 
     return rows
+
+
+def get_macd_minima_panel(
+    repo: PriceDataRepository,
+    symbols: List[str],
+    days: int,
+    periodicity: str = "W",
+    window: int = 1,
+    max_concurrency: int = 8,
+    dtype: str = "float64",
+    macd_states: Optional[IndicatorStore] = None,
+) -> Dict[str, Any]:
+    """Compute MACD minima rows for many symbols at once.
+
+    Histories are fetched on ``max_concurrency`` workers, aligned into a single
+    dates x symbols array and run through one vectorized MACD pass instead of
+    one pandas pipeline per symbol. Rows match ``get_macd_minima`` for each
+    symbol and are grouped by symbol in input order. As with
+    ``get_stop_loss_batch`` the result is a mapping with ``results`` and
+    ``errors`` (``{"symbol", "detail"}`` for symbols that could not be
+    fetched); duplicate symbols are evaluated once. ``dtype="float32"``
+    halves the MACD panel for memory-bound runs over many symbols.
+
+    ``latest`` maps every fetched symbol to its most recent minimum as a
+    ``LatestMinimum`` (``None`` when it has none), for a
+    ``LatestMinimaIndex``.
+
+    With ``macd_states``, each symbol's MACD continues from the checkpoint
+    saved there under ``IndicatorKey(symbol, periodicity)`` by the previous
+    run (see ``resume_macd``), so bars added since then are the only ones
+    computed, and the new checkpoint is saved back. The rows are the same.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return {"results": [], "errors": [], "latest": {}}
+
+    workers = min(max_concurrency, len(unique_symbols))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(repo.get_stock_data, symbol, days) for symbol in unique_symbols
+        ]
+
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: List[Dict] = []
+    for symbol, future in zip(unique_symbols, futures):
+        exc = future.exception()
+        if exc is not None:
+            errors.append({"symbol": symbol, "detail": str(exc)})
+        else:
+            frames[symbol] = future.result()
+
+    panel = build_close_panel(frames, periodicity)
+    if macd_states is None:
+        macd = macd_panel(panel, dtype=dtype)
+    else:
+        macd = _resumed_macd_panel(panel, periodicity, macd_states, dtype)
+    minima = panel_macd_minima(panel, macd, window=window)
+
+    results: List[Dict] = []
+    for symbol in panel.symbols:
+        for date, price, macd in minima[symbol].itertuples(index=False):
+            results.append(
+                {
+                    "symbol": symbol,
+                    "date": date,
+                    "macd": float(macd),
+                    "price": float(price),
+                    "period": periodicity,
+                }
+            )
+
+    latest = panel_latest_minima(panel, minima)
+    return {"results": results, "errors": errors, "latest": latest}
+
+
+def _resumed_macd_panel(
+    panel: ClosePanel, periodicity: str, states: IndicatorStore, dtype: str
+) -> np.ndarray:
+    """``macd_panel`` one symbol at a time, resuming each from ``states``."""
+    if dtype not in DTYPES:
+        raise ValueError(
+            f"Unknown dtype '{dtype}'. Expected one of: {', '.join(DTYPES)}"
+        )
+    macd = np.full(panel.closes.shape, np.nan, dtype=DTYPES[dtype])
+    for col, symbol in enumerate(panel.symbols):
+        start, stop = int(panel.first[col]), int(panel.last[col]) + 1
+        key = IndicatorKey(symbol, periodicity)
+        saved = states.get(key)
+        values, checkpoint, _ = resume_macd(
+            panel.closes[start:stop, col], saved.value if saved else None
+        )
+        macd[start:stop, col] = values
+        states.put(key, checkpoint, time.time())
+    return macd
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
-from typing import Callable, Dict, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
 
 import pandas as pd
 
-from app.domain.repositories import PriceDataRepository
+from app.domain.repositories import AsyncPriceDataRepository, PriceDataRepository
+from app.domain.services.stop_loss_strategies import (
+    InsufficientHistoryError,
+    evaluate_stop_loss_strategies,
+)
 
 
 def _ensure_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
@@ -14,6 +29,12 @@ def _ensure_datetime_index(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _current_price(symbol: str, df: pd.DataFrame) -> float:
+    if df.empty:
+        raise InsufficientHistoryError(f"No price history for symbol '{symbol}'")
+    return float(df.iloc[0].close)
+
+
 def get_stop_loss(
     repo: PriceDataRepository,
     symbols: List[str],
@@ -34,21 +55,257 @@ def get_stop_loss(
 
     results: List[Dict] = []
     for symbol in symbols:
-        df = repo.get_stock_data(symbol, days)
-        df = _ensure_datetime_index(df)
-        current_price = float(df.iloc[0].close)
-
-        data = strategy(symbol, df, periodicity, num_elements)
-
         results.append(
-            {
-                "symbol": symbol,
-                "current_price": current_price,
-                "stop_loss": data.get("stop_loss"),
-                "stop_loss_date": data.get("stop_loss_date"),
-                "max_macd_date": data.get("max_macd_date"),
-                "period": periodicity,
-            }
+            _stop_loss_row(repo, symbol, periodicity, num_elements, strategy, days)
         )
 
     return results
+
+
+def _stop_loss_row(
+    repo: PriceDataRepository,
+    symbol: str,
+    periodicity: str,
+    num_elements: int,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+    days: int,
+) -> Dict:
+    df = repo.get_stock_data(symbol, days)
+    return _stop_loss_row_from_frame(symbol, df, periodicity, num_elements, strategy)
+
+
+def _stop_loss_rows(
+    repo: PriceDataRepository,
+    symbol: str,
+    periodicity: str,
+    num_elements: int,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+    days: int,
+    strategies: Optional[Sequence[str]],
+) -> List[Dict]:
+    df = repo.get_stock_data(symbol, days)
+    return _strategy_rows_from_frame(
+        symbol, df, periodicity, num_elements, strategy, strategies
+    )
+
+
+def _stop_loss_row_from_frame(
+    symbol: str,
+    df: pd.DataFrame,
+    periodicity: str,
+    num_elements: int,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+) -> Dict:
+    df = _ensure_datetime_index(df)
+    current_price = _current_price(symbol, df)
+
+    data = strategy(symbol, df, periodicity, num_elements)
+
+    return {
+        "symbol": symbol,
+        "current_price": current_price,
+        "stop_loss": data.get("stop_loss"),
+        "stop_loss_date": data.get("stop_loss_date"),
+        "max_macd_date": data.get("max_macd_date"),
+        "period": periodicity,
+    }
+
+
+def _strategy_rows_from_frame(
+    symbol: str,
+    df: pd.DataFrame,
+    periodicity: str,
+    num_elements: int,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+    strategies: Optional[Sequence[str]],
+) -> List[Dict]:
+    # Without ``strategies`` only ``strategy`` runs and rows carry no
+    # ``strategy`` key, as before named strategies existed
+    if strategies is None:
+        return [
+            _stop_loss_row_from_frame(symbol, df, periodicity, num_elements, strategy)
+        ]
+    df = _ensure_datetime_index(df)
+    current_price = _current_price(symbol, df)
+    results = evaluate_stop_loss_strategies(
+        symbol, df, periodicity, num_elements, strategies, macd_strategy=strategy
+    )
+    return [
+        {
+            "symbol": symbol,
+            "current_price": current_price,
+            "stop_loss": data.get("stop_loss"),
+            "stop_loss_date": data.get("stop_loss_date"),
+            "max_macd_date": data.get("max_macd_date"),
+            "period": periodicity,
+            "strategy": name,
+        }
+        for name, data in zip(strategies, results)
+    ]
+
+
+async def get_stop_loss_async(
+    repo: AsyncPriceDataRepository,
+    symbols: List[str],
+    periodicity: str = "W",
+    num_elements: int = 20,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict] | None = None,
+    days: int = 3650,
+    offload: Optional[Callable[..., Awaitable[Any]]] = None,
+) -> List[Dict]:
+    """Async variant of ``get_stop_loss``.
+
+    Fetches for all symbols are awaited concurrently; the repository bounds how
+    many are actually in flight. Rows are returned in ``symbols`` order.
+
+    ``offload(fn, *args)`` runs the CPU-bound part (resampling, MACD and the
+    stop-loss search) off the event loop, e.g. ``ComputePool.run``; without it
+    the rows are computed inline.
+    """
+    if strategy is None:
+        raise ValueError("strategy callable must be provided")
+
+    frames = await asyncio.gather(
+        *(repo.get_stock_data(symbol, days) for symbol in symbols)
+    )
+    args = (list(symbols), frames, periodicity, num_elements, strategy)
+    if offload is None:
+        return _stop_loss_rows_from_frames(*args)
+    return await offload(_stop_loss_rows_from_frames, *args)
+
+
+def _stop_loss_rows_from_frames(
+    symbols: List[str],
+    frames: List[pd.DataFrame],
+    periodicity: str,
+    num_elements: int,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+) -> List[Dict]:
+    return [
+        _stop_loss_row_from_frame(symbol, df, periodicity, num_elements, strategy)
+        for symbol, df in zip(symbols, frames)
+    ]
+
+
+async def iter_stop_loss_rows(
+    repo: AsyncPriceDataRepository,
+    symbols: List[str],
+    periodicity: str = "W",
+    num_elements: int = 20,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict] | None = None,
+    days: int = 3650,
+    max_concurrency: int = 8,
+    offload: Optional[Callable[..., Awaitable[Any]]] = None,
+    strategies: Optional[Sequence[str]] = None,
+) -> AsyncIterator[Dict]:
+    """Yield stop-loss rows for many symbols as each one finishes.
+
+    At most ``max_concurrency`` symbols are fetched and evaluated at a time,
+    and the next one starts only when a finished row has been consumed, so
+    memory stays bounded by the window however many symbols are requested
+    and however slowly the caller reads. Rows are yielded in completion
+    order. A symbol that fails yields ``{"symbol", "detail"}`` instead of a
+    row, as in the ``errors`` of ``get_stop_loss_batch``. Duplicate symbols are evaluated once. ``offload`` is as in
+    ``get_stop_loss_async`` and ``strategies`` as in ``get_stop_loss_batch``;
+    the rows of one symbol are yielded together.
+    """
+    if strategy is None:
+        raise ValueError("strategy callable must be provided")
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    async def evaluate(symbol: str) -> List[Dict]:
+        df = await repo.get_stock_data(symbol, days)
+        args = (symbol, df, periodicity, num_elements, strategy, strategies)
+        if offload is None:
+            return _strategy_rows_from_frame(*args)
+        return await offload(_strategy_rows_from_frame, *args)
+
+    pending_symbols = iter(dict.fromkeys(symbols))
+    running: Dict[asyncio.Task, str] = {}
+
+    def start_next() -> None:
+        symbol = next(pending_symbols, None)
+        if symbol is not None:
+            running[asyncio.ensure_future(evaluate(symbol))] = symbol
+
+    for _ in range(max_concurrency):
+        start_next()
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                symbol = running.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    yield {"symbol": symbol, "detail": str(exc)}
+                else:
+                    for row in task.result():
+                        yield row
+                start_next()
+    finally:
+        # The caller stopped early (e.g. the client disconnected)
+        for task in running:
+            task.cancel()
+
+
+def get_stop_loss_batch(
+    repo: PriceDataRepository,
+    symbols: List[str],
+    periodicity: str = "W",
+    num_elements: int = 20,
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict] | None = None,
+    days: int = 3650,
+    max_concurrency: int = 8,
+    strategies: Optional[Sequence[str]] = None,
+) -> Dict[str, List[Dict]]:
+    """Compute stop-loss rows for many symbols concurrently.
+
+    Each symbol is fetched and evaluated on a pool of ``max_concurrency``
+    workers, which also bounds the number of upstream requests in flight.
+    Failures are isolated per symbol: the result is a mapping with ``results``
+    (rows as returned by ``get_stop_loss``, in input order) and ``errors``
+    (``{"symbol", "detail"}`` entries for symbols that could not be computed).
+    Duplicate symbols are evaluated once.
+
+    ``strategies`` names stop-loss strategies (see
+    ``stop_loss_strategies.STOP_LOSS_STRATEGIES``) to evaluate on every
+    symbol; each symbol is then resampled once and yields one row per
+    strategy, tagged with ``strategy``. ``strategy`` serves as the ``macd``
+    policy.
+    """
+    if strategy is None:
+        raise ValueError("strategy callable must be provided")
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    unique_symbols = list(dict.fromkeys(symbols))
+    if not unique_symbols:
+        return {"results": [], "errors": []}
+
+    workers = min(max_concurrency, len(unique_symbols))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _stop_loss_rows,
+                repo,
+                symbol,
+                periodicity,
+                num_elements,
+                strategy,
+                days,
+                strategies,
+            )
+            for symbol in unique_symbols
+        ]
+
+    results: List[Dict] = []
+    errors: List[Dict] = []
+    for symbol, future in zip(unique_symbols, futures):
+        exc = future.exception()
+        if exc is not None:
+            errors.append({"symbol": symbol, "detail": str(exc)})
+        else:
+            results.extend(future.result())
+
+    return {"results": results, "errors": errors}
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from app.application.use_cases.get_macd_minima import get_macd_minima_panel
+from app.application.use_cases.get_stop_loss import get_stop_loss_batch
+from app.domain.repositories import (
+    IndicatorKey,
+    IndicatorStore,
+    LatestMinimaIndex,
+    PriceDataRepository,
+)
+
+
+@dataclass
+class RefreshReport:
+    started_at: float
+    finished_at: float = 0.0
+    symbols: int = 0
+    stored: int = 0
+    errors: List[Dict] = field(default_factory=list)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+    def as_dict(self) -> Dict:
+        return {**asdict(self), "duration_seconds": self.duration_seconds}
+
+
+def refresh_indicators(
+    repo: PriceDataRepository,
+    store: IndicatorStore,
+    symbols: Sequence[str],
+    strategy: Callable[[str, pd.DataFrame, str, int], Dict],
+    stop_loss_params: Sequence[Tuple[str, int]] = (("MS", 10),),
+    minima_params: Sequence[Tuple[str, int]] = (("W", 1),),
+    days: int = 3650,
+    max_concurrency: int = 8,
+    clock: Callable[[], float] = time.time,
+    macd_dtype: str = "float64",
+    minima_index: Optional[LatestMinimaIndex] = None,
+    macd_states: Optional[IndicatorStore] = None,
+) -> RefreshReport:
+    """Recompute stop-loss and MACD minima results for ``symbols`` into ``store``.
+
+    ``stop_loss_params`` lists ``(periodicity, num_elements)`` pairs and
+    ``minima_params`` lists ``(periodicity, window)`` pairs. Results are stored
+    under ``IndicatorKey`` with the completion time of the run step that
+    produced them. Symbols that fail keep their previous entries and are listed
+    in the report's ``errors``. ``macd_dtype`` is passed to
+    ``get_macd_minima_panel``. When ``minima_index`` is given, the latest
+    minimum of every symbol is indexed for each minima pair as well.
+    ``macd_states`` keeps each symbol's MACD checkpoint between runs, so a
+    run only computes the MACD of bars added since the previous one.
+    """
+    report = RefreshReport(started_at=clock(), symbols=len(set(symbols)))
+    if not symbols:
+        report.finished_at = clock()
+        return report
+
+    for periodicity, num_elements in stop_loss_params:
+        batch = get_stop_loss_batch(
+            repo,
+            list(symbols),
+            periodicity=periodicity,
+            num_elements=num_elements,
+            strategy=strategy,
+            days=days,
+            max_concurrency=max_concurrency,
+        )
+        computed_at = clock()
+        for row in batch["results"]:
+            key = IndicatorKey(row["symbol"], periodicity, num_elements=num_elements)
+            store.put(key, row, computed_at)
+            report.stored += 1
+        report.errors.extend(batch["errors"])
+
+    for periodicity, window in minima_params:
+        panel = get_macd_minima_panel(
+            repo,
+            list(symbols),
+            days=days,
+            periodicity=periodicity,
+            window=window,
+            max_concurrency=max_concurrency,
+            dtype=macd_dtype,
+            macd_states=macd_states,
+        )
+        failed = {error["symbol"] for error in panel["errors"]}
+        rows_by_symbol: Dict[str, List[Dict]] = {
+            symbol: [] for symbol in dict.fromkeys(symbols) if symbol not in failed
+        }
+        for row in panel["results"]:
+            rows_by_symbol[row["symbol"]].append(row)
+        computed_at = clock()
+        for symbol, rows in rows_by_symbol.items():
+            store.put(
+                IndicatorKey(symbol, periodicity, window=window), rows, computed_at
+            )
+            report.stored += 1
+        if minima_index is not None:
+            minima_index.update(periodicity, window, panel["latest"], computed_at)
+        report.errors.extend(panel["errors"])
+
+    report.finished_at = clock()
+    return report
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from app.domain.repositories import (
+    LatestMinimaIndex,
+    MinimaScreenPage,
+    PriceDataRepository,
+)
+
+from .get_macd_minima import get_macd_minima_panel
+
+
+def index_latest_minima(
+    repo: PriceDataRepository,
+    index: LatestMinimaIndex,
+    symbols: Sequence[str],
+    periodicity: str = "W",
+    window: int = 1,
+    days: int = 3650,
+    max_concurrency: int = 8,
+    dtype: str = "float64",
+    clock: Callable[[], float] = time.time,
+) -> List[Dict]:
+    """Compute the latest MACD minimum of ``symbols`` into ``index``.
+
+    One ``get_macd_minima_panel`` run over the universe; symbols that fail
+    keep their previous entry. Returns the per-symbol errors.
+    """
+    panel = get_macd_minima_panel(
+        repo,
+        list(symbols),
+        days=days,
+        periodicity=periodicity,
+        window=window,
+        max_concurrency=max_concurrency,
+        dtype=dtype,
+    )
+    index.update(periodicity, window, panel["latest"], clock())
+    return panel["errors"]
+
+
+def screen_macd_minima(
+    repo: PriceDataRepository,
+    index: LatestMinimaIndex,
+    symbols: Sequence[str],
+    periodicity: str = "W",
+    window: int = 1,
+    within: int = 5,
+    offset: int = 0,
+    limit: int = 50,
+    days: int = 3650,
+    max_concurrency: int = 8,
+    dtype: str = "float64",
+    max_age_seconds: float = 36 * 3600,
+    clock: Callable[[], float] = time.time,
+    coalesce: Optional[
+        Callable[[Hashable, Callable[[], List[Dict]]], List[Dict]]
+    ] = None,
+) -> Tuple[MinimaScreenPage, List[Dict]]:
+    """Symbols of the universe whose latest MACD minimum is ``within`` bars old.
+
+    Served from ``index``, which the indicator refresh keeps current; when
+    the ``(periodicity, window)`` pair was never indexed or is older than
+    ``max_age_seconds``, the universe is indexed first with
+    ``index_latest_minima``. ``coalesce(key, fn)`` (e.g.
+    ``SingleFlight.do``) lets concurrent requests for the same pair share
+    that run. Returns the page and the errors of that run (empty when the
+    index was used as is).
+    """
+    if within < 1:
+        raise ValueError("within must be a positive number of bars")
+    if offset < 0 or limit <= 0:
+        raise ValueError("offset must not be negative and limit must be positive")
+
+    errors: List[Dict] = []
+    page: Optional[MinimaScreenPage] = index.screen(
+        periodicity, window, within, offset, limit
+    )
+    if page is None or clock() - page.computed_at > max_age_seconds:
+
+        def rebuild() -> List[Dict]:
+            return index_latest_minima(
+                repo,
+                index,
+                symbols,
+                periodicity,
+                window,
+                days=days,
+                max_concurrency=max_concurrency,
+                dtype=dtype,
+                clock=clock,
+            )
+
+        key = ("latest-minima", periodicity, window)
+        errors = coalesce(key, rebuild) if coalesce is not None else rebuild()
+        page = index.screen(periodicity, window, within, offset, limit)
+    if page is None:
+        page = MinimaScreenPage([], 0, clock())
+    return page, errors
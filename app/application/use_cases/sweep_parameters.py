@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.parameter_sweep import (
+    BACKTEST_COLUMNS,
+    minima_sweep,
+    stop_loss_sweep,
+    validate_grid,
+)
+from app.domain.services.resample import get_default_resampler
+
+from .get_stop_loss import _ensure_datetime_index
+
+STOP_LOSS_COLUMNS = (
+    "symbol",
+    "periodicity",
+    "num_elements",
+    "current_price",
+    "stop_loss",
+    "stop_loss_date",
+    "max_macd_date",
+    *BACKTEST_COLUMNS,
+)
+MINIMA_COLUMNS = ("symbol", "periodicity", "window", "date", "macd", "price")
+
+
+@dataclass
+class SweepGrid:
+    """Parameter values to evaluate; every combination is computed."""
+
+    periodicities: Sequence[str] = ("W",)
+    windows: Sequence[int] = (1,)
+    num_elements: Sequence[int] = (20,)
+
+    def __post_init__(self) -> None:
+        self.periodicities = list(dict.fromkeys(self.periodicities))
+        if not self.periodicities:
+            raise ValueError("periodicities grid must not be empty")
+        self.windows = validate_grid("windows", self.windows)
+        self.num_elements = validate_grid("num_elements", self.num_elements)
+
+
+@dataclass
+class SweepReport:
+    """Tidy result tables of a sweep, one row per symbol and parameter value.
+
+    ``stop_loss`` has ``STOP_LOSS_COLUMNS``: the stop loss ``get_stop_loss``
+    returns today for each ``(periodicity, num_elements)`` plus its backtest
+    over the history. ``macd_minima`` has ``MINIMA_COLUMNS``: the rows
+    ``get_macd_minima`` returns for each ``(periodicity, window)``.
+    """
+
+    stop_loss: pd.DataFrame
+    macd_minima: pd.DataFrame
+    requested: int = 0
+    errors: List[Dict] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        return {"stop_loss": self.stop_loss, "macd_minima": self.macd_minima}
+
+
+def sweep_frame(
+    symbol: str, stock_data: pd.DataFrame, grid: SweepGrid
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Evaluate the whole ``grid`` on one symbol's fetched history.
+
+    The history is resampled and its MACD computed once per periodicity;
+    every window and ``num_elements`` reuses them.
+    """
+    df = _ensure_datetime_index(stock_data).reset_index(drop=True)
+    current_price = float(df.iloc[0].close)
+    stop_loss_parts: List[pd.DataFrame] = []
+    minima_parts: List[pd.DataFrame] = []
+    for periodicity in grid.periodicities:
+        bars = get_default_resampler().resample(df, periodicity, symbol=symbol)
+        macd = EmaMacdCalculator().get_macd(bars)
+
+        stops = pd.DataFrame(stop_loss_sweep(bars, macd, grid.num_elements))
+        stops.insert(0, "symbol", symbol)
+        stops.insert(1, "periodicity", periodicity)
+        stops.insert(3, "current_price", current_price)
+        stop_loss_parts.append(stops)
+
+        minima = pd.DataFrame(minima_sweep(bars, macd, grid.windows))
+        minima.insert(0, "symbol", symbol)
+        minima.insert(1, "periodicity", periodicity)
+        minima_parts.append(minima)
+    return (
+        pd.concat(stop_loss_parts, ignore_index=True),
+        pd.concat(minima_parts, ignore_index=True),
+    )
+
+
+def sweep_parameters(
+    repo: PriceDataRepository,
+    symbols: Sequence[str],
+    grid: SweepGrid,
+    days: int = 3650,
+    max_concurrency: int = 8,
+    on_progress: Optional[Callable[[str, Optional[str]], None]] = None,
+) -> SweepReport:
+    """Evaluate a parameter grid for many symbols, loading each symbol once.
+
+    Symbols are fetched and swept on ``max_concurrency`` workers (see
+    ``sweep_frame``), instead of one API call per parameter combination.
+    Failures are isolated per symbol in ``errors`` (``{"symbol",
+    "detail"}``); duplicate symbols are evaluated once and the tables keep
+    input order. ``on_progress(symbol, error)`` is called after every
+    symbol.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    started = time.perf_counter()
+    unique_symbols = list(dict.fromkeys(symbols))
+    results: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+    errors: Dict[str, Dict] = {}
+
+    def evaluate(symbol: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        return sweep_frame(symbol, repo.get_stock_data(symbol, days), grid)
+
+    if unique_symbols:
+        workers = min(max_concurrency, len(unique_symbols))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(evaluate, symbol): symbol for symbol in unique_symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                exc = future.exception()
+                if exc is not None:
+                    errors[symbol] = {"symbol": symbol, "detail": str(exc)}
+                else:
+                    results[symbol] = future.result()
+                if on_progress is not None:
+                    on_progress(symbol, str(exc) if exc is not None else None)
+
+    ordered = [results[symbol] for symbol in unique_symbols if symbol in results]
+    return SweepReport(
+        stop_loss=_concat([stops for stops, _ in ordered], STOP_LOSS_COLUMNS),
+        macd_minima=_concat([minima for _, minima in ordered], MINIMA_COLUMNS),
+        requested=len(unique_symbols),
+        errors=[errors[symbol] for symbol in unique_symbols if symbol in errors],
+        duration_seconds=time.perf_counter() - started,
+    )
+
+
+def _concat(frames: List[pd.DataFrame], columns: Sequence[str]) -> pd.DataFrame:
+    if not frames:
+        return pd.DataFrame(columns=list(columns))
+    return pd.concat(frames, ignore_index=True)[list(columns)]
@@ -1,7 +1,21 @@
+from .indicator_store import IndicatorKey, IndicatorStore, StoredIndicator
+from .latest_minima_index import LatestMinimaIndex, LatestMinimum, MinimaScreenPage
 from .macd_calculator import MacdCalculator
-from .price_data_repository import PriceDataRepository
+from .price_data_repository import (
+    AsyncPriceDataRepository,
+    PriceDataRepository,
+    RangePriceDataRepository,
+)
 
 __all__ = [
+    "AsyncPriceDataRepository",
     "PriceDataRepository",
+    "RangePriceDataRepository",
     "MacdCalculator",
+    "IndicatorKey",
+    "IndicatorStore",
+    "StoredIndicator",
+    "LatestMinimaIndex",
+    "LatestMinimum",
+    "MinimaScreenPage",
 ]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, List, NamedTuple, Optional
+
+
+class IndicatorKey(NamedTuple):
+    """Identifies one precomputed result.
+
+    Stop-loss results set ``num_elements`` and leave ``window`` as ``None``;
+    MACD minima results do the opposite.
+    """
+
+    symbol: str
+    periodicity: str
+    window: Optional[int] = None
+    num_elements: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class StoredIndicator:
+    value: Any
+    computed_at: float
+
+
+class IndicatorStore(ABC):
+    """Port for results computed ahead of time by a refresh job."""
+
+    @abstractmethod
+    def get(
+        self, key: IndicatorKey
+    ) -> Optional[StoredIndicator]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(
+        self, key: IndicatorKey, value: Any, computed_at: float
+    ) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    @abstractmethod
+    def keys(self) -> List[IndicatorKey]:  # pragma: no cover - interface
+        raise NotImplementedError
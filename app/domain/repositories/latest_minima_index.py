@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, List, Mapping, NamedTuple, Optional
+
+
+class LatestMinimum(NamedTuple):
+    """A symbol's most recent MACD minimum for one periodicity and window.
+
+    ``bars_since`` counts the bars after the minimum up to the symbol's last
+    bar, ``last_bar_date``; a minimum is never the last bar itself, so it is
+    at least 1.
+    """
+
+    symbol: str
+    date: Any
+    macd: float
+    price: float
+    bars_since: int
+    last_bar_date: Any
+
+
+class MinimaScreenPage(NamedTuple):
+    """One page of a screen; ``total`` counts every match, not just the page."""
+
+    entries: List[LatestMinimum]
+    total: int
+    computed_at: float
+
+
+class LatestMinimaIndex(ABC):
+    """Port for the latest MACD minimum of every symbol in a universe.
+
+    Kept per ``(periodicity, window)`` by the job that computes the minima,
+    so screening a universe never rescans full histories.
+    """
+
+    @abstractmethod
+    def update(
+        self,
+        periodicity: str,
+        window: int,
+        latest: Mapping[str, Optional[LatestMinimum]],
+        computed_at: float,
+    ) -> None:  # pragma: no cover - interface
+        """Replace the entries of the symbols in ``latest``.
+
+        ``None`` means the symbol has no minimum and drops it; symbols not
+        in ``latest`` (e.g. ones that failed to refresh) keep their entry.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def screen(
+        self,
+        periodicity: str,
+        window: int,
+        within: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[MinimaScreenPage]:  # pragma: no cover - interface
+        """Symbols whose latest minimum is at most ``within`` bars old.
+
+        Freshest first, then by symbol; ``None`` when the pair has never
+        been indexed.
+        """
+        raise NotImplementedError
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import date
+from typing import Optional
 
 import pandas as pd
 
@@ -20,3 +22,32 @@ class PriceDataRepository(ABC):
         Expected columns include: date, open, high, low, close, volume.
         """
         raise NotImplementedError
+
+
+class RangePriceDataRepository(PriceDataRepository):
+    """Price data port that can also fetch an explicit date range.
+
+    Lets callers holding part of a history download only the missing bars.
+    """
+
+    @abstractmethod
+    def get_stock_data_range(
+        self, symbol: str, start: date, end: Optional[date] = None
+    ) -> pd.DataFrame:  # pragma: no cover - interface
+        """Return OHLCV rows dated ``start`` through ``end`` (inclusive).
+
+        ``end`` defaults to the latest available bar. An empty DataFrame means
+        the range holds no bars.
+        """
+        raise NotImplementedError
+
+
+class AsyncPriceDataRepository(ABC):
+    """Awaitable counterpart of ``PriceDataRepository`` for async callers."""
+
+    @abstractmethod
+    async def get_stock_data(
+        self, symbol: str, days: int
+    ) -> pd.DataFrame:  # pragma: no cover - interface
+        """Return a DataFrame of OHLCV rows for the given symbol."""
+        raise NotImplementedError
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from app.domain.repositories.macd_calculator import MacdCalculator  # noqa: F401
+from app.metrics import timed
 
 
 class EmaMacdCalculator:
@@ -19,6 +20,7 @@ class EmaMacdCalculator:
         self.fast_period = fast_period
         self.slow_period = slow_period
 
+    @timed("macd")
     def get_macd(self, df: pd.DataFrame) -> pd.Series:  # type: ignore[override]
         """Return MACD series aligned to df's index.
 
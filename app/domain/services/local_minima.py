@@ -1,23 +1,15 @@
 from __future__ import annotations
 
+from typing import Callable, Dict
+
 import numpy as np
 import pandas as pd
 
+from app.metrics import timed
 
-def find_local_minima(series: pd.Series, window: int = 1) -> list[int]:
-    """Return 0-based indices of local minima within a sliding neighborhood of size `window`.
-
-    Rules:
-    - Only consider interior points (exclude first and last index).
-    - A point is a local minimum if it is <= all non-NaN neighbors within `window`
-      AND strictly < at least one neighbor (to avoid selecting flat-only regions).
-    - For flat plateaus that qualify as minima, return only the first index in the plateau.
-    - NaNs are ignored in comparisons; if all neighbors are NaN, the point is not selected.
-    """
-    if series is None or len(series) < 3:
-        return []
 
-    values = series.to_numpy()
+def _find_local_minima_python(values: np.ndarray, window: int) -> list[int]:
+    """Reference implementation: per-index scan of the neighborhood."""
     n = len(values)
     minima_indices: list[int] = []
 
@@ -52,3 +44,103 @@ def find_local_minima(series: pd.Series, window: int = 1) -> list[int]:
         deduped.append(idx)
 
     return deduped
+
+
+def sliding_min(values: np.ndarray, size: int) -> np.ndarray:
+    """Return the minimum of every length-``size`` window of ``values``.
+
+    Uses the van Herk/Gil-Werman block decomposition: prefix and suffix minima
+    over blocks of ``size`` elements, so the cost is O(n) regardless of ``size``.
+    The output has ``len(values) - size + 1`` elements; ``values`` must not
+    contain NaN.
+    """
+    n = len(values)
+    if size <= 1 or n == 0:
+        return values.copy()
+    num_windows = n - size + 1
+    if num_windows <= 0:
+        return np.empty(0, dtype=values.dtype)
+
+    blocks = -(-n // size)
+    padded = np.full(blocks * size, np.inf, dtype=float)
+    padded[:n] = values
+    padded = padded.reshape(blocks, size)
+
+    prefix = np.minimum.accumulate(padded, axis=1).ravel()
+    suffix = np.minimum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.minimum(suffix[:num_windows], prefix[size - 1 : size - 1 + num_windows])
+
+
+def _find_local_minima_numpy(values: np.ndarray, window: int) -> list[int]:
+    """Vectorized implementation with the same selection rules.
+
+    A window that includes the center has ``min == center`` exactly when the
+    center is <= every neighbor, and ``max > center`` exactly when it is strictly
+    below some neighbor, so both tests reduce to padded sliding min/max passes.
+    NaNs become +inf for the min pass and -inf for the max pass, which makes them
+    neutral; a center whose neighbors are all NaN fails the ``max > center`` test.
+    """
+    n = len(values)
+    if window < 1:
+        return []
+
+    nan_mask = np.isnan(values)
+    size = 2 * window + 1
+
+    pad = np.full(window, np.inf)
+    for_min = np.concatenate([pad, np.where(nan_mask, np.inf, values), pad])
+    for_max = np.concatenate([pad, np.where(nan_mask, np.inf, -values), pad])
+
+    window_min = sliding_min(for_min, size)
+    window_max = -sliding_min(for_max, size)
+
+    candidates = ~nan_mask & (window_min == values) & (window_max > values)
+    candidates[0] = False
+    candidates[n - 1] = False
+    idx = np.flatnonzero(candidates)
+    if len(idx) == 0:
+        return []
+
+    # Plateau dedup: a candidate adjacent to the previously *kept* one with the
+    # same value is dropped. Within a chain of adjacent equal candidates this
+    # keeps every other one, starting with the first.
+    linked = np.zeros(len(idx), dtype=bool)
+    linked[1:] = (np.diff(idx) == 1) & (values[idx[1:]] == values[idx[:-1]])
+    chain_starts = np.flatnonzero(~linked)
+    chain_id = np.cumsum(~linked) - 1
+    position = np.arange(len(idx)) - chain_starts[chain_id]
+    return idx[position % 2 == 0].tolist()
+
+
+LOCAL_MINIMA_ENGINES: Dict[str, Callable[[np.ndarray, int], list[int]]] = {
+    "python": _find_local_minima_python,
+    "numpy": _find_local_minima_numpy,
+}
+
+
+@timed("local_minima")
+def find_local_minima(
+    series: pd.Series, window: int = 1, engine: str = "numpy"
+) -> list[int]:
+    """Return 0-based indices of local minima within a sliding neighborhood of size `window`.
+
+    Rules:
+    - Only consider interior points (exclude first and last index).
+    - A point is a local minimum if it is <= all non-NaN neighbors within `window`
+      AND strictly < at least one neighbor (to avoid selecting flat-only regions).
+    - For flat plateaus that qualify as minima, return only the first index in the plateau.
+    - NaNs are ignored in comparisons; if all neighbors are NaN, the point is not selected.
+
+    ``engine`` selects the implementation: ``"numpy"`` (vectorized, O(n)) or
+    ``"python"`` (the original per-index loop). Both return identical indices.
+    """
+    if engine not in LOCAL_MINIMA_ENGINES:
+        raise ValueError(
+            f"Unknown local minima engine '{engine}'. "
+            f"Expected one of: {', '.join(sorted(LOCAL_MINIMA_ENGINES))}"
+        )
+    if series is None or len(series) < 3:
+        return []
+
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+    return LOCAL_MINIMA_ENGINES[engine](values, window)
@@ -36,16 +36,20 @@ def get_macd_minima_from_macd(
     df: pd.DataFrame,
     macd: pd.Series,
     window: int = 1,
+    engine: str = "numpy",
 ) -> pd.DataFrame:
     """Return a DataFrame of minima rows with columns: date, macd, price.
 
     The function expects one MACD value per row of ``df``. It finds local minima
     indices on the MACD series using ``window`` and maps those indices back to
     dates and closing prices from ``df``. The resulting rows are sorted by date.
+    ``engine`` selects the local-minima implementation (see ``find_local_minima``).
     """
     df_local = _ensure_datetime_index(df.copy()).reset_index(drop=True)
 
-    minima_indices = find_local_minima(macd.reset_index(drop=True), window=window)
+    minima_indices = find_local_minima(
+        macd.reset_index(drop=True), window=window, engine=engine
+    )
     selected = _select_indices(df_local, minima_indices)
     selected["macd"] = macd.reset_index(drop=True).iloc[minima_indices].values
     selected = selected.sort_values(by="date").reset_index(drop=True)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.domain.repositories.latest_minima_index import LatestMinimum
+
+from .fused_macd import fused_macd, validate_periods
+from .local_minima import LOCAL_MINIMA_ENGINES
+
+
+@dataclass
+class ClosePanel:
+    """Closing prices of many symbols aligned on one date axis.
+
+    ``closes`` has shape ``(len(dates), len(symbols))``. Cells outside a
+    symbol's own history, and bars with no trades, are NaN. ``first`` and
+    ``last`` hold, per column, the rows of the symbol's first and last bar.
+    """
+
+    dates: pd.DatetimeIndex
+    symbols: List[str]
+    closes: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+
+
+def build_close_panel(
+    frames: Mapping[str, pd.DataFrame], periodicity: str
+) -> ClosePanel:
+    """Resample every symbol's closes to ``periodicity`` in a single pass.
+
+    The frames are stacked into one wide daily panel and resampled together.
+    Bin labels are the same ones ``resample_ohlcv`` uses per symbol, so every
+    column matches that symbol's own resampled ``close`` between its first and
+    last bar.
+    """
+    parts = []
+    for symbol, df in frames.items():
+        if df.empty:
+            continue
+        dates = df["date"]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)  # type: ignore[arg-type]
+        parts.append(
+            pd.DataFrame(
+                {"symbol": symbol, "date": dates.values, "close": df["close"].values}
+            )
+        )
+    if not parts:
+        empty = np.empty((0, 0), dtype=float)
+        return ClosePanel(
+            pd.DatetimeIndex([]), [], empty, np.empty(0, int), np.empty(0, int)
+        )
+
+    long = pd.concat(parts, ignore_index=True)
+    long = long.drop_duplicates(subset=["symbol", "date"], keep="first")
+    wide = long.pivot(index="date", columns="symbol", values="close").astype(float)
+    wide = wide.sort_index().resample(periodicity).last()
+
+    symbols = [symbol for symbol in frames if symbol in wide.columns]
+    closes = wide[symbols].to_numpy(dtype=float)
+    observed = ~np.isnan(closes)
+    first = observed.argmax(axis=0)
+    last = len(closes) - 1 - observed[::-1].argmax(axis=0)
+    return ClosePanel(pd.DatetimeIndex(wide.index), symbols, closes, first, last)
+
+
+def macd_panel(
+    panel: ClosePanel,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    dtype: str = "float64",
+) -> np.ndarray:
+    """MACD for every column of ``panel``, NaN outside each symbol's history.
+
+    Both EMAs advance in one pass (``fused_macd``). ``dtype="float32"``
+    stores the result at half the size; the EMAs are still float64.
+    """
+    validate_periods(fast_period, slow_period)
+
+    macd = fused_macd(
+        panel.closes, fast_period, slow_period, signal_period=None, dtype=dtype
+    ).macd
+    rows = np.arange(len(panel.dates))[:, None]
+    macd[rows > panel.last[None, :]] = np.nan
+    return macd
+
+
+def panel_macd_minima(
+    panel: ClosePanel,
+    macd: np.ndarray,
+    window: int = 1,
+    engine: str = "numpy",
+) -> Dict[str, pd.DataFrame]:
+    """Local MACD minima for every symbol of ``panel``.
+
+    Each column is searched over its own history only, so the first and last
+    bars of a symbol are never selected, exactly as with
+    ``get_macd_minima_from_macd``. Returns ``symbol -> DataFrame`` with the
+    columns date, price and macd, sorted by date.
+    """
+    if engine not in LOCAL_MINIMA_ENGINES:
+        raise ValueError(
+            f"Unknown local minima engine '{engine}'. "
+            f"Expected one of: {', '.join(sorted(LOCAL_MINIMA_ENGINES))}"
+        )
+    find = LOCAL_MINIMA_ENGINES[engine]
+
+    out: Dict[str, pd.DataFrame] = {}
+    for col, symbol in enumerate(panel.symbols):
+        start, stop = int(panel.first[col]), int(panel.last[col]) + 1
+        values = macd[start:stop, col]
+        idx = np.asarray(find(values, window) if len(values) >= 3 else [], dtype=int)
+        rows = idx + start
+        out[symbol] = pd.DataFrame(
+            {
+                "date": panel.dates[rows],
+                "price": panel.closes[rows, col],
+                "macd": macd[rows, col],
+            }
+        )
+    return out
+
+
+def panel_latest_minima(
+    panel: ClosePanel, minima: Mapping[str, pd.DataFrame]
+) -> Dict[str, Optional[LatestMinimum]]:
+    """The last row of each symbol's ``panel_macd_minima`` frame, with its age.
+
+    Bin labels are evenly spaced, so a minimum's age in bars is the distance
+    between its panel row and the symbol's last row. ``None`` for symbols
+    without any minimum.
+    """
+    out: Dict[str, Optional[LatestMinimum]] = {}
+    for col, symbol in enumerate(panel.symbols):
+        frame = minima[symbol]
+        if frame.empty:
+            out[symbol] = None
+            continue
+        date, price, macd = frame.iloc[-1][["date", "price", "macd"]]
+        last = int(panel.last[col])
+        out[symbol] = LatestMinimum(
+            symbol,
+            date,
+            float(macd),
+            float(price),
+            last - int(panel.dates.get_loc(date)),
+            panel.dates[last],
+        )
+    return out
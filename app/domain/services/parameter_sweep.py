@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.metrics import timed
+
+from .local_minima import find_local_minima
+from .stop_loss_backtest import backtest_stops, macd_stop_position_grid
+
+# Backtest figures reported for every num_elements of a stop-loss sweep
+BACKTEST_COLUMNS = (
+    "stop_hits",
+    "time_in_position",
+    "total_return",
+    "buy_hold_return",
+    "max_drawdown",
+    "drawdown_avoided",
+)
+
+
+def validate_grid(name: str, values: Sequence[int]) -> List[int]:
+    """Deduplicated grid values, in order; all must be positive integers."""
+    unique = list(dict.fromkeys(values))
+    if not unique:
+        raise ValueError(f"{name} grid must not be empty")
+    if any(isinstance(v, bool) or not isinstance(v, int) or v <= 0 for v in unique):
+        raise ValueError(f"{name} grid must hold positive integers")
+    return unique
+
+
+@timed("sweep_stop_loss")
+def stop_loss_sweep(
+    bars: pd.DataFrame, macd: pd.Series, num_elements: Sequence[int]
+) -> Dict[str, List]:
+    """MACD stop loss and its backtest for every ``num_elements``, as columns.
+
+    ``bars`` are resampled and chronological and ``macd`` is their MACD
+    line (``EmaMacdCalculator``). The stop as of every bar comes from
+    ``macd_stop_position_grid`` for the whole grid at once, and its last
+    column is what ``stop_loss_from_bars`` returns today. Returns ``num_elements``,
+    ``stop_loss``, ``stop_loss_date``, ``max_macd_date`` and
+    ``BACKTEST_COLUMNS``, one entry per grid value.
+    """
+    low = bars["low"].to_numpy(dtype=float)
+    dates = bars["date"].tolist()
+    values = macd.to_numpy(dtype=float)
+    if len(values) == 0 or np.isnan(values).all():
+        raise ValueError("MACD series has no values")
+    positions = macd_stop_position_grid(values, low, num_elements)
+    max_macd = len(values) - 1 - int(np.nanargmax(values[::-1]))
+
+    columns: Dict[str, List] = {
+        "num_elements": list(num_elements),
+        "stop_loss": [],
+        "stop_loss_date": [],
+        "max_macd_date": [dates[max_macd]] * len(positions),
+        **{name: [] for name in BACKTEST_COLUMNS},
+    }
+    for row in positions:
+        stop = int(row[-1])
+        columns["stop_loss"].append(float(low[stop]))
+        columns["stop_loss_date"].append(dates[stop])
+        levels = np.where(row >= 0, low[np.maximum(row, 0)], np.nan)
+        result = backtest_stops(bars, levels)
+        for name in BACKTEST_COLUMNS:
+            columns[name].append(getattr(result, name))
+    return columns
+
+
+@timed("sweep_macd_minima")
+def minima_sweep(
+    bars: pd.DataFrame, macd: pd.Series, windows: Sequence[int]
+) -> Dict[str, np.ndarray]:
+    """MACD minima of ``bars`` for every local-minima ``window``, as columns.
+
+    ``macd`` is shared by all windows. Each window contributes the rows
+    ``get_macd_minima_from_macd`` would return for it (``window``, ``date``,
+    ``macd``, ``price``), sorted by date.
+    """
+    values = macd.to_numpy(dtype=float)
+    dates = bars["date"].to_numpy()
+    close = bars["close"].to_numpy(dtype=float)
+    parts: Dict[str, List[np.ndarray]] = {
+        "window": [],
+        "date": [],
+        "macd": [],
+        "price": [],
+    }
+    for window in windows:
+        idx = np.asarray(find_local_minima(macd, window=window), dtype=np.int64)
+        parts["window"].append(np.full(len(idx), window, dtype=np.int64))
+        parts["date"].append(dates[idx])
+        parts["macd"].append(values[idx])
+        parts["price"].append(close[idx])
+    return {name: np.concatenate(values) for name, values in parts.items()}
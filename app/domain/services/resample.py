@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from app.metrics import timed
+
+OHLCV_AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+@timed("resample")
+def resample_ohlcv(df: pd.DataFrame, periodicity: str) -> pd.DataFrame:
+    """Aggregate OHLCV rows into ``periodicity`` bars.
+
+    Returns columns open, high, low, close, volume and date (the bin label) with
+    a 1-based integer index, the layout every caller in this project expects.
+    Each column uses its dedicated resampler reduction (``first``, ``max``...),
+    which avoids the generic ``apply(dict)`` dispatch.
+    """
+    dates = df["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)  # type: ignore[arg-type]
+    indexed = df[list(OHLCV_AGGREGATIONS)].set_axis(pd.DatetimeIndex(dates), axis=0)
+    resampler = indexed.resample(periodicity)
+
+    out = pd.DataFrame(
+        {
+            column: getattr(resampler[column], how)()
+            for column, how in OHLCV_AGGREGATIONS.items()
+        }
+    )
+    out.index.name = "date"
+    out["date"] = out.index
+    out.index = range(1, len(out) + 1)
+    return out
+
+
+@dataclass
+class ResampleCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class CachedResampler:
+    """``resample_ohlcv`` with an LRU cache bounded by memory footprint.
+
+    Results are keyed on the symbol, the periodicity and a fingerprint of the
+    source frame: its first and last bar dates, its length and the values of
+    its last bar. A new or revised trailing bar therefore produces a new key,
+    while W/MS/Q views of an unchanged history are computed once. Frames
+    without a symbol are resampled without caching. Callers receive copies.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[int, pd.DataFrame]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = ResampleCacheStats()
+        self._lock = threading.Lock()
+
+    def resample(
+        self, df: pd.DataFrame, periodicity: str, symbol: Optional[str] = None
+    ) -> pd.DataFrame:
+        if symbol is None or df.empty:
+            return resample_ohlcv(df, periodicity)
+
+        key = (symbol, periodicity) + _fingerprint(df)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return item[1].copy()
+            self._stats.misses += 1
+
+        result = resample_ohlcv(df, periodicity)
+        size = int(result.memory_usage(index=True, deep=True).sum())
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (size, result)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (evicted_size, _) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+                    self._stats.evictions += 1
+        return result.copy()
+
+    def stats(self) -> ResampleCacheStats:
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            self._stats.bytes = self._bytes
+            return ResampleCacheStats(**self._stats.as_dict())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _fingerprint(df: pd.DataFrame) -> Tuple:
+    dates = df["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)  # type: ignore[arg-type]
+    newest = int(dates.values.argmax())
+    # Raw bytes compare equal for NaN too, unlike a tuple of floats
+    last_bar = df[list(OHLCV_AGGREGATIONS)].iloc[newest].to_numpy(dtype=float).tobytes()
+    return (dates.min(), dates.max(), len(df), last_bar)
+
+
+_default_resampler = CachedResampler()
+
+
+def get_default_resampler() -> CachedResampler:
+    """Process-wide resampler shared by the use cases and the legacy adapter."""
+    return _default_resampler
+
+
+def set_default_resampler(resampler: CachedResampler) -> None:
+    global _default_resampler
+    _default_resampler = resampler
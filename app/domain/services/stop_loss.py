@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.metrics import timed
+
+from .ema_macd_calculator import EmaMacdCalculator
+from .local_minima import sliding_min
+from .resample import get_default_resampler
+
+MACD_ANCHOR_LOOKBACK = 5
+
+
+def lower_than_previous(values: np.ndarray, num_elements: int) -> np.ndarray:
+    """Flag bars strictly below every non-NaN bar among the previous ones.
+
+    Bar ``p`` is compared with the ``min(p, num_elements - 1)`` bars before it,
+    the neighborhood the legacy ``isTheLower`` scan uses. Bars with no non-NaN
+    neighbor are flagged; a NaN bar with any non-NaN neighbor is not. The
+    first bar has no neighbors and is left unflagged. Runs in O(n).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    flags = np.zeros(n, dtype=bool)
+    lookback = num_elements - 1
+    if n == 0:
+        return flags
+    if lookback <= 0:
+        flags[1:] = True
+        return flags
+
+    nan_mask = np.isnan(values)
+    filled = np.where(nan_mask, np.inf, values)
+    padded = np.concatenate([np.full(lookback, np.inf), filled])
+    previous_min = sliding_min(padded, lookback)[:n]
+
+    valid = np.concatenate([[0], np.cumsum(~nan_mask)])
+    positions = np.arange(n)
+    valid_neighbors = valid[positions] - valid[np.maximum(0, positions - lookback)]
+
+    flags = (valid_neighbors == 0) | (values < previous_min)
+    flags[0] = False
+    return flags
+
+
+def previous_blocker_distance(values: np.ndarray) -> np.ndarray:
+    """Distance from each bar back to the nearest bar that keeps it unflagged.
+
+    For a non-NaN bar that is the nearest earlier non-NaN bar not above it;
+    for a NaN bar, the nearest earlier non-NaN bar. ``inf`` when there is
+    none. Bar ``p`` is flagged by ``lower_than_previous(values, k)`` exactly
+    when ``p > 0`` and this distance exceeds ``k - 1``, so one pass (a
+    monotonic stack) serves every ``num_elements`` at once.
+    """
+    values = np.asarray(values, dtype=float)
+    distance = np.full(len(values), np.inf)
+    stack: list = []  # non-NaN positions, values strictly increasing
+    last_valid = -1
+    for p, value in enumerate(values.tolist()):
+        if value != value:
+            if last_valid >= 0:
+                distance[p] = p - last_valid
+            continue
+        while stack and values[stack[-1]] > value:
+            stack.pop()
+        if stack:
+            distance[p] = p - stack[-1]
+        stack.append(p)
+        last_valid = p
+    return distance
+
+
+def lower_than_previous_grid(
+    values: np.ndarray, num_elements: Sequence[int]
+) -> np.ndarray:
+    """``lower_than_previous`` for several ``num_elements`` as a 2-D array.
+
+    Row ``i`` equals ``lower_than_previous(values, num_elements[i])``.
+    """
+    distance = previous_blocker_distance(values)
+    lookbacks = np.asarray(num_elements, dtype=float) - 1
+    flags = distance[None, :] > lookbacks[:, None]
+    flags[:, :1] = False
+    return flags
+
+
+def find_lowest(values: np.ndarray, start: int, num_elements: int) -> int:
+    """Return the latest position ``<= start`` flagged by ``lower_than_previous``.
+
+    Equivalent to the legacy ``findTheLowest`` backward walk, but evaluated
+    with one vectorized pass. Falls back to the first bar when no earlier bar
+    qualifies (the legacy scan raised ``KeyError`` there).
+    """
+    flags = lower_than_previous(values, num_elements)
+    hits = np.flatnonzero(flags[: start + 1])
+    return int(hits[-1]) if len(hits) else 0
+
+
+@timed("stop_loss_search")
+def find_stop_loss_anchors(
+    macd: np.ndarray, low: np.ndarray, num_elements: int
+) -> Tuple[int, int]:
+    """Return chronological positions ``(max_macd, stop_loss)``.
+
+    The MACD anchor is the latest bar holding the maximum MACD, walked back to
+    a bar lower than its previous ``MACD_ANCHOR_LOOKBACK - 1`` values; the
+    stop-loss bar is then found by walking the lows back from that anchor
+    using ``num_elements``.
+    """
+    macd = np.asarray(macd, dtype=float)
+    if len(macd) == 0 or np.isnan(macd).all():
+        raise ValueError("MACD series has no values")
+    # The legacy code ran idxmax on the reversed series: ties go to the latest bar
+    max_macd = len(macd) - 1 - int(np.nanargmax(macd[::-1]))
+    anchor = find_lowest(macd, max_macd, MACD_ANCHOR_LOOKBACK)
+    stop_loss = find_lowest(low, anchor, num_elements)
+    return max_macd, stop_loss
+
+
+def get_stop_loss(
+    symbol: str,
+    stock_data: pd.DataFrame,
+    periodicity: str = "W",
+    num_elements: int = 20,
+) -> Dict:
+    """Vectorized MACD stop-loss policy.
+
+    Produces the same mapping as ``Financialmodelingprep.get_stop_loss`` and
+    matches the ``get_stop_loss`` use-case strategy signature
+    ``(symbol, stock_data, periodicity, num_elements)``.
+    """
+    current_price = stock_data.iloc[0].close
+    df = get_default_resampler().resample(stock_data, periodicity, symbol=symbol)
+    return {
+        "symbol": symbol,
+        "current_price": current_price,
+        **stop_loss_from_bars(df, num_elements),
+        "period": periodicity,
+    }
+
+
+def stop_loss_from_bars(bars: pd.DataFrame, num_elements: int) -> Dict:
+    """``get_stop_loss`` on already resampled, chronological bars.
+
+    Returns ``stop_loss``, ``stop_loss_date`` and ``max_macd_date``.
+    """
+    macd = EmaMacdCalculator().get_macd(bars)
+    max_macd, stop_loss = find_stop_loss_anchors(
+        macd.to_numpy(), bars["low"].to_numpy(dtype=float), num_elements
+    )
+    return {
+        "stop_loss": bars["low"].iloc[stop_loss],
+        "stop_loss_date": bars["date"].iloc[stop_loss],
+        "max_macd_date": bars["date"].iloc[max_macd],
+    }
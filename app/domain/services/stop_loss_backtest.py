@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.metrics import timed
+
+from .ema_macd_calculator import EmaMacdCalculator
+from .stop_loss import (
+    MACD_ANCHOR_LOOKBACK,
+    lower_than_previous,
+    lower_than_previous_grid,
+)
+from .stop_loss_strategies import MACD_STRATEGY, TRAILING_STOPS, validate_strategy
+
+
+def _last_flagged(flags: np.ndarray) -> np.ndarray:
+    """For each position, the latest flagged position at or before it, or -1.
+
+    Works along the last axis, so each row of a 2-D ``flags`` is independent.
+    """
+    positions = np.where(flags, np.arange(flags.shape[-1]), -1)
+    if flags.shape[-1] == 0:
+        return positions
+    return np.maximum.accumulate(positions, axis=-1)
+
+
+def macd_stop_positions(
+    macd: np.ndarray, low: np.ndarray, num_elements: int
+) -> np.ndarray:
+    """Stop-loss bar of the MACD policy as of every bar, in one sweep.
+
+    Entry ``t`` equals the ``stop_loss`` position ``find_stop_loss_anchors``
+    returns for ``macd[: t + 1]`` and ``low[: t + 1]``, or -1 while the MACD
+    has no value yet. All three steps of the policy only look backwards, so
+    they become prefix scans over the full history instead of one search per
+    as-of bar: the running maximum of the MACD (latest bar on ties), the
+    latest MACD anchor flagged by ``lower_than_previous`` at or before it,
+    and the latest flagged low at or before that anchor. O(n) overall.
+    """
+    return _stop_positions(macd, lower_than_previous(low, num_elements))
+
+
+def macd_stop_position_grid(
+    macd: np.ndarray, low: np.ndarray, num_elements: Sequence[int]
+) -> np.ndarray:
+    """``macd_stop_positions`` for several ``num_elements``, one row each.
+
+    The MACD maximum and anchor do not depend on ``num_elements`` and are
+    scanned once for the whole grid.
+    """
+    return _stop_positions(macd, lower_than_previous_grid(low, num_elements))
+
+
+def _stop_positions(macd: np.ndarray, low_flags: np.ndarray) -> np.ndarray:
+    macd = np.asarray(macd, dtype=float)
+    if len(macd) == 0:
+        return np.empty(low_flags.shape, dtype=np.int64)
+
+    running_max = np.fmax.accumulate(macd)
+    max_macd = _last_flagged(macd == running_max)
+    anchors = _last_flagged(lower_than_previous(macd, MACD_ANCHOR_LOOKBACK))
+    lows = _last_flagged(low_flags)
+
+    # find_lowest falls back to the first bar when nothing qualifies
+    anchor = np.maximum(anchors[np.maximum(max_macd, 0)], 0)
+    stop = np.maximum(lows[..., anchor], 0)
+    return np.where(max_macd >= 0, stop, -1)
+
+
+def stop_levels(bars: pd.DataFrame, strategy: str, num_elements: int) -> np.ndarray:
+    """Stop level in force after the close of every bar (NaN when none)."""
+    validate_strategy(strategy)
+    if strategy != MACD_STRATEGY:
+        return TRAILING_STOPS[strategy](bars, num_elements).levels
+    low = bars["low"].to_numpy(dtype=float)
+    macd = EmaMacdCalculator().get_macd(bars).to_numpy(dtype=float)
+    positions = macd_stop_positions(macd, low, num_elements)
+    levels = np.full(len(low), np.nan)
+    defined = positions >= 0
+    levels[defined] = low[positions[defined]]
+    return levels
+
+
+@dataclass
+class StopHit:
+    date: Any
+    stop_loss: float
+    fill_price: float
+    reentry_date: Any = None
+    further_decline: float = 0.0
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of holding a long position protected by a stop-loss policy.
+
+    Returns and drawdowns are fractions (0.1 is 10%). ``drawdown_avoided`` is
+    the buy-and-hold maximum drawdown minus the strategy's over the same bars;
+    ``further_decline`` of a hit is how far the low fell below the fill price
+    before the position was re-entered (or the history ended).
+    """
+
+    bars: int = 0
+    first_date: Any = None
+    last_date: Any = None
+    stop_hits: int = 0
+    bars_in_position: int = 0
+    time_in_position: float = 0.0
+    total_return: float = 0.0
+    buy_hold_return: float = 0.0
+    max_drawdown: float = 0.0
+    buy_hold_max_drawdown: float = 0.0
+    drawdown_avoided: float = 0.0
+    hits: List[StopHit] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _max_drawdown(curve: np.ndarray) -> float:
+    if len(curve) == 0:
+        return 0.0
+    return float(1.0 - np.min(curve / np.maximum.accumulate(curve)))
+
+
+@timed("stop_loss_backtest")
+def backtest_stops(bars: pd.DataFrame, levels: np.ndarray) -> BacktestResult:
+    """Simulate a long position against per-bar stop ``levels``.
+
+    The position is opened at the close of the first bar whose close is above
+    its stop. The stop set at one bar's close applies to the next bar: a low
+    at or below it exits at the stop, or at the open when the bar gaps
+    through it. After a hit the position is re-entered at the close of the
+    first bar that closes above a stop different from the one that was hit,
+    i.e. once the policy has issued a new stop. One pass over the bars.
+    """
+    dates = bars["date"].tolist()
+    open_ = bars["open"].to_numpy(dtype=float)
+    low = bars["low"].to_numpy(dtype=float)
+    close = bars["close"].to_numpy(dtype=float)
+    n = len(close)
+
+    result = BacktestResult(bars=n)
+    if n:
+        result.first_date, result.last_date = dates[0], dates[-1]
+    first_entry: Optional[int] = None
+    in_position = False
+    hit_level = math.nan
+    equity = np.ones(n)
+    value = 1.0
+    flat_low = math.inf
+    for t in range(n):
+        if in_position:
+            stop = levels[t - 1]
+            if low[t] <= stop:
+                fill = min(open_[t], stop)
+                value *= fill / close[t - 1]
+                in_position = False
+                hit_level = stop
+                flat_low = low[t]
+                result.hits.append(StopHit(dates[t], float(stop), float(fill)))
+            else:
+                value *= close[t] / close[t - 1]
+                result.bars_in_position += 1
+        elif result.hits:
+            flat_low = min(flat_low, low[t])
+        equity[t] = value
+
+        level = levels[t]
+        if (
+            not in_position
+            and level == level
+            and close[t] > level
+            and level != hit_level
+        ):
+            in_position = True
+            if first_entry is None:
+                first_entry = t
+            elif result.hits:
+                _close_hit(result.hits[-1], dates[t], flat_low)
+    if result.hits and result.hits[-1].reentry_date is None:
+        _close_hit(result.hits[-1], None, flat_low)
+
+    if first_entry is None:
+        return result
+    span = slice(first_entry, n)
+    held = close[span] / close[first_entry]
+    curve = equity[span] / equity[first_entry]
+    result.stop_hits = len(result.hits)
+    result.time_in_position = result.bars_in_position / max(1, n - 1 - first_entry)
+    result.total_return = float(curve[-1] - 1.0)
+    result.buy_hold_return = float(held[-1] - 1.0)
+    result.max_drawdown = _max_drawdown(curve)
+    result.buy_hold_max_drawdown = _max_drawdown(held)
+    result.drawdown_avoided = result.buy_hold_max_drawdown - result.max_drawdown
+    return result
+
+
+def _close_hit(hit: StopHit, reentry_date: Any, flat_low: float) -> None:
+    hit.reentry_date = reentry_date
+    hit.further_decline = max(0.0, float(1.0 - flat_low / hit.fill_price))
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.metrics import timed
+
+from .local_minima import sliding_min
+from .resample import get_default_resampler
+from .stop_loss import get_stop_loss, stop_loss_from_bars
+
+MACD_STRATEGY = "macd"
+ATR_PERIOD = 14
+ATR_MULTIPLIER = 3.0
+TRAILING_PERCENT = 0.10
+
+
+class TrailingStop(NamedTuple):
+    """Per-bar stop levels of one strategy over chronological bars.
+
+    ``levels[i]`` is the stop in force at bar ``i``. It is derived from the
+    window max (``highest``) or min of ``anchors`` over the last
+    ``lookback`` bars, which is how the bar that set the stop is found.
+    """
+
+    levels: np.ndarray
+    anchors: np.ndarray
+    highest: bool
+
+
+def trailing_max(values: np.ndarray, lookback: int) -> np.ndarray:
+    """Max of each bar and the ``lookback - 1`` bars before it, in O(n).
+
+    Shorter windows are used at the start; NaN bars are ignored and a window
+    with no value is NaN.
+    """
+    return -trailing_min(-np.asarray(values, dtype=float), lookback)
+
+
+def trailing_min(values: np.ndarray, lookback: int) -> np.ndarray:
+    """Min of each bar and the ``lookback - 1`` bars before it, in O(n)."""
+    values = np.asarray(values, dtype=float)
+    if lookback <= 1 or len(values) == 0:
+        return values.copy()
+    filled = np.where(np.isnan(values), np.inf, values)
+    padded = np.concatenate([np.full(lookback - 1, np.inf), filled])
+    out = sliding_min(padded, lookback)
+    out[np.isinf(out)] = np.nan
+    return out
+
+
+def average_true_range(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = ATR_PERIOD
+) -> np.ndarray:
+    """Wilder's ATR: true range smoothed with ``alpha = 1 / period``.
+
+    The first bar's true range is its high-low span; the smoothing is seeded
+    with it rather than with a ``period``-bar average.
+    """
+    previous_close = np.concatenate([[np.nan], close[:-1]])
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)),
+    )
+    return pd.Series(true_range).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+
+def atr_trailing_stop(bars: pd.DataFrame, lookback: int) -> TrailingStop:
+    """Close minus ``ATR_MULTIPLIER`` ATRs, ratcheted up over ``lookback`` bars."""
+    high, low, close = _hlc(bars)
+    anchors = close - ATR_MULTIPLIER * average_true_range(high, low, close)
+    return TrailingStop(trailing_max(anchors, lookback), anchors, True)
+
+
+def chandelier_exit(bars: pd.DataFrame, lookback: int) -> TrailingStop:
+    """Highest high of ``lookback`` bars minus ``ATR_MULTIPLIER`` current ATRs."""
+    high, low, close = _hlc(bars)
+    atr = average_true_range(high, low, close)
+    return TrailingStop(trailing_max(high, lookback) - ATR_MULTIPLIER * atr, high, True)
+
+
+def donchian_low(bars: pd.DataFrame, lookback: int) -> TrailingStop:
+    """Lowest low of ``lookback`` bars (the lower Donchian channel)."""
+    _, low, _ = _hlc(bars)
+    return TrailingStop(trailing_min(low, lookback), low, False)
+
+
+def percent_trailing_stop(bars: pd.DataFrame, lookback: int) -> TrailingStop:
+    """``TRAILING_PERCENT`` below the highest close of ``lookback`` bars."""
+    _, _, close = _hlc(bars)
+    return TrailingStop(
+        trailing_max(close, lookback) * (1 - TRAILING_PERCENT), close, True
+    )
+
+
+TRAILING_STOPS: Dict[str, Callable[[pd.DataFrame, int], TrailingStop]] = {
+    "atr": atr_trailing_stop,
+    "chandelier": chandelier_exit,
+    "donchian": donchian_low,
+    "percent": percent_trailing_stop,
+}
+
+STOP_LOSS_STRATEGIES = (MACD_STRATEGY, *TRAILING_STOPS)
+
+
+class InsufficientHistoryError(ValueError):
+    """The price history is too short for the requested stop-loss strategy."""
+
+
+def validate_strategy(name: str) -> str:
+    if name not in STOP_LOSS_STRATEGIES:
+        raise ValueError(
+            f"Unknown stop-loss strategy '{name}'. "
+            f"Expected one of: {', '.join(STOP_LOSS_STRATEGIES)}"
+        )
+    return name
+
+
+@timed("trailing_stop")
+def trailing_stop_from_bars(name: str, bars: pd.DataFrame, lookback: int) -> Dict:
+    """Stop in force at the last bar, as ``stop_loss``/``stop_loss_date``.
+
+    ``stop_loss_date`` is the bar that set the stop (e.g. the highest high for
+    the chandelier exit). There is no MACD anchor, so ``max_macd_date`` is
+    ``None``.
+    """
+    stop = TRAILING_STOPS[validate_strategy(name)](bars, lookback)
+    n = len(stop.levels)
+    if n == 0 or np.isnan(stop.levels[-1]):
+        raise InsufficientHistoryError(
+            f"Not enough bars for the '{name}' stop-loss strategy"
+        )
+    start = max(0, n - max(1, lookback))
+    window = stop.anchors[start:]
+    anchor = start + int(np.nanargmax(window) if stop.highest else np.nanargmin(window))
+    return {
+        "stop_loss": float(stop.levels[-1]),
+        "stop_loss_date": bars["date"].iloc[anchor],
+        "max_macd_date": None,
+    }
+
+
+def trailing_stop_strategy(name: str) -> Callable[[str, pd.DataFrame, str, int], Dict]:
+    """Use-case strategy callable for one of ``TRAILING_STOPS``.
+
+    A ``functools.partial`` of a module-level function, so it can be sent to a
+    process compute pool.
+    """
+    validate_strategy(name)
+    return partial(_trailing_stop_strategy, name)
+
+
+def _trailing_stop_strategy(
+    name: str,
+    symbol: str,
+    stock_data: pd.DataFrame,
+    periodicity: str = "W",
+    num_elements: int = 20,
+) -> Dict:
+    bars = get_default_resampler().resample(stock_data, periodicity, symbol=symbol)
+    return {
+        "symbol": symbol,
+        "current_price": stock_data.iloc[0].close,
+        **trailing_stop_from_bars(name, bars, num_elements),
+        "period": periodicity,
+    }
+
+
+def evaluate_stop_loss_strategies(
+    symbol: str,
+    stock_data: pd.DataFrame,
+    periodicity: str,
+    num_elements: int,
+    names: Sequence[str],
+    macd_strategy: Optional[Callable[[str, pd.DataFrame, str, int], Dict]] = None,
+) -> List[Dict]:
+    """Evaluate several strategies on one symbol, resampling its history once.
+
+    Returns one ``stop_loss``/``stop_loss_date``/``max_macd_date`` mapping per
+    name, in order. ``macd_strategy`` overrides the vectorized MACD policy
+    (e.g. with the legacy engine); it is called on the raw history since it
+    does its own resampling.
+    """
+    for name in names:
+        validate_strategy(name)
+    shares_bars = macd_strategy is None or macd_strategy is get_stop_loss
+    bars: Optional[pd.DataFrame] = None
+    results: List[Dict] = []
+    for name in names:
+        if name == MACD_STRATEGY and not shares_bars:
+            results.append(macd_strategy(symbol, stock_data, periodicity, num_elements))
+            continue
+        if bars is None:
+            bars = get_default_resampler().resample(
+                stock_data, periodicity, symbol=symbol
+            )
+        if name == MACD_STRATEGY:
+            results.append(stop_loss_from_bars(bars, num_elements))
+        else:
+            results.append(trailing_stop_from_bars(name, bars, num_elements))
+    return results
+
+
+def _hlc(bars: pd.DataFrame):
+    return (
+        bars["high"].to_numpy(dtype=float),
+        bars["low"].to_numpy(dtype=float),
+        bars["close"].to_numpy(dtype=float),
+    )
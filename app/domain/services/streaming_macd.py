@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .fused_macd import span_to_alpha
+
+
+@dataclass(frozen=True)
+class EmaState:
+    """Recurrence state of an ``adjust=False`` exponential moving average.
+
+    Mirrors the variables of pandas' ``ewm(...).mean()`` kernel so that stepping
+    bar by bar reproduces the batch result bit for bit, NaN handling included.
+    """
+
+    weighted: float = math.nan
+    old_wt: float = 1.0
+    nobs: int = 0
+
+    def step(self, value: float, alpha: float) -> "EmaState":
+        is_observation = value == value
+        nobs = self.nobs + int(is_observation)
+        weighted = self.weighted
+        old_wt = self.old_wt
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if is_observation:
+                # pandas skips the update on equal values to avoid rounding drift
+                if weighted != value:
+                    weighted = (old_wt * weighted + alpha * value) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = value
+        return EmaState(weighted=weighted, old_wt=old_wt, nobs=nobs)
+
+    @classmethod
+    def after(cls, values: np.ndarray, ema: np.ndarray, alpha: float) -> "EmaState":
+        """The state ``step`` would reach over ``values``, from the batch ``ema``.
+
+        ``ema`` is ``ewm(adjust=False).mean()`` of ``values``. It carries the
+        average through NaNs, and ``old_wt`` is reset by every observation and
+        decays once per NaN after it, so no bar has to be replayed but the
+        trailing NaNs.
+        """
+        observed = np.flatnonzero(~np.isnan(values))
+        if len(observed) == 0:
+            return cls()
+        old_wt = 1.0
+        for _ in range(len(values) - 1 - int(observed[-1])):
+            old_wt *= 1.0 - alpha
+        return cls(weighted=float(ema[-1]), old_wt=old_wt, nobs=len(observed))
+
+    @property
+    def value(self) -> float:
+        return self.weighted if self.nobs > 0 else math.nan
+
+
+@dataclass(frozen=True)
+class MacdState:
+    fast: EmaState = EmaState()
+    slow: EmaState = EmaState()
+    bars: int = 0
+
+    @property
+    def macd(self) -> float:
+        return self.fast.value - self.slow.value
+
+
+class StreamingMacdCalculator:
+    """Stateful MACD that is seeded from history and then advanced per bar.
+
+    Produces exactly the values of ``EmaMacdCalculator.get_macd`` for the same
+    closes, but each new bar costs O(1). ``state`` can be saved with
+    ``to_dict`` and restored with ``from_dict`` so a cache can keep one
+    calculator per symbol and periodicity (see ``resume_macd``).
+    """
+
+    def __init__(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        state: Optional[MacdState] = None,
+    ) -> None:
+        if fast_period <= 0 or slow_period <= 0:
+            raise ValueError("EMA periods must be positive integers")
+        if fast_period >= slow_period:
+            raise ValueError("Fast period must be less than slow period")
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self._fast_alpha = span_to_alpha(fast_period)
+        self._slow_alpha = span_to_alpha(slow_period)
+        self.state = state or MacdState()
+
+    def seed(self, closes: Iterable[float]) -> pd.Series:
+        """Reset the state to the end of ``closes``; return the MACD of each bar.
+
+        The history goes through pandas' compiled ``ewm`` and the state is
+        read off its result, so seeding costs what ``get_macd`` does.
+        """
+        if not isinstance(closes, (pd.Series, np.ndarray)):
+            closes = list(closes)
+        series = pd.Series(closes, dtype=float)
+        values = series.to_numpy()
+        fast = series.ewm(span=self.fast_period, adjust=False).mean()
+        slow = series.ewm(span=self.slow_period, adjust=False).mean()
+        self.state = MacdState(
+            fast=EmaState.after(values, fast.to_numpy(), self._fast_alpha),
+            slow=EmaState.after(values, slow.to_numpy(), self._slow_alpha),
+            bars=len(values),
+        )
+        return fast - slow
+
+    def get_macd(self, df: pd.DataFrame) -> pd.Series:
+        """``MacdCalculator`` protocol: seed from ``df['close']``."""
+        if "close" not in df.columns:
+            raise KeyError(
+                "DataFrame must contain a 'close' column for MACD computation"
+            )
+        return self.seed(df["close"].astype(float))
+
+    def peek(self, close: float) -> float:
+        """Return the MACD the next bar would have without committing it.
+
+        Useful for a bar that is still forming: call ``peek`` on every tick
+        and ``update`` once the bar closes.
+        """
+        return self._advance(close).macd
+
+    def update(self, close: float) -> float:
+        """Append a closed bar and return its MACD value."""
+        self.state = self._advance(close)
+        return self.state.macd
+
+    def _advance(self, close: float) -> MacdState:
+        close = float(close)
+        return MacdState(
+            fast=self.state.fast.step(close, self._fast_alpha),
+            slow=self.state.slow.step(close, self._slow_alpha),
+            bars=self.state.bars + 1,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "fast_period": self.fast_period,
+            "slow_period": self.slow_period,
+            "state": asdict(self.state),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingMacdCalculator":
+        state = data["state"]
+        return cls(
+            fast_period=data["fast_period"],
+            slow_period=data["slow_period"],
+            state=MacdState(
+                fast=EmaState(**state["fast"]),
+                slow=EmaState(**state["slow"]),
+                bars=state["bars"],
+            ),
+        )
+
+
+def resume_macd(
+    closes: np.ndarray,
+    saved: Optional[Dict] = None,
+    fast_period: int = 12,
+    slow_period: int = 26,
+) -> Tuple[np.ndarray, Dict, bool]:
+    """MACD of ``closes`` (oldest first), continuing from a ``saved`` checkpoint.
+
+    Every bar but the last is treated as closed; the last may still be
+    forming and is only ``peek``-ed. The checkpoint holds the closed bars,
+    their MACD and the calculator state after them. When those bars are
+    still the start of ``closes`` only the new bars are stepped; otherwise
+    (first run, revised or shifted history, other periods) the calculator is
+    seeded again. Returns the MACD, the checkpoint to save for next time and
+    whether ``saved`` was reused. The MACD equals
+    ``EmaMacdCalculator.get_macd`` either way.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    closed = max(len(closes) - 1, 0)
+    reusable = (
+        saved is not None
+        and saved["calculator"]["fast_period"] == fast_period
+        and saved["calculator"]["slow_period"] == slow_period
+        and len(saved["closes"]) <= closed
+        and np.array_equal(
+            closes[: len(saved["closes"])], saved["closes"], equal_nan=True
+        )
+    )
+    if reusable:
+        calc = StreamingMacdCalculator.from_dict(saved["calculator"])
+        start = len(saved["closes"])
+        stepped = [calc.update(close) for close in closes[start:closed].tolist()]
+        head = np.concatenate([saved["macd"], np.asarray(stepped, dtype=np.float64)])
+    else:
+        calc = StreamingMacdCalculator(fast_period, slow_period)
+        head = calc.seed(closes[:closed]).to_numpy()
+
+    checkpoint = {
+        "calculator": calc.to_dict(),
+        "closes": closes[:closed].copy(),
+        "macd": head,
+    }
+    if len(closes) == 0:
+        return head, checkpoint, reusable
+    return np.append(head, calc.peek(closes[-1])), checkpoint, reusable
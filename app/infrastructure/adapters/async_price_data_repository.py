@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
+from app.domain.repositories import AsyncPriceDataRepository, PriceDataRepository
+from app.infrastructure.adapters.single_flight import SingleFlight
+from app.metrics import span
+
+
+class ExecutorAsyncPriceDataRepository(AsyncPriceDataRepository):
+    """Expose a blocking ``PriceDataRepository`` to async callers.
+
+    Calls run on a dedicated, bounded executor so the event loop stays free while
+    upstream requests are in flight. Size the executor like the HTTP connection
+    pool of the wrapped repository: ``max_workers`` concurrent fetches each hold
+    one pooled keep-alive connection.
+
+    With ``flights`` concurrent calls for the same ``(symbol, days)`` share one
+    fetch; callers waiting on a fetch already in flight do not occupy an
+    executor thread.
+    """
+
+    def __init__(
+        self,
+        repo: PriceDataRepository,
+        executor: Optional[Executor] = None,
+        max_workers: int = 32,
+        flights: Optional[SingleFlight] = None,
+    ) -> None:
+        if executor is None and max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+        self._repo = repo
+        self._flights = flights
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="price-data"
+        )
+
+    async def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        with span("price_data"):
+            return await self._get_stock_data(symbol, days)
+
+    async def _get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        if self._flights is not None:
+            frame = await self._flights.do_async(
+                (symbol, days),
+                lambda: self._repo.get_stock_data(symbol, days),
+                self._executor,
+            )
+            return frame.copy()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._repo.get_stock_data, symbol, days
+        )
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
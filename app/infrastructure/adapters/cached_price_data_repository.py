@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository, RangePriceDataRepository
+
+
+@dataclass
+class FreshnessPolicy:
+    """When cached history must be topped up from the upstream repository.
+
+    Bars before the most recent one are treated as immutable and never expire.
+    Once an entry is older than ``trailing_ttl_seconds`` only its trailing
+    window is refetched: the bars since the newest stored date, plus that bar
+    itself since it may still have been forming when it was stored.
+    """
+
+    trailing_ttl_seconds: float = 300.0
+
+    def is_stale(self, fetched_at: float, now: float) -> bool:
+        return now - fetched_at > self.trailing_ttl_seconds
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+    memory_entries: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Entry:
+    """Stored history for one symbol.
+
+    ``frame`` is kept newest-first with parsed dates. ``depth`` is the largest
+    ``days`` value fetched so far, so any request up to it can be answered by
+    slicing. ``ascending`` remembers the row order the wrapped repository uses.
+    """
+
+    fetched_at: float
+    depth: int
+    ascending: bool
+    frame: pd.DataFrame
+
+
+class _MemoryTier:
+    """Bounded LRU of ``symbol -> (stored_at, entry)``, with an optional TTL.
+
+    Without a TTL entries stay until the LRU bound evicts them; staleness of
+    the trailing bar is the ``FreshnessPolicy``'s call, not the tier's.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float]) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, _Entry]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, symbol: str, now: float) -> Tuple[Optional[_Entry], int]:
+        """Return ``(entry or None, evicted_count)``."""
+        item = self._entries.get(symbol)
+        if item is None:
+            return None, 0
+        stored_at, entry = item
+        if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+            del self._entries[symbol]
+            return None, 1
+        self._entries.move_to_end(symbol)
+        return entry, 0
+
+    def put(self, symbol: str, entry: _Entry, now: float) -> int:
+        """Store an entry and return how many entries were evicted to make room."""
+        self._entries[symbol] = (now, entry)
+        self._entries.move_to_end(symbol)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _SqliteTier:
+    """On-disk tier shared by every process that opens the same file."""
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS symbol_history ("
+            " symbol TEXT PRIMARY KEY,"
+            " fetched_at REAL NOT NULL,"
+            " depth INTEGER NOT NULL,"
+            " ascending INTEGER NOT NULL,"
+            " frame BLOB NOT NULL)"
+        )
+
+    def get(self, symbol: str) -> Optional[_Entry]:
+        row = self._conn.execute(
+            "SELECT fetched_at, depth, ascending, frame FROM symbol_history"
+            " WHERE symbol = ?",
+            (symbol,),
+        ).fetchone()
+        if row is None:
+            return None
+        return _Entry(row[0], row[1], bool(row[2]), pickle.loads(row[3]))
+
+    def put(self, symbol: str, entry: _Entry) -> None:
+        blob = pickle.dumps(entry.frame, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO symbol_history"
+            " (symbol, fetched_at, depth, ascending, frame) VALUES (?, ?, ?, ?, ?)",
+            (symbol, entry.fetched_at, entry.depth, int(entry.ascending), blob),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CachedPriceDataRepository(PriceDataRepository):
+    """Caching decorator for any ``PriceDataRepository``.
+
+    History is stored per symbol. Lookups go to a bounded in-process LRU first,
+    then to an optional SQLite file that all gunicorn workers can share, and
+    finally to the wrapped repository. A request for fewer ``days`` than already
+    stored is answered by slicing. Stale entries (see ``FreshnessPolicy``) are
+    topped up incrementally: when the wrapped repository supports date ranges
+    (``RangePriceDataRepository``) only bars from the newest stored date onward
+    are requested, otherwise a small trailing ``days`` window is. New bars are
+    merged into the stored frame and de-duplicated by date.
+
+    The memory tier has no TTL by default, so a stale entry is topped up rather
+    than dropped and downloaded again. ``ttl_seconds`` only bounds how long a
+    worker keeps history it no longer shares through the disk tier.
+
+    Frames keep the row order of the wrapped repository (newest first for FMP)
+    with ``date`` parsed to datetime; callers receive copies and may mutate
+    them freely.
+    """
+
+    def __init__(
+        self,
+        inner: PriceDataRepository,
+        max_entries: int = 256,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+        self._inner = inner
+        self._memory = _MemoryTier(max_entries, ttl_seconds)
+        self._disk = _SqliteTier(disk_path) if disk_path else None
+        self._freshness = freshness or FreshnessPolicy()
+        self._clock = clock
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._stats.memory_entries = len(self._memory)
+            return CacheStats(**self._stats.as_dict())
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        now = self._clock()
+        entry = self._lookup(symbol, days, now)
+
+        if entry is None or days > entry.depth:
+            fetched = self._inner.get_stock_data(symbol, days)
+            ascending = _is_ascending(fetched)
+            frame = _newest_first(fetched)
+            if entry is not None:
+                frame = _merge(frame, entry.frame)
+            entry = _Entry(now, days, ascending, frame)
+            self._store(symbol, entry)
+        elif self._freshness.is_stale(entry.fetched_at, now):
+            tail = self._fetch_tail(symbol, days, entry.frame, now)
+            entry = _Entry(now, entry.depth, entry.ascending, _merge(tail, entry.frame))
+            with self._lock:
+                self._stats.refreshes += 1
+            self._store(symbol, entry)
+
+        out = entry.frame.head(days)
+        if entry.ascending:
+            out = out.iloc[::-1]
+        return out.reset_index(drop=True)
+
+    def _lookup(self, symbol: str, days: int, now: float) -> Optional[_Entry]:
+        with self._lock:
+            entry, evicted = self._memory.get(symbol, now)
+            self._stats.evictions += evicted
+            if entry is None and self._disk is not None:
+                entry = self._disk.get(symbol)
+                if entry is not None and days <= entry.depth:
+                    self._stats.disk_hits += 1
+                    self._stats.evictions += self._memory.put(symbol, entry, now)
+                    return entry
+            elif entry is not None and days <= entry.depth:
+                self._stats.memory_hits += 1
+                return entry
+            self._stats.misses += 1
+            return entry
+
+    def _store(self, symbol: str, entry: _Entry) -> None:
+        with self._lock:
+            self._stats.evictions += self._memory.put(symbol, entry, entry.fetched_at)
+            if self._disk is not None:
+                self._disk.put(symbol, entry)
+
+    def _fetch_tail(
+        self, symbol: str, days: int, frame: pd.DataFrame, now: float
+    ) -> pd.DataFrame:
+        if frame.empty:
+            return _newest_first(self._inner.get_stock_data(symbol, days))
+        newest = frame["date"].iloc[0].normalize()
+        if isinstance(self._inner, RangePriceDataRepository):
+            # Re-request the newest stored bar too: it may have still been forming
+            return _newest_first(
+                self._inner.get_stock_data_range(symbol, newest.date())
+            )
+        today = pd.Timestamp(now, unit="s").normalize()
+        # Calendar days bound the number of trading bars since the newest one
+        since = max(0, (today - newest).days)
+        return _newest_first(self._inner.get_stock_data(symbol, min(days, since + 1)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+def _is_ascending(df: pd.DataFrame) -> bool:
+    return len(df) > 1 and _parse_dates(df["date"]).is_monotonic_increasing
+
+
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates)  # type: ignore[arg-type]
+
+
+def _newest_first(df: pd.DataFrame) -> pd.DataFrame:
+    # Always copy: the cache must not share frames with the wrapped repository
+    df = df.copy()
+    df["date"] = _parse_dates(df["date"])
+    if not df["date"].is_monotonic_decreasing:
+        df = df.sort_values("date", ascending=False)
+    return df.reset_index(drop=True)
+
+
+def _merge(newer: pd.DataFrame, older: pd.DataFrame) -> pd.DataFrame:
+    """Combine two newest-first frames, preferring ``newer`` rows on equal dates."""
+    if newer.empty:
+        return older
+    merged = pd.concat([newer, older], ignore_index=True)
+    merged = merged.drop_duplicates(subset="date", keep="first")
+    return merged.sort_values("date", ascending=False, kind="stable").reset_index(
+        drop=True
+    )
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.domain.repositories import RangePriceDataRepository
+from app.infrastructure.adapters.fmp_columnar import OHLCV_COLUMNS
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+MANIFEST_NAME = "manifest.jsonl"
+PARQUET_FILE = "bars.parquet"
+FORMATS = ("npy", "parquet")
+CURRENT_NAME = "CURRENT"
+VERSION_PREFIX = "v-"
+# The live version plus the one before it, for readers that resolved it just
+# before a rewrite
+KEEP_VERSIONS = 2
+
+
+class ColumnarPriceStore:
+    """Partitioned on-disk OHLCV dataset, one ``symbol=<SYMBOL>`` directory each.
+
+    A partition holds immutable ``v-<ns>`` versions and a ``CURRENT`` file
+    naming the live one, like the generations of ``SharedPriceSegment``. A
+    version holds either one ``.npy`` file per column (``npy`` format, always
+    available) or a single ``bars.parquet`` file (``parquet`` format, needs
+    ``pyarrow``). Bars are stored oldest first with ``date`` as
+    datetime64[ns]. A rewrite builds a new version and replaces ``CURRENT``
+    atomically; readers resolve ``CURRENT`` once and open every column from
+    that version, so they never see a missing symbol or mixed columns.
+
+    ``manifest.jsonl`` is an append-only log with one line per completed
+    symbol (rows, date span, write time) or failure; a backfill reads it to
+    resume. Appending keeps each update O(1) for large universes, and a line
+    torn by a crash is ignored.
+    """
+
+    def __init__(self, root: Union[str, Path], fmt: str = "npy") -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Expected one of: npy, parquet")
+        if fmt == "parquet" and pq is None:
+            raise RuntimeError("The parquet format requires pyarrow")
+        self.root = Path(root)
+        self.fmt = fmt
+        self._lock = threading.Lock()
+
+    def partition(self, symbol: str) -> Path:
+        return self.root / f"symbol={symbol}"
+
+    def write(self, symbol: str, df: pd.DataFrame) -> Dict:
+        """Store ``df`` for ``symbol`` and record it in the manifest."""
+        frame = chronological_frame(df)
+        part = self.partition(symbol)
+        part.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=part))
+        try:
+            if self.fmt == "parquet":
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                pq.write_table(table, staging / PARQUET_FILE)
+            else:
+                for column in OHLCV_COLUMNS:
+                    np.save(staging / f"{column}.npy", frame[column].to_numpy())
+            with self._lock:
+                stamp = time.time_ns()
+                while (part / f"{VERSION_PREFIX}{stamp}").exists():
+                    stamp += 1
+                name = f"{VERSION_PREFIX}{stamp}"
+                os.replace(staging, part / name)
+                pointer = part / f".{CURRENT_NAME}.tmp"
+                pointer.write_text(name)
+                os.replace(pointer, part / CURRENT_NAME)
+                _prune(part, keep=name)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        entry = {
+            "rows": int(len(frame)),
+            "first_date": _iso(frame["date"].iloc[0]) if len(frame) else None,
+            "last_date": _iso(frame["date"].iloc[-1]) if len(frame) else None,
+            "format": self.fmt,
+            "written_at": time.time(),
+        }
+        self._update_manifest(symbol, entry=entry)
+        return entry
+
+    def version(self, symbol: str) -> Optional[Path]:
+        """Directory of the live version of ``symbol``, or ``None`` if absent."""
+        part = self.partition(symbol)
+        try:
+            name = (part / CURRENT_NAME).read_text().strip()
+        except FileNotFoundError:
+            # Partitions written before versioning hold their files directly
+            return part if part.is_dir() else None
+        return part / name
+
+    def read(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Return the stored bars oldest first, or ``None`` if absent."""
+        columns = self.read_columns(symbol)
+        if columns is None:
+            return None
+        return pd.DataFrame(columns, columns=OHLCV_COLUMNS, copy=False)
+
+    def read_columns(self, symbol: str) -> Optional[Dict[str, np.ndarray]]:
+        """Column arrays of the live version of ``symbol``, or ``None``.
+
+        ``npy`` columns are memory-mapped, so only the pages actually used are
+        read. Every column comes from the same version.
+        """
+        for _ in range(3):
+            path = self.version(symbol)
+            if path is None:
+                return None
+            try:
+                return _load_version(path)
+            except FileNotFoundError:
+                # Pruned between resolving CURRENT and opening it; resolve again
+                continue
+        return None
+
+    def record_failure(self, symbol: str, detail: str) -> None:
+        self._update_manifest(symbol, failure=detail)
+
+    def manifest(self) -> Dict:
+        """Fold the manifest log into ``{"symbols": {...}, "failures": {...}}``."""
+        manifest: Dict[str, Dict] = {"symbols": {}, "failures": {}}
+        path = self.root / MANIFEST_NAME
+        if not path.exists():
+            return manifest
+        with path.open() as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                symbol = record.pop("symbol")
+                if record.pop("status") == "done":
+                    manifest["symbols"][symbol] = record
+                    manifest["failures"].pop(symbol, None)
+                else:
+                    manifest["failures"][symbol] = record["detail"]
+        return manifest
+
+    def completed(self) -> List[str]:
+        return list(self.manifest()["symbols"])
+
+    def _update_manifest(
+        self, symbol: str, entry: Optional[Dict] = None, failure: Optional[str] = None
+    ) -> None:
+        if entry is not None:
+            record = {"symbol": symbol, "status": "done", **entry}
+        else:
+            record = {"symbol": symbol, "status": "failed", "detail": failure}
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with (self.root / MANIFEST_NAME).open("a") as fh:
+                fh.write(json.dumps(record, sort_keys=True) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+
+
+class ColumnarPriceDataRepository(RangePriceDataRepository):
+    """``PriceDataRepository`` over a ``ColumnarPriceStore``; no network.
+
+    Mirrors the FMP adapter: ``get_stock_data`` returns the newest ``days``
+    bars newest first, and a missing symbol raises ``RuntimeError``. Only the
+    requested tail of each memory-mapped column is copied into the frame.
+    """
+
+    def __init__(self, store: Union[ColumnarPriceStore, str, Path]) -> None:
+        self._store = (
+            store
+            if isinstance(store, ColumnarPriceStore)
+            else ColumnarPriceStore(store)
+        )
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        columns = self._columns(symbol)
+        n = len(columns["date"])
+        return newest_first_frame(columns, max(0, n - days), n)
+
+    def get_stock_data_range(
+        self, symbol: str, start: date, end: Optional[date] = None
+    ) -> pd.DataFrame:
+        columns = self._columns(symbol)
+        dates = columns["date"]
+        lo = int(np.searchsorted(dates, np.datetime64(start, "ns"), side="left"))
+        hi = len(dates)
+        if end is not None:
+            after_end = np.datetime64(end, "ns") + np.timedelta64(1, "D")
+            hi = int(np.searchsorted(dates, after_end, side="left"))
+        return newest_first_frame(columns, lo, max(lo, hi))
+
+    def _columns(self, symbol: str) -> Dict[str, np.ndarray]:
+        columns = self._store.read_columns(symbol)
+        if columns is None:
+            raise RuntimeError(f"No historical data stored for symbol '{symbol}'")
+        return columns
+
+
+def _load_version(path: Path) -> Optional[Dict[str, np.ndarray]]:
+    if (path / PARQUET_FILE).exists():
+        if pq is None:
+            raise RuntimeError("Reading parquet partitions requires pyarrow")
+        table = pq.read_table(path / PARQUET_FILE, memory_map=True).to_pandas()
+        return {column: table[column].to_numpy() for column in OHLCV_COLUMNS}
+    if not (path / "date.npy").exists():
+        return None
+    return {
+        column: np.load(path / f"{column}.npy", mmap_mode="r")
+        for column in OHLCV_COLUMNS
+    }
+
+
+def _prune(part: Path, keep: str) -> None:
+    versions = sorted(
+        (p for p in part.glob(f"{VERSION_PREFIX}*") if p.is_dir()),
+        key=lambda p: p.name,
+    )
+    older = [p for p in versions if p.name != keep]
+    for path in older[: max(0, len(older) - (KEEP_VERSIONS - 1))]:
+        shutil.rmtree(path, ignore_errors=True)
+    # Files of a partition written before versioning
+    for path in [*part.glob("*.npy"), part / PARQUET_FILE]:
+        path.unlink(missing_ok=True)
+
+
+def newest_first_frame(
+    columns: Dict[str, np.ndarray], lo: int, hi: int
+) -> pd.DataFrame:
+    """Copy rows ``[lo, hi)`` of chronological columns into a newest-first frame."""
+    # Slicing the memmaps reads only [lo, hi); reversing gives FMP's newest-first order
+    return pd.DataFrame(
+        {column: np.array(columns[column][lo:hi][::-1]) for column in OHLCV_COLUMNS},
+        columns=OHLCV_COLUMNS,
+    )
+
+
+def chronological_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """OHLCV columns of ``df`` oldest first, one row per date."""
+    frame = df[OHLCV_COLUMNS].copy()
+    if not pd.api.types.is_datetime64_any_dtype(frame["date"]):
+        frame["date"] = pd.to_datetime(frame["date"])  # type: ignore[arg-type]
+    frame["date"] = frame["date"].astype("datetime64[ns]")
+    frame = frame.drop_duplicates(subset="date", keep="first")
+    return frame.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def _iso(value: pd.Timestamp) -> str:
+    return pd.Timestamp(value).isoformat()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+OHLCV_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+loads: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
+
+
+def decode_json(response: Any) -> Any:
+    """Decode an HTTP response body.
+
+    Uses ``orjson`` on the raw bytes when it is installed, which skips the text
+    decoding step of ``Response.json``; otherwise defers to ``response.json()``.
+    Raises ``ValueError`` on malformed JSON either way.
+    """
+    content = getattr(response, "content", None)
+    if orjson is not None and isinstance(content, (bytes, bytearray)):
+        return orjson.loads(content)
+    return response.json()
+
+
+def historical_to_frame(rows: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """Build an OHLCV frame from FMP ``historical`` records, column by column.
+
+    Only the OHLCV fields are read; extras such as ``label``, ``vwap`` or
+    ``changeOverTime`` are never materialized. Prices are float64, ``volume``
+    is int64 (float64 if FMP sent fractional or missing volumes) and ``date``
+    is datetime64[ns], so downstream code does not need to parse it again.
+    Row order is preserved.
+    """
+    n = len(rows)
+    data: Dict[str, np.ndarray] = {"date": _dates(rows)}
+    for column in PRICE_COLUMNS:
+        data[column] = _floats(rows, column, n)
+    data["volume"] = _volumes(rows, n)
+    return pd.DataFrame(data, columns=OHLCV_COLUMNS)
+
+
+def _dates(rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+    values = [row["date"] for row in rows]
+    try:
+        return np.array(values, dtype="datetime64[ns]")
+    except ValueError:
+        return pd.to_datetime(values).values
+
+
+def _floats(rows: Sequence[Dict[str, Any]], column: str, n: int) -> np.ndarray:
+    try:
+        return np.fromiter((row[column] for row in rows), dtype=np.float64, count=n)
+    except (KeyError, TypeError, ValueError):
+        # Missing keys, nulls or numeric strings: take the slow, forgiving path
+        values: List[Any] = [row.get(column) for row in rows]
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan
+        )
+
+
+def _volumes(rows: Sequence[Dict[str, Any]], n: int) -> np.ndarray:
+    volumes = _floats(rows, "volume", n)
+    if np.isfinite(volumes).all() and (volumes == np.floor(volumes)).all():
+        return volumes.astype(np.int64)
+    return volumes
@@ -1,46 +1,166 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import requests
 from requests import RequestException, Response
 
-from app.domain.repositories import PriceDataRepository
+from app.domain.repositories import RangePriceDataRepository
+from app.infrastructure.adapters.fmp_columnar import decode_json, historical_to_frame
+from app.infrastructure.http_resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+    UpstreamUnavailableError,
+    parse_retry_after,
+)
+from app.metrics import count_upstream, span
 
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
 
-class FmpPriceDataRepository(PriceDataRepository):
+
+class FmpPriceDataRepository(RangePriceDataRepository):
     BASE_URL = "https://financialmodelingprep.com/api/v3/historical-price-full"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[requests.Session] = None,
+        timeout: Union[float, Tuple[float, float]] = 30,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create the adapter.
+
+        Pass a shared ``session`` (see ``app.infrastructure.http_session``) to reuse
+        pooled keep-alive connections; without one every call opens a new
+        connection. ``timeout`` accepts a single value or ``(connect, read)``.
+
+        ``rate_limiter`` paces every request (retries included). With ``retry``,
+        429s, 5xx, transport errors and FMP's "Limit Reach" payloads are retried
+        with backoff, honoring ``Retry-After``. ``breaker`` counts requests that
+        still fail and then rejects calls with ``CircuitOpenError`` until the
+        upstream recovers. Without them a request is attempted once.
+        """
         if not api_key:
             raise ValueError("FINANCIALMODELINGPREP_API_KEY is not set")
         self._api_key = api_key
+        self._session = session
+        self._timeout = timeout
+        self._base_url = base_url or self.BASE_URL
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self._breaker = breaker
+        self._sleep = sleep
 
     def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
-        url = f"{self.BASE_URL}/{symbol}"
-        params = {
-            "timeseries": days,
-            "apikey": self._api_key,
-        }
+        """Return OHLCV bars newest first, with ``date`` parsed to datetime64."""
+        payload = self._request(symbol, {"timeseries": days})
+        with span("fmp_frame"):
+            df = historical_to_frame(self._historical(payload))
+        if df.empty:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return df
+
+    def get_stock_data_range(
+        self, symbol: str, start: date, end: Optional[date] = None
+    ) -> pd.DataFrame:
+        params = {"from": start.isoformat()}
+        if end is not None:
+            params["to"] = end.isoformat()
+        payload = self._request(symbol, params)
+        # FMP answers an empty object when the range holds no bars (e.g. weekends)
+        if payload in ({}, []):
+            return historical_to_frame([])
+        return historical_to_frame(self._historical(payload))
+
+    def _request(self, symbol: str, params: Dict[str, object]) -> Any:
+        url = f"{self._base_url}/{symbol}"
+        params = {**params, "apikey": self._api_key}
+
+        if self._breaker is None:
+            return self._request_with_retries(url, params)
+        self._breaker.before_call()
+        try:
+            payload = self._request_with_retries(url, params)
+        except UpstreamUnavailableError:
+            self._breaker.record_failure()
+            raise
+        except Exception:
+            # A non-retryable answer (bad key, unknown symbol...) still proves
+            # the upstream is up
+            self._breaker.record_success()
+            raise
+        self._breaker.record_success()
+        return payload
+
+    def _request_with_retries(self, url: str, params: Dict[str, object]) -> Any:
+        attempts = self._retry.max_attempts if self._retry is not None else 1
+        for attempt in range(attempts):
+            try:
+                return self._attempt(url, params)
+            except UpstreamUnavailableError as exc:
+                if self._retry is None or attempt + 1 >= attempts:
+                    raise
+                self._sleep(self._retry.delay(attempt, exc.retry_after))
+
+    def _attempt(self, url: str, params: Dict[str, object]) -> Any:
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        http = self._session if self._session is not None else requests
+        try:
+            with span("fmp_request"):
+                response = http.get(url, params=params, timeout=self._timeout)
+        except RequestException as exc:
+            count_upstream("error")
+            raise UpstreamUnavailableError(f"FMP request failed: {exc}")
+        count_upstream(str(response.status_code))
+
+        if response.status_code in RETRYABLE_STATUS:
+            headers = getattr(response, "headers", None) or {}
+            raise UpstreamUnavailableError(
+                f"FMP request failed: HTTP {response.status_code}",
+                parse_retry_after(headers, time.time()),
+            )
         try:
-            response = requests.get(url, params=params, timeout=30)
             response.raise_for_status()
         except RequestException as exc:
             raise RuntimeError(f"FMP request failed: {exc}")
 
         try:
-            payload = response.json()
+            with span("fmp_json"):
+                payload = decode_json(response)
         except ValueError as exc:
             raise RuntimeError(f"FMP invalid JSON: {exc}")
+        if _is_rate_limit_payload(payload):
+            raise UpstreamUnavailableError(
+                f"FMP rate limit: {payload['Error Message']}"
+            )
+        return payload
 
-        historical = payload.get("historical")
+    @staticmethod
+    def _historical(payload: Any) -> List[Dict]:
+        historical = payload.get("historical") if isinstance(payload, dict) else None
         if historical is None:
             # Common when key is invalid or rate-limited; surface concise detail
             msg = payload if isinstance(payload, str) else str(payload)[:200]
             raise RuntimeError(f"FMP response missing 'historical': {msg}")
+        return historical
 
-        df = pd.DataFrame(historical)
-        if df.empty:
-            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
-        return df
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def _is_rate_limit_payload(payload: Any) -> bool:
+    # FMP sometimes answers 200 with {"Error Message": "Limit Reach . Please ..."}
+    if not isinstance(payload, dict):
+        return False
+    message = payload.get("Error Message")
+    return isinstance(message, str) and "limit" in message.lower()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.domain.repositories import IndicatorKey, IndicatorStore, StoredIndicator
+
+
+class InMemoryIndicatorStore(IndicatorStore):
+    """Process-local ``IndicatorStore``; a lookup is a single dict access.
+
+    Stored values are handed out as-is, so callers must treat them as
+    read-only.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[IndicatorKey, StoredIndicator] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: IndicatorKey) -> Optional[StoredIndicator]:
+        return self._entries.get(key)
+
+    def put(self, key: IndicatorKey, value: Any, computed_at: float) -> None:
+        with self._lock:
+            self._entries[key] = StoredIndicator(value, computed_at)
+
+    def keys(self) -> List[IndicatorKey]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.domain.repositories import (
+    LatestMinimaIndex,
+    LatestMinimum,
+    MinimaScreenPage,
+)
+
+
+class _Snapshot(NamedTuple):
+    by_symbol: Dict[str, LatestMinimum]
+    # Sorted by (bars_since, symbol); ``ages`` mirrors it for bisection
+    ordered: List[LatestMinimum]
+    ages: List[int]
+    computed_at: float
+
+
+class InMemoryLatestMinimaIndex(LatestMinimaIndex):
+    """Process-local ``LatestMinimaIndex``.
+
+    Each ``(periodicity, window)`` holds an immutable snapshot sorted by age,
+    rebuilt on ``update`` and swapped in under the lock. A screen finds the
+    last match by bisection and slices the page, so it costs
+    O(log symbols + page size) and never blocks on a refresh.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: Dict[Tuple[str, int], _Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        periodicity: str,
+        window: int,
+        latest: Mapping[str, Optional[LatestMinimum]],
+        computed_at: float,
+    ) -> None:
+        with self._lock:
+            previous = self._snapshots.get((periodicity, window))
+            by_symbol = dict(previous.by_symbol) if previous is not None else {}
+            for symbol, entry in latest.items():
+                if entry is None:
+                    by_symbol.pop(symbol, None)
+                else:
+                    by_symbol[symbol] = entry
+            ordered = sorted(by_symbol.values(), key=lambda e: (e.bars_since, e.symbol))
+            self._snapshots[(periodicity, window)] = _Snapshot(
+                by_symbol, ordered, [e.bars_since for e in ordered], computed_at
+            )
+
+    def screen(
+        self,
+        periodicity: str,
+        window: int,
+        within: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Optional[MinimaScreenPage]:
+        snapshot = self._snapshots.get((periodicity, window))
+        if snapshot is None:
+            return None
+        total = bisect.bisect_right(snapshot.ages, within)
+        stop = total if limit is None else min(total, offset + limit)
+        return MinimaScreenPage(
+            snapshot.ordered[offset:stop], total, snapshot.computed_at
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
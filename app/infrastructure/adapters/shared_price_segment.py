@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository
+from app.infrastructure.adapters.cached_price_data_repository import FreshnessPolicy
+from app.infrastructure.adapters.columnar_price_store import (
+    chronological_frame,
+    newest_first_frame,
+)
+from app.infrastructure.adapters.fmp_columnar import OHLCV_COLUMNS
+
+CURRENT_NAME = "CURRENT"
+INDEX_NAME = "index.json"
+LOCK_NAME = "writer.lock"
+# Generations kept on disk: the current one and the one readers may still be
+# switching away from. Unlinked files stay valid for processes mapping them.
+KEEP_GENERATIONS = 2
+
+
+class Generation(NamedTuple):
+    """One immutable, memory-mapped snapshot of the segment."""
+
+    name: str
+    columns: Dict[str, np.ndarray]
+    symbols: Dict[str, Dict]
+    days: int
+    written_at: float
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+
+class SegmentSlice(NamedTuple):
+    """Views of one symbol's bars (oldest first) inside a generation."""
+
+    columns: Dict[str, np.ndarray]
+    fetched_at: float
+    depth: int
+    int_volume: bool
+
+    def frame(self, days: int) -> pd.DataFrame:
+        n = len(self.columns["date"])
+        df = newest_first_frame(self.columns, max(0, n - days), n)
+        if self.int_volume:
+            df["volume"] = df["volume"].astype(np.int64)
+        return df
+
+
+class SegmentBuilder:
+    """Collects frames for the next generation of a ``SharedPriceSegment``.
+
+    Implements the ``PriceHistorySink`` protocol, so ``backfill_prices`` can
+    fill it. A symbol that fails keeps its bars from ``previous`` (with their
+    original fetch time) instead of dropping out of the segment.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        days: int,
+        previous: Optional[Generation] = None,
+        clock: Callable[[], float] = time.time,
+        on_commit: Optional[Callable[[], object]] = None,
+    ) -> None:
+        self._root = root
+        self._days = days
+        self._previous = previous
+        self._clock = clock
+        self._on_commit = on_commit
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def completed(self) -> List[str]:
+        return []
+
+    def write(self, symbol: str, df: pd.DataFrame) -> Dict:
+        frame = chronological_frame(df)
+        with self._lock:
+            self._frames[symbol] = frame
+            self._fetched_at[symbol] = self._clock()
+        return {"rows": len(frame)}
+
+    def record_failure(self, symbol: str, detail: str) -> None:
+        previous = self._previous
+        if previous is None or symbol in self._frames:
+            return
+        entry = previous.symbols.get(symbol)
+        if entry is None:
+            return
+        start, rows = entry["offset"], entry["rows"]
+        frame = pd.DataFrame(
+            {c: previous.columns[c][start : start + rows] for c in OHLCV_COLUMNS}
+        )
+        if entry["int_volume"]:
+            frame["volume"] = frame["volume"].astype(np.int64)
+        with self._lock:
+            self._frames[symbol] = frame
+            self._fetched_at[symbol] = entry["fetched_at"]
+
+    def commit(self) -> str:
+        """Write the generation, make it current and prune old ones."""
+        written_at = self._clock()
+        name = f"gen-{time.time_ns()}"
+        staging = self._root / f".{name}"
+        staging.mkdir(parents=True)
+        symbols: Dict[str, Dict] = {}
+        offset = 0
+        for symbol, frame in self._frames.items():
+            symbols[symbol] = {
+                "offset": offset,
+                "rows": len(frame),
+                "fetched_at": self._fetched_at[symbol],
+                "int_volume": pd.api.types.is_integer_dtype(frame["volume"]),
+            }
+            offset += len(frame)
+
+        frames = list(self._frames.values())
+        for column in OHLCV_COLUMNS:
+            dtype = "datetime64[ns]" if column == "date" else np.float64
+            if frames:
+                values = np.concatenate(
+                    [frame[column].to_numpy(dtype=dtype) for frame in frames]
+                )
+            else:
+                values = np.empty(0, dtype=dtype)
+            np.save(staging / f"{column}.npy", values)
+        index = {"days": self._days, "written_at": written_at, "symbols": symbols}
+        (staging / INDEX_NAME).write_text(json.dumps(index))
+        os.replace(staging, self._root / name)
+
+        pointer = self._root / f".{CURRENT_NAME}.tmp"
+        pointer.write_text(name)
+        os.replace(pointer, self._root / CURRENT_NAME)
+        _prune(self._root, keep=name)
+        if self._on_commit is not None:
+            self._on_commit()
+        return name
+
+
+class SharedPriceSegment:
+    """Read-only OHLCV arrays shared by every worker process through mmap.
+
+    Each generation is a directory with one ``.npy`` file per column holding
+    all symbols back to back, and ``index.json`` mapping each symbol to its
+    offset, row count and fetch time. ``CURRENT`` names the live generation.
+    Workers memory-map the columns, so the bars live once in the page cache
+    however many workers read them; a lookup returns views, and only the bars
+    a request needs are copied.
+
+    A writer builds a new generation next to the live one and swaps
+    ``CURRENT`` atomically. Readers notice the swap within ``check_interval``
+    seconds and map the new files; the old ones stay valid until unmapped.
+    ``writer_lock`` serialises writers across processes.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.root = Path(root)
+        self._check_interval = check_interval
+        self._clock = clock
+        self._generation: Optional[Generation] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[Generation]:
+        now = self._clock()
+        with self._lock:
+            if (
+                self._checked_at is None
+                or now - self._checked_at >= self._check_interval
+            ):
+                self._checked_at = now
+                self._generation = self._load(self._generation)
+            return self._generation
+
+    def lookup(self, symbol: str) -> Optional[SegmentSlice]:
+        generation = self.current()
+        if generation is None:
+            return None
+        entry = generation.symbols.get(symbol)
+        if entry is None:
+            return None
+        start, stop = entry["offset"], entry["offset"] + entry["rows"]
+        return SegmentSlice(
+            {
+                column: values[start:stop]
+                for column, values in generation.columns.items()
+            },
+            entry["fetched_at"],
+            generation.days,
+            entry["int_volume"],
+        )
+
+    def reload(self) -> Optional[Generation]:
+        """Like ``current`` but always re-reads ``CURRENT``."""
+        with self._lock:
+            self._checked_at = self._clock()
+            self._generation = self._load(self._generation)
+            return self._generation
+
+    def builder(self, days: int) -> SegmentBuilder:
+        return SegmentBuilder(
+            self.root, days, previous=self.reload(), on_commit=self.reload
+        )
+
+    @contextmanager
+    def writer_lock(self) -> Iterator[None]:
+        """Exclusive across processes; blocks until the lock is free."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / LOCK_NAME).open("a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def stats(self) -> Dict:
+        generation = self.current()
+        if generation is None:
+            return {"generation": None, "symbols": 0, "bytes": 0, "written_at": None}
+        return {
+            "generation": generation.name,
+            "symbols": len(generation.symbols),
+            "bytes": generation.nbytes,
+            "written_at": generation.written_at,
+        }
+
+    def _load(self, loaded: Optional[Generation]) -> Optional[Generation]:
+        try:
+            name = (self.root / CURRENT_NAME).read_text().strip()
+        except FileNotFoundError:
+            return None
+        if loaded is not None and loaded.name == name:
+            return loaded
+        path = self.root / name
+        try:
+            index = json.loads((path / INDEX_NAME).read_text())
+            columns = {
+                column: np.load(path / f"{column}.npy", mmap_mode="r")
+                for column in OHLCV_COLUMNS
+            }
+        except FileNotFoundError:
+            # Pruned between reading CURRENT and mapping it; retry next check
+            return loaded
+        return Generation(
+            name, columns, index["symbols"], index["days"], index["written_at"]
+        )
+
+
+@dataclass
+class SegmentStats:
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class SharedSegmentPriceDataRepository(PriceDataRepository):
+    """Serve price history from a ``SharedPriceSegment``, else from ``inner``.
+
+    A symbol is served from the segment when it was fetched less than
+    ``max_age_seconds`` ago and the request asks for no more ``days`` than
+    the segment holds; everything else goes to ``inner`` unchanged.
+
+    Only bars before the newest one are immutable, so the segment defers to
+    ``freshness`` (the cache's ``FreshnessPolicy``) for the trailing bar:
+    once it is stale, the bars since the segment's newest date, that one
+    included, come from ``inner`` and replace the segment's. ``inner`` is
+    normally the per-worker cache, which keeps that small window fresh.
+    """
+
+    def __init__(
+        self,
+        inner: PriceDataRepository,
+        segment: SharedPriceSegment,
+        max_age_seconds: float,
+        freshness: Optional[FreshnessPolicy] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.inner = inner
+        self.segment = segment
+        self._max_age = max_age_seconds
+        self._freshness = freshness or FreshnessPolicy()
+        self._clock = clock
+        self._stats = SegmentStats()
+        self._lock = threading.Lock()
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        now = self._clock()
+        hit = self.segment.lookup(symbol)
+        served = (
+            hit is not None
+            and days <= hit.depth
+            and now - hit.fetched_at <= self._max_age
+        )
+        refresh = served and self._freshness.is_stale(hit.fetched_at, now)
+        with self._lock:
+            if served:
+                self._stats.hits += 1
+                self._stats.refreshes += int(refresh)
+            else:
+                self._stats.misses += 1
+        if not served:
+            return self.inner.get_stock_data(symbol, days)
+        frame = hit.frame(days)
+        if refresh and not frame.empty:
+            frame = self._with_fresh_tail(symbol, days, frame, now)
+        return frame
+
+    def _with_fresh_tail(
+        self, symbol: str, days: int, frame: pd.DataFrame, now: float
+    ) -> pd.DataFrame:
+        newest = frame["date"].iloc[0].normalize()
+        today = pd.Timestamp(now, unit="s").normalize()
+        # Calendar days bound the number of trading bars since the newest one
+        since = max(0, (today - newest).days)
+        tail = self.inner.get_stock_data(symbol, min(days, since + 1)).copy()
+        if tail.empty:
+            return frame
+        tail["date"] = pd.to_datetime(tail["date"])
+        older = frame[frame["date"] < tail["date"].min()]
+        merged = pd.concat([tail[frame.columns], older], ignore_index=True)
+        merged = merged.sort_values("date", ascending=False, kind="stable")
+        return merged.head(days).reset_index(drop=True)
+
+    def stats(self) -> SegmentStats:
+        with self._lock:
+            return SegmentStats(**self._stats.as_dict())
+
+
+def _prune(root: Path, keep: str) -> None:
+    generations = sorted(
+        (p for p in root.glob("gen-*") if p.is_dir()), key=lambda p: p.name
+    )
+    older = [p for p in generations if p.name != keep]
+    for path in older[: max(0, len(older) - (KEEP_GENERATIONS - 1))]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor, Future
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import pandas as pd
+
+from app.domain.repositories import PriceDataRepository
+from app.metrics import span
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    shared: int = 0
+    in_flight: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class SingleFlight:
+    """De-duplicate concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for the same result or exception instead
+    of running it again. Once the leader finishes the key is forgotten, so
+    later calls run afresh; this is coalescing, not caching.
+
+    Sync and async callers share the same in-flight table: ``do_async``
+    awaits a fetch started by a thread, and vice versa, without blocking the
+    event loop.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = SingleFlightStats()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, fn, future)
+        return future.result()
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[[], T], executor: Optional[Executor] = None
+    ) -> T:
+        """Like ``do``, but runs ``fn`` on ``executor`` and never blocks the loop."""
+        future, leader = self._join(key)
+        if leader:
+            loop = asyncio.get_running_loop()
+            try:
+                loop.run_in_executor(executor, self._run, key, fn, future)
+            except BaseException as exc:
+                # Never scheduled: fail the waiters that already joined and
+                # forget the key so the next call can lead
+                future.set_exception(exc)
+                with self._lock:
+                    del self._calls[key]
+                raise
+        return await asyncio.wrap_future(future)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            self._stats.calls += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats.shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, fn: Callable[[], T], future: Future) -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            self._stats.in_flight = len(self._calls)
+            return SingleFlightStats(**self._stats.as_dict())
+
+
+class CoalescingPriceDataRepository(PriceDataRepository):
+    """Share one upstream fetch among concurrent requests for ``(symbol, days)``.
+
+    Every caller receives its own copy of the frame, so callers may mutate
+    their result. Pass the same ``flights`` to ``ExecutorAsyncPriceDataRepository``
+    to coalesce async callers with sync ones.
+    """
+
+    def __init__(
+        self, inner: PriceDataRepository, flights: Optional[SingleFlight] = None
+    ) -> None:
+        self._inner = inner
+        self.flights = flights or SingleFlight()
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        with span("price_data"):
+            frame = self.flights.do(
+                (symbol, days), lambda: self._inner.get_stock_data(symbol, days)
+            )
+            return frame.copy()
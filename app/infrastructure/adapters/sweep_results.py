@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+FORMATS = ("parquet", "csv")
+DEFAULT_FORMAT = "parquet" if pq is not None else "csv"
+
+
+def write_tables(
+    tables: Dict[str, pd.DataFrame], root: Union[str, Path], fmt: str = DEFAULT_FORMAT
+) -> List[Path]:
+    """Write each table to ``<root>/<name>.<fmt>`` and return the paths.
+
+    ``parquet`` needs ``pyarrow``; ``csv`` is always available. Each file is
+    written next to its target and renamed into place, so a reader never
+    sees a half-written table.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Expected one of: parquet, csv")
+    if fmt == "parquet" and pq is None:
+        raise RuntimeError("The parquet format requires pyarrow")
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for name, frame in tables.items():
+        target = root / f"{name}.{fmt}"
+        fd, staging = tempfile.mkstemp(prefix=f".{name}-", dir=root)
+        os.close(fd)
+        try:
+            if fmt == "parquet":
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                pq.write_table(table, staging)
+            else:
+                frame.to_csv(staging, index=False)
+            os.replace(staging, target)
+        except BaseException:
+            Path(staging).unlink(missing_ok=True)
+            raise
+        paths.append(target)
+    return paths
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+from app.metrics import LatencyHistogram, MetricFamily, stats_families
+
+T = TypeVar("T")
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised instead of queueing work on a compute pool that is full."""
+
+    def __init__(self, capacity: int, retry_after: float = 1.0) -> None:
+        super().__init__(f"Compute pool saturated ({capacity} tasks queued or running)")
+        self.retry_after = retry_after
+
+
+@dataclass
+class ComputePoolStats:
+    submitted: int = 0
+    rejected: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    queue_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    compute: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queue_wait_seconds": self.queue_wait.as_dict(),
+            "compute_seconds": self.compute.as_dict(),
+        }
+
+
+def _timed_call(
+    fn: Callable[..., T], args: tuple, kwargs: dict
+) -> Tuple[T, float, float]:
+    # Runs in the worker; wall-clock start so queue wait can be measured across
+    # processes
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return result, started, time.time() - started
+
+
+class ComputePool:
+    """Bounded executor for CPU-bound work submitted from the event loop.
+
+    ``kind`` is ``"thread"`` or ``"process"``. At most ``max_workers`` tasks
+    run at once and ``max_queue`` more may wait; beyond that ``run`` raises
+    ``PoolSaturatedError`` straight away, so an overloaded worker sheds load
+    instead of building an unbounded backlog. Queue wait and compute time of
+    every task are recorded in ``stats()``.
+
+    Process pools use the ``spawn`` start method (the server has threads
+    running) and need ``fn``, its arguments and its result to be picklable.
+    """
+
+    def __init__(
+        self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.kind = kind
+        self.capacity = max_workers + max_queue
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="compute"
+            )
+        else:
+            raise ValueError(f"Unknown compute pool kind '{kind}'")
+        self._stats = ComputePoolStats()
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._stats.in_flight >= self.capacity:
+                self._stats.rejected += 1
+                raise PoolSaturatedError(self.capacity)
+            self._stats.in_flight += 1
+            self._stats.submitted += 1
+        submitted = time.time()
+        try:
+            future = self._executor.submit(_timed_call, fn, args, kwargs)
+        except BaseException:
+            # Shut down or broken pool: nothing will run, so release the slot
+            with self._lock:
+                self._stats.in_flight -= 1
+                self._stats.failed += 1
+            raise
+        # Accounting follows the task, not the caller: a cancelled request
+        # keeps its slot until the work it queued has finished
+        future.add_done_callback(lambda done: self._finished(done, submitted))
+        result, _, _ = await asyncio.wrap_future(future)
+        return result
+
+    def _finished(self, future: Future, submitted: float) -> None:
+        with self._lock:
+            self._stats.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats.failed += 1
+                return
+            _, started, seconds = future.result()
+            self._stats.queue_wait.observe(max(0.0, started - submitted))
+            self._stats.compute.observe(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "capacity": self.capacity,
+                **self._stats.as_dict(),
+            }
+
+    def metric_families(self) -> List[MetricFamily]:
+        with self._lock:
+            stats = self._stats
+            histograms = [
+                MetricFamily(
+                    "app_compute_queue_wait_seconds",
+                    "histogram",
+                    "Time compute tasks waited for a worker",
+                    samples={(): stats.queue_wait.copy()},
+                ),
+                MetricFamily(
+                    "app_compute_seconds",
+                    "histogram",
+                    "Time compute tasks ran",
+                    samples={(): stats.compute.copy()},
+                ),
+            ]
+            counts = {
+                "capacity": self.capacity,
+                "in_flight": stats.in_flight,
+                "submitted": stats.submitted,
+                "rejected": stats.rejected,
+                "failed": stats.failed,
+            }
+        return (
+            stats_families("app_compute", counts, gauges=("capacity", "in_flight"))
+            + histograms
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -7,9 +7,14 @@ import requests
 from dotenv import dotenv_values
 
 from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.resample import get_default_resampler, resample_ohlcv
+from app.metrics import span
 
 
 class Financialmodelingprep:
+    # (connect, read) seconds; without a timeout a stalled FMP socket hangs forever
+    TIMEOUT = (5.0, 30.0)
+
     def __init__(self):
         config = dotenv_values(".env")
         key_from_env = os.environ.get("FINANCIALMODELINGPREP_API_KEY")
@@ -38,7 +43,7 @@ class Financialmodelingprep:
         self, symbol, stock_data, plotData=False, periodicity="W", num_elements=20
     ):
         current_price = stock_data.iloc[0].close
-        df = self.resample(stock_data, periodicity)
+        df = get_default_resampler().resample(stock_data, periodicity, symbol=symbol)
         macd = self.getMacd(df)
 
         df = df.reindex(index=df.index[::-1])
@@ -50,8 +55,9 @@ class Financialmodelingprep:
 
         # max_macd_value = max(macd)
         max_macd_index = macd.idxmax()
-        index = self.findTheLowest(macd, max_macd_index, 5)
-        index = self.findTheLowest(df["low"], index, num_elements)
+        with span("stop_loss_search"):
+            index = self.findTheLowest(macd, max_macd_index, 5)
+            index = self.findTheLowest(df["low"], index, num_elements)
 
         return {
             "symbol": symbol,
@@ -64,22 +70,12 @@ class Financialmodelingprep:
 
     def resample(self, df, periodicity):
         df["date"] = pd.to_datetime(df["date"])
-        logic = {
-            "open": "first",
-            "high": "max",
-            "low": "min",
-            "close": "last",
-            "volume": "sum",
-        }
-        df = df.set_index("date")
-        df = df.resample(periodicity).apply(logic)
-        df["date"] = df.index
-        df.index = range(1, len(df) + 1)
-        return df
+        return resample_ohlcv(df, periodicity)
 
     def getStockData(self, symbol, days):
         r = requests.get(
-            f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}?timeseries={days}&apikey={self.financial_api_key}"
+            f"https://financialmodelingprep.com/api/v3/historical-price-full/{symbol}?timeseries={days}&apikey={self.financial_api_key}",
+            timeout=self.TIMEOUT,
         )
         r = r.json()
         stockdata = r["historical"]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Callable, Mapping, Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream that is known to be failing."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"FMP circuit open; retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """A transient upstream failure (throttled, 5xx or unreachable).
+
+    ``retry_after`` carries the upstream's ``Retry-After`` hint in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting calls to ``rate_per_minute``.
+
+    ``burst`` tokens are available up front and refill continuously.
+    ``acquire`` blocks the calling thread until a token is free. Async
+    callers reach FMP through ``ExecutorAsyncPriceDataRepository`` worker
+    threads, so one bucket shared by the repository throttles every caller
+    in the process.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(
+            burst if burst is not None else max(1, rate_per_minute // 60)
+        )
+        if self.capacity < 1:
+            raise ValueError("burst must be at least 1")
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, waiting if needed; return the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Attempt ``n`` (0-based) waits a random time in
+    ``[0, min(max_delay, base_delay * 2**n)]``. A ``Retry-After`` from the
+    upstream takes precedence, capped at ``max_retry_after``.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    max_retry_after: float = 120.0
+    random: Callable[[], float] = field(default=random.random, repr=False)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(max(0.0, retry_after), self.max_retry_after)
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return ceiling * self.random()
+
+
+def parse_retry_after(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Seconds to wait according to a ``Retry-After`` header, if any."""
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Fail fast after ``failure_threshold`` consecutive upstream failures.
+
+    While open every call raises ``CircuitOpenError``. After
+    ``reset_timeout`` seconds a single trial call is let through (half-open);
+    its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be a positive integer")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(self._clock())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            now = self._clock()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - now)
+            raise CircuitOpenError(retry_in)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
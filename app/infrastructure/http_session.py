@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_session(pool_size: int = 32, max_retries: int = 0) -> requests.Session:
+    """Return a ``requests.Session`` backed by a keep-alive connection pool.
+
+    ``pool_size`` bounds the number of pooled connections kept per host; callers
+    issuing more concurrent requests than that will open short-lived extra
+    connections rather than block. The session is meant to be shared for the
+    lifetime of the process and closed on shutdown.
+    """
+    if pool_size <= 0:
+        raise ValueError("pool_size must be a positive integer")
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
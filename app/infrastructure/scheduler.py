@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta, timezone
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def parse_time_of_day(value: str) -> dt_time:
+    """Parse ``HH:MM`` (UTC) as used by the ``*_REFRESH_AT`` settings."""
+    try:
+        hours, minutes = (int(part) for part in value.split(":"))
+        return dt_time(hours, minutes, tzinfo=timezone.utc)
+    except ValueError:
+        raise ValueError(f"Expected HH:MM, got '{value}'")
+
+
+def next_run_at(now: float, at: dt_time, weekdays_only: bool = True) -> float:
+    """Return the first timestamp after ``now`` that falls on ``at`` (UTC).
+
+    With ``weekdays_only`` runs are moved off Saturday and Sunday, when no new
+    daily bars are published.
+    """
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    candidate = current.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    if candidate <= current:
+        candidate += timedelta(days=1)
+    while weekdays_only and candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate.timestamp()
+
+
+def previous_run_at(now: float, at: dt_time, weekdays_only: bool = True) -> float:
+    """Return the last timestamp at or before ``now`` that falls on ``at`` (UTC)."""
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    candidate = current.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    if candidate > current:
+        candidate -= timedelta(days=1)
+    while weekdays_only and candidate.weekday() >= 5:
+        candidate -= timedelta(days=1)
+    return candidate.timestamp()
+
+
+class DailyScheduler(Generic[T]):
+    """Runs ``job`` once a day at ``at`` on a daemon thread.
+
+    Runs never overlap: ``run_now`` waits for a run in progress. The value the
+    last successful run returned is kept in ``last_result``; a failing run is
+    logged and the schedule continues.
+    """
+
+    def __init__(
+        self,
+        job: Callable[[], T],
+        at: dt_time,
+        run_on_start: bool = False,
+        weekdays_only: bool = True,
+        clock: Callable[[], float] = time.time,
+        name: str = "daily-scheduler",
+    ) -> None:
+        self._job = job
+        self._at = at
+        self._run_on_start = run_on_start
+        self._weekdays_only = weekdays_only
+        self._clock = clock
+        self._name = name
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[T] = None
+        self.next_run_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_now(self) -> Optional[T]:
+        with self._run_lock:
+            try:
+                self.last_result = self._job()
+            except Exception:
+                logger.exception("Scheduled job %s failed", self._name)
+                return None
+            return self.last_result
+
+    def _loop(self) -> None:
+        if self._run_on_start:
+            self.run_now()
+        while not self._stop.is_set():
+            self.next_run_at = next_run_at(
+                self._clock(), self._at, weekdays_only=self._weekdays_only
+            )
+            if self._stop.wait(max(0.0, self.next_run_at - self._clock())):
+                break
+            self.run_now()
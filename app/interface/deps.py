@@ -1,33 +1,456 @@
 from __future__ import annotations
 
-from typing import Callable
+import threading
+import time
+from itertools import product
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 
-from app.domain.repositories import PriceDataRepository
+from app.application.use_cases.backfill_prices import BackfillReport, backfill_prices
+from app.application.use_cases.refresh_indicators import (
+    RefreshReport,
+    refresh_indicators,
+)
+from app.domain.repositories import (
+    AsyncPriceDataRepository,
+    IndicatorStore,
+    LatestMinimaIndex,
+    PriceDataRepository,
+)
+from app.domain.services.fused_macd import SOURCES, FusedMacdCalculator
+from app.domain.services.stop_loss import get_stop_loss as get_vectorized_stop_loss
+from app.infrastructure.adapters.async_price_data_repository import (
+    ExecutorAsyncPriceDataRepository,
+)
+from app.infrastructure.adapters.cached_price_data_repository import (
+    CachedPriceDataRepository,
+    FreshnessPolicy,
+)
+from app.infrastructure.adapters.columnar_price_store import (
+    ColumnarPriceDataRepository,
+)
 from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.infrastructure.adapters.in_memory_indicator_store import (
+    InMemoryIndicatorStore,
+)
+from app.infrastructure.adapters.in_memory_latest_minima_index import (
+    InMemoryLatestMinimaIndex,
+)
+from app.infrastructure.adapters.shared_price_segment import (
+    SharedPriceSegment,
+    SharedSegmentPriceDataRepository,
+)
+from app.infrastructure.adapters.single_flight import (
+    CoalescingPriceDataRepository,
+    SingleFlight,
+)
+from app.infrastructure.compute_pool import ComputePool
 from app.infrastructure.financialmodelingprep import Financialmodelingprep
+from app.infrastructure.http_resilience import (
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+)
+from app.infrastructure.http_session import build_session
+from app.infrastructure.scheduler import (
+    DailyScheduler,
+    parse_time_of_day,
+    previous_run_at,
+)
 from app.interface.settings import AppSettings, get_settings
 
+# Parameters of the single-symbol stop-loss endpoint; the indicator refresh
+# precomputes exactly these.
+STOP_LOSS_PERIODICITY = "MS"
+STOP_LOSS_NUM_ELEMENTS = 10
+# History the endpoint computes on; stored results are only served when the
+# refresh used the same INDICATOR_DAYS
+STOP_LOSS_DAYS = 3650
+# Largest page the MACD minima screener returns
+SCREENER_MAX_LIMIT = 500
 
-def get_data_repository(
-    settings: AppSettings = Depends(get_settings),
-) -> PriceDataRepository:
+
+def _require_api_key(settings: AppSettings) -> str:
     api_key = settings.FINANCIALMODELINGPREP_API_KEY
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="FINANCIALMODELINGPREP_API_KEY not configured",
         )
+    return api_key
+
+
+class SharedRepositories(NamedTuple):
+    sync: PriceDataRepository
+    async_: ExecutorAsyncPriceDataRepository
+    cache: Optional[CachedPriceDataRepository]
+    flights: SingleFlight
+    segment: Optional[SharedSegmentPriceDataRepository]
+    closers: List[Callable[[], None]]
+
+
+# Process-lifetime repositories keyed by their configuration, so every request
+# reuses the same pooled HTTP session, cache and executor instead of building
+# new ones.
+_shared_repositories: Dict[tuple, SharedRepositories] = {}
+_shared_lock = threading.Lock()
+
+
+def build_fmp_repository(settings: AppSettings) -> FmpPriceDataRepository:
+    """FMP adapter with the pooled session, timeouts and resilience settings."""
+    return FmpPriceDataRepository(
+        api_key=_require_api_key(settings),
+        session=build_session(pool_size=settings.FMP_POOL_SIZE),
+        timeout=(settings.FMP_CONNECT_TIMEOUT, settings.FMP_READ_TIMEOUT),
+        rate_limiter=(
+            TokenBucket(
+                settings.FMP_RATE_LIMIT_PER_MINUTE, burst=settings.FMP_RATE_LIMIT_BURST
+            )
+            if settings.FMP_RATE_LIMIT_PER_MINUTE
+            else None
+        ),
+        retry=RetryPolicy(
+            max_attempts=settings.FMP_MAX_RETRIES + 1,
+            base_delay=settings.FMP_BACKOFF_BASE_SECONDS,
+            max_delay=settings.FMP_BACKOFF_MAX_SECONDS,
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=settings.FMP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.FMP_CIRCUIT_RESET_SECONDS,
+        ),
+    )
+
+
+def build_price_cache(
+    source: PriceDataRepository,
+    settings: AppSettings,
+    clock: Callable[[], float] = time.time,
+) -> CachedPriceDataRepository:
+    """History cache in front of ``source``, configured from the settings."""
+    return CachedPriceDataRepository(
+        source,
+        max_entries=settings.PRICE_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.PRICE_CACHE_TTL_SECONDS,
+        disk_path=settings.PRICE_CACHE_PATH,
+        freshness=FreshnessPolicy(
+            trailing_ttl_seconds=settings.PRICE_CACHE_TRAILING_TTL_SECONDS
+        ),
+        clock=clock,
+    )
+
+
+def _build_shared_repositories(settings: AppSettings) -> SharedRepositories:
+    closers: List[Callable[[], None]] = []
+    cache: Optional[CachedPriceDataRepository] = None
+    source: PriceDataRepository
+    if settings.PRICE_STORE_PATH:
+        # Local backfilled dataset: no network, so no HTTP cache either
+        source = ColumnarPriceDataRepository(settings.PRICE_STORE_PATH)
+    else:
+        fmp = build_fmp_repository(settings)
+        closers.append(fmp.close)
+        source = fmp
+
+    if settings.PRICE_CACHE_ENABLED and not settings.PRICE_STORE_PATH:
+        cache = build_price_cache(source, settings)
+        closers.insert(0, cache.close)
+        source = cache
+
+    segment: Optional[SharedSegmentPriceDataRepository] = None
+    if settings.SHARED_PRICE_PATH:
+        # Bars mapped from the segment are shared by all workers; anything it
+        # cannot serve falls through to the per-worker cache and FMP
+        segment = SharedSegmentPriceDataRepository(
+            source,
+            SharedPriceSegment(settings.SHARED_PRICE_PATH),
+            max_age_seconds=settings.SHARED_PRICE_MAX_AGE_SECONDS,
+            freshness=FreshnessPolicy(
+                trailing_ttl_seconds=settings.PRICE_CACHE_TRAILING_TTL_SECONDS
+            ),
+        )
+        source = segment
+
+    # Concurrent sync and async requests for the same (symbol, days) share
+    # one fetch through the same in-flight table
+    flights = SingleFlight()
+    sync = CoalescingPriceDataRepository(source, flights)
+    async_repo = ExecutorAsyncPriceDataRepository(
+        source, max_workers=settings.FMP_POOL_SIZE, flights=flights
+    )
+    closers.insert(0, async_repo.close)
+    return SharedRepositories(sync, async_repo, cache, flights, segment, closers)
+
+
+def get_shared_repositories(
+    settings: AppSettings = Depends(get_settings),
+) -> SharedRepositories:
+    key = tuple(sorted(settings.dict().items()))
+    with _shared_lock:
+        shared = _shared_repositories.get(key)
+        if shared is None:
+            try:
+                shared = _build_shared_repositories(settings)
+            except (RuntimeError, ValueError) as exc:
+                raise HTTPException(status_code=503, detail=str(exc))
+            _shared_repositories[key] = shared
+        return shared
+
+
+def get_data_repository(
+    shared: SharedRepositories = Depends(get_shared_repositories),
+) -> PriceDataRepository:
+    return shared.sync
+
+
+def get_async_data_repository(
+    shared: SharedRepositories = Depends(get_shared_repositories),
+) -> AsyncPriceDataRepository:
+    return shared.async_
+
+
+def close_shared_repositories() -> None:
+    """Release connections, cache files and executor threads held by shared repositories."""
+    with _shared_lock:
+        for shared in _shared_repositories.values():
+            for close in shared.closers:
+                close()
+        _shared_repositories.clear()
+
+
+def get_stop_loss_strategy(
+    settings: AppSettings = Depends(get_settings),
+) -> Callable:
+    if settings.STOP_LOSS_ENGINE == "numpy":
+        return get_vectorized_stop_loss
+    return legacy_stop_loss_strategy
+
+
+def get_macd_calculator(
+    source: str = Query("close", regex=f"^({'|'.join(SOURCES)})$"),
+    fast: int = Query(12, gt=0),
+    slow: int = Query(26, gt=0),
+    signal: int = Query(9, gt=0),
+) -> FusedMacdCalculator:
+    """MACD parameters from the query string; 422 when fast >= slow."""
     try:
-        return FmpPriceDataRepository(api_key=api_key)
-    except RuntimeError as exc:
-        raise HTTPException(status_code=503, detail=str(exc))
+        return FusedMacdCalculator(fast, slow, signal, source=source)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        )
+
+
+def is_default_macd(calculator: FusedMacdCalculator) -> bool:
+    """True for the 12/26 MACD on closes the indicator store precomputes."""
+    return (
+        calculator.source == "close"
+        and calculator.fast_period == 12
+        and calculator.slow_period == 26
+    )
+
+
+def legacy_stop_loss_strategy(symbol, stock_df, periodicity, num_elements):
+    # Module level so it can be pickled into a process compute pool
+    f = Financialmodelingprep()
+    return f.get_stop_loss(symbol, stock_df, False, periodicity, num_elements)
+
+
+_compute_pools: Dict[tuple, ComputePool] = {}
+
+
+def get_compute_pool(
+    settings: AppSettings = Depends(get_settings),
+) -> Optional[ComputePool]:
+    """Process-lifetime pool for CPU-bound work; ``None`` when ``COMPUTE_POOL=inline``."""
+    if settings.COMPUTE_POOL == "inline":
+        return None
+    key = (
+        settings.COMPUTE_POOL,
+        settings.COMPUTE_POOL_WORKERS,
+        settings.COMPUTE_POOL_QUEUE,
+    )
+    with _shared_lock:
+        pool = _compute_pools.get(key)
+        if pool is None:
+            pool = ComputePool(
+                settings.COMPUTE_POOL,
+                max_workers=settings.COMPUTE_POOL_WORKERS,
+                max_queue=settings.COMPUTE_POOL_QUEUE,
+            )
+            _compute_pools[key] = pool
+        return pool
+
+
+def close_compute_pools() -> None:
+    with _shared_lock:
+        for pool in _compute_pools.values():
+            pool.close()
+        _compute_pools.clear()
+
+
+_indicator_store = InMemoryIndicatorStore()
+_latest_minima_index = InMemoryLatestMinimaIndex()
+# Streaming MACD checkpoints per (symbol, periodicity), advanced by the refresh
+_macd_state_store = InMemoryIndicatorStore()
+# Concurrent screener requests for a cold (period, window) share one rebuild
+_latest_minima_flights = SingleFlight()
+_indicator_scheduler: Optional[DailyScheduler[RefreshReport]] = None
+
+
+def get_indicator_store() -> IndicatorStore:
+    return _indicator_store
+
+
+def get_latest_minima_index() -> LatestMinimaIndex:
+    return _latest_minima_index
+
+
+def get_latest_minima_flights() -> SingleFlight:
+    return _latest_minima_flights
+
+
+def get_indicator_scheduler() -> Optional[DailyScheduler[RefreshReport]]:
+    return _indicator_scheduler
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def indicator_symbols(settings: AppSettings) -> List[str]:
+    return list(dict.fromkeys(_split(settings.INDICATOR_SYMBOLS)))
+
+
+def indicator_minima_params(settings: AppSettings) -> List[Tuple[str, int]]:
+    """The ``(period, window)`` pairs the refresh precomputes minima for."""
+    return list(
+        product(
+            _split(settings.INDICATOR_MINIMA_PERIODS),
+            [int(window) for window in _split(settings.INDICATOR_MINIMA_WINDOWS)],
+        )
+    )
+
+
+def build_indicator_refresh(settings: AppSettings) -> Callable[[], RefreshReport]:
+    """Return the job that refreshes the indicator store for ``INDICATOR_SYMBOLS``."""
+    symbols = indicator_symbols(settings)
+    minima_params = indicator_minima_params(settings)
+
+    def job() -> RefreshReport:
+        shared = get_shared_repositories(settings)
+        return refresh_indicators(
+            shared.sync,
+            _indicator_store,
+            symbols,
+            strategy=get_stop_loss_strategy(settings),
+            stop_loss_params=[(STOP_LOSS_PERIODICITY, STOP_LOSS_NUM_ELEMENTS)],
+            minima_params=minima_params,
+            days=settings.INDICATOR_DAYS,
+            max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+            macd_dtype=settings.INDICATOR_MACD_DTYPE,
+            minima_index=_latest_minima_index,
+            macd_states=_macd_state_store,
+        )
+
+    return job
+
+
+def start_indicator_scheduler(settings: AppSettings) -> None:
+    """Start the daily refresh when ``INDICATOR_SYMBOLS`` is configured."""
+    global _indicator_scheduler
+    if _indicator_scheduler is not None or not indicator_symbols(settings):
+        return
+    _indicator_scheduler = DailyScheduler(
+        build_indicator_refresh(settings),
+        at=parse_time_of_day(settings.INDICATOR_REFRESH_AT),
+        run_on_start=settings.INDICATOR_REFRESH_ON_STARTUP,
+        name="indicator-refresh",
+    )
+    _indicator_scheduler.start()
+
+
+def stop_indicator_scheduler() -> None:
+    global _indicator_scheduler
+    if _indicator_scheduler is not None:
+        _indicator_scheduler.stop(timeout=5)
+        _indicator_scheduler = None
+
+
+_shared_price_scheduler: Optional[DailyScheduler[Optional[BackfillReport]]] = None
+
+
+def shared_price_symbols(settings: AppSettings) -> List[str]:
+    """``SHARED_PRICE_SYMBOLS``, or the indicator watchlist when unset."""
+    symbols = _split(settings.SHARED_PRICE_SYMBOLS) or _split(
+        settings.INDICATOR_SYMBOLS
+    )
+    return list(dict.fromkeys(symbols))
+
+
+def build_shared_price_refresh(
+    settings: AppSettings,
+) -> Callable[[], Optional[BackfillReport]]:
+    """Return the job that rewrites the shared price segment.
+
+    Every worker schedules it; the first to take the segment's writer lock
+    downloads and publishes a new generation, and the others find it already
+    written for the current slot and return ``None``.
+    """
+    symbols = shared_price_symbols(settings)
+    at = parse_time_of_day(settings.SHARED_PRICE_REFRESH_AT)
+
+    def job() -> Optional[BackfillReport]:
+        repo = get_shared_repositories(settings).segment
+        if repo is None:
+            return None
+        due = previous_run_at(time.time(), at)
+        with repo.segment.writer_lock():
+            current = repo.segment.reload()
+            if (
+                current is not None
+                and current.written_at >= due
+                and current.days == settings.SHARED_PRICE_DAYS
+            ):
+                return None
+            builder = repo.segment.builder(settings.SHARED_PRICE_DAYS)
+            report = backfill_prices(
+                repo.inner,
+                builder,
+                symbols,
+                days=settings.SHARED_PRICE_DAYS,
+                max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+            )
+            builder.commit()
+            return report
+
+    return job
+
+
+def start_shared_price_scheduler(settings: AppSettings) -> None:
+    """Keep the shared segment current when ``SHARED_PRICE_PATH`` is configured.
 
+    Runs once at startup, which only writes when the segment is missing or
+    older than the last scheduled refresh.
+    """
+    global _shared_price_scheduler
+    if (
+        _shared_price_scheduler is not None
+        or not settings.SHARED_PRICE_PATH
+        or not shared_price_symbols(settings)
+    ):
+        return
+    _shared_price_scheduler = DailyScheduler(
+        build_shared_price_refresh(settings),
+        at=parse_time_of_day(settings.SHARED_PRICE_REFRESH_AT),
+        run_on_start=True,
+        name="shared-price-refresh",
+    )
+    _shared_price_scheduler.start()
 
-def get_stop_loss_strategy() -> Callable:
-    def strategy(symbol, stock_df, periodicity, num_elements):
-        f = Financialmodelingprep()
-        return f.get_stop_loss(symbol, stock_df, False, periodicity, num_elements)
 
-    return strategy
+def stop_shared_price_scheduler() -> None:
+    global _shared_price_scheduler
+    if _shared_price_scheduler is not None:
+        _shared_price_scheduler.stop(timeout=5)
+        _shared_price_scheduler = None
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import Response
+
+from app.schemas import coerce_non_finite_column
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+RESPONSE_FORMATS = ("records", "columns", "ndjson")
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact JSON, with ``orjson`` when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+
+
+class RawJSONResponse(Response):
+    """A response whose body is already encoded JSON."""
+
+    media_type = "application/json"
+
+
+class MinimaColumns(NamedTuple):
+    date: List[Optional[str]]
+    macd: List[Optional[float]]
+    price: List[Optional[float]]
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "MinimaColumns":
+        """Columns of a minima frame (date, macd, price), without per-row objects."""
+        return cls(
+            _iso_dates(frame["date"]),
+            coerce_non_finite_column(frame["macd"].to_numpy(dtype=float)),
+            coerce_non_finite_column(frame["price"].to_numpy(dtype=float)),
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "MinimaColumns":
+        """Columns of rows as returned by ``get_macd_minima``."""
+        return cls(
+            _iso_dates(pd.Series([row["date"] for row in rows], dtype=object)),
+            coerce_non_finite_column(
+                [np.nan if row["macd"] is None else row["macd"] for row in rows]
+            ),
+            coerce_non_finite_column(
+                [np.nan if row["price"] is None else row["price"] for row in rows]
+            ),
+        )
+
+
+def minima_response(
+    symbol: str, period: str, columns: MinimaColumns, fmt: str = "records"
+) -> RawJSONResponse:
+    """Serialize MACD minima straight to JSON.
+
+    ``records`` is the ``List[MacdMinimaRow]`` body, byte for byte what the
+    validated path produced. ``columns`` is the compact form for bulk
+    clients: ``{"symbol", "period", "date": [...], "macd": [...],
+    "price": [...]}``.
+    """
+    if fmt == "columns":
+        body: Any = {"symbol": symbol, "period": period, **columns._asdict()}
+    else:
+        body = list(_records(symbol, period, *columns))
+    return RawJSONResponse(content=dumps(body))
+
+
+def minima_ndjson(
+    symbol: str, period: str, columns: MinimaColumns, chunk_rows: int = 1000
+) -> Iterator[bytes]:
+    """Yield the ``records`` body as NDJSON, ``chunk_rows`` lines per chunk."""
+    dates, macds, prices = columns
+    for start in range(0, len(dates), chunk_rows):
+        stop = start + chunk_rows
+        records = _records(
+            symbol, period, dates[start:stop], macds[start:stop], prices[start:stop]
+        )
+        yield b"".join(dumps(record) + b"\n" for record in records)
+
+
+def macd_lines_response(
+    symbol: str, period: str, frame: pd.DataFrame
+) -> RawJSONResponse:
+    """``{"symbol", "period", "date", "macd", "signal", "histogram"}``, one
+    array per column of a ``macd_lines_frame``; non-finite values are null."""
+    body = {
+        "symbol": symbol,
+        "period": period,
+        "date": _iso_dates(frame["date"]),
+        **{
+            line: coerce_non_finite_column(frame[line].to_numpy(dtype=float))
+            for line in ("macd", "signal", "histogram")
+        },
+    }
+    return RawJSONResponse(content=dumps(body))
+
+
+def _records(
+    symbol: str,
+    period: str,
+    dates: List[Optional[str]],
+    macds: List[Optional[float]],
+    prices: List[Optional[float]],
+) -> Iterator[Dict[str, Any]]:
+    for date, macd, price in zip(dates, macds, prices):
+        yield {
+            "symbol": symbol,
+            "date": date,
+            "macd": macd,
+            "price": price,
+            "period": period,
+        }
+
+
+def _iso_dates(dates: pd.Series) -> List[Optional[str]]:
+    # Same text as datetime.isoformat(), which pydantic's encoder uses: the
+    # fraction only on values that have one, and NaT as null
+    values = pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]")
+    missing = np.isnat(values)
+    whole_seconds = values.astype(np.int64) % 1_000_000_000 == 0
+    text = np.where(
+        whole_seconds,
+        np.datetime_as_string(values, unit="s"),
+        np.datetime_as_string(values, unit="us"),
+    ).astype(object)
+    text[missing] = None
+    return text.tolist()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 try:
     from dotenv import dotenv_values, load_dotenv  # type: ignore
@@ -30,6 +30,43 @@ _load_env_if_possible()
 
 class AppSettings(BaseSettings):
     FINANCIALMODELINGPREP_API_KEY: Optional[str] = None
+    BATCH_MAX_SYMBOLS: int = 2000
+    BATCH_MAX_CONCURRENCY: int = 16
+    FMP_POOL_SIZE: int = 32
+    FMP_CONNECT_TIMEOUT: float = 5.0
+    FMP_READ_TIMEOUT: float = 30.0
+    FMP_RATE_LIMIT_PER_MINUTE: Optional[float] = None
+    FMP_RATE_LIMIT_BURST: Optional[int] = None
+    FMP_MAX_RETRIES: int = 3
+    FMP_BACKOFF_BASE_SECONDS: float = 0.5
+    FMP_BACKOFF_MAX_SECONDS: float = 30.0
+    FMP_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    FMP_CIRCUIT_RESET_SECONDS: float = 30.0
+    PRICE_CACHE_ENABLED: bool = True
+    PRICE_CACHE_MAX_ENTRIES: int = 256
+    PRICE_CACHE_TTL_SECONDS: Optional[float] = None
+    PRICE_CACHE_TRAILING_TTL_SECONDS: float = 300.0
+    PRICE_CACHE_PATH: Optional[str] = None
+    PRICE_STORE_PATH: Optional[str] = None
+    SHARED_PRICE_PATH: Optional[str] = None
+    SHARED_PRICE_SYMBOLS: str = ""
+    SHARED_PRICE_DAYS: int = 3650
+    SHARED_PRICE_REFRESH_AT: str = "21:15"
+    SHARED_PRICE_MAX_AGE_SECONDS: float = 36 * 3600
+    RESAMPLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    STOP_LOSS_ENGINE: Literal["numpy", "legacy"] = "numpy"
+    METRICS_ENABLED: bool = True
+    COMPUTE_POOL: Literal["thread", "process", "inline"] = "thread"
+    COMPUTE_POOL_WORKERS: int = 4
+    COMPUTE_POOL_QUEUE: int = 64
+    INDICATOR_SYMBOLS: str = ""
+    INDICATOR_REFRESH_AT: str = "21:30"
+    INDICATOR_REFRESH_ON_STARTUP: bool = False
+    INDICATOR_MAX_AGE_SECONDS: float = 36 * 3600
+    INDICATOR_MINIMA_PERIODS: str = "W"
+    INDICATOR_MINIMA_WINDOWS: str = "1"
+    INDICATOR_DAYS: int = 3650
+    INDICATOR_MACD_DTYPE: Literal["float64", "float32"] = "float64"
 
     class Config:
         env_file = str(ENV_PATH)
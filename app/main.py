@@ -1,56 +1,624 @@
 import logging
-from typing import List
+import math
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
 
+from app.application.use_cases.backtest_stop_loss import (
+    backtest_stop_loss as uc_backtest_stop_loss,
+)
+from app.application.use_cases.get_macd_minima import (
+    get_macd_lines_async as uc_get_macd_lines,
+)
 from app.application.use_cases.get_macd_minima import (
-    get_macd_minima as uc_get_macd_minima,
+    get_macd_minima_frame_async as uc_get_macd_minima_frame,
+)
+from app.application.use_cases.get_stop_loss import (
+    get_stop_loss_async as uc_get_stop_loss,
+)
+from app.application.use_cases.get_stop_loss import (
+    get_stop_loss_batch as uc_get_stop_loss_batch,
+)
+from app.application.use_cases.get_stop_loss import (
+    iter_stop_loss_rows as uc_iter_stop_loss_rows,
+)
+from app.application.use_cases.screen_macd_minima import (
+    screen_macd_minima as uc_screen_macd_minima,
+)
+from app.domain.repositories import IndicatorKey, IndicatorStore, LatestMinimaIndex
+from app.domain.services.fused_macd import FusedMacdCalculator
+from app.domain.services.resample import (
+    CachedResampler,
+    get_default_resampler,
+    set_default_resampler,
+)
+from app.domain.services.stop_loss_strategies import (
+    MACD_STRATEGY,
+    STOP_LOSS_STRATEGIES,
+    InsufficientHistoryError,
+    trailing_stop_strategy,
+)
+from app.infrastructure.adapters.single_flight import SingleFlight
+from app.infrastructure.compute_pool import ComputePool, PoolSaturatedError
+from app.infrastructure.http_resilience import CircuitOpenError
+from app.interface.deps import (
+    SCREENER_MAX_LIMIT,
+    STOP_LOSS_DAYS,
+    STOP_LOSS_NUM_ELEMENTS,
+    STOP_LOSS_PERIODICITY,
+    close_compute_pools,
+    close_shared_repositories,
+    get_async_data_repository,
+    get_compute_pool,
+    get_data_repository,
+    get_indicator_scheduler,
+    get_indicator_store,
+    get_latest_minima_flights,
+    get_latest_minima_index,
+    get_macd_calculator,
+    get_shared_repositories,
+    get_stop_loss_strategy,
+    indicator_minima_params,
+    indicator_symbols,
+    is_default_macd,
+    start_indicator_scheduler,
+    start_shared_price_scheduler,
+    stop_indicator_scheduler,
+    stop_shared_price_scheduler,
+)
+from app.interface.json_response import (
+    NDJSON_MEDIA_TYPE,
+    RESPONSE_FORMATS,
+    MinimaColumns,
+    dumps,
+    macd_lines_response,
+    minima_ndjson,
+    minima_response,
+)
+from app.interface.settings import AppSettings, get_settings
+from app.metrics import (
+    REGISTRY,
+    REQUEST_SECONDS,
+    MetricFamily,
+    is_enabled,
+    set_enabled,
+    span,
+    stats_families,
+)
+from app.schemas import (
+    MacdMinimaColumns,
+    MacdMinimaRow,
+    MacdMinimaScreenResponse,
+    StopLossBacktestRequest,
+    StopLossBacktestResponse,
+    StopLossBatchRequest,
+    StopLossBatchResponse,
+    StopLossResponse,
+    StopLossRow,
+    SymbolError,
 )
-from app.application.use_cases.get_stop_loss import get_stop_loss as uc_get_stop_loss
-from app.interface.deps import get_data_repository, get_stop_loss_strategy
-from app.schemas import MacdMinimaRow, StopLossResponse
 
 logger = logging.getLogger(__name__)
 
+
+class TimedRoute(APIRoute):
+    """Records each endpoint's latency, serialization included, per route."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            if not is_enabled():
+                return await handler(request)
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - started, route)
+
+        return timed_handler
+
+
 api = FastAPI()
+api.router.route_class = TimedRoute
 
 
-@api.get("/stocks/{symbol}", response_model=StopLossResponse)
-async def get_stop_loss_endpoint(
-    symbol: str,
+@api.exception_handler(CircuitOpenError)
+async def _circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_in)))},
+    )
+
+
+@api.exception_handler(PoolSaturatedError)
+async def _pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+@api.on_event("startup")
+def _configure_metrics() -> None:
+    set_enabled(get_settings().METRICS_ENABLED)
+    REGISTRY.register_collector("stats", _collect_stats)
+
+
+@api.on_event("startup")
+def _configure_resampler() -> None:
+    settings = get_settings()
+    set_default_resampler(CachedResampler(max_bytes=settings.RESAMPLE_CACHE_MAX_BYTES))
+
+
+@api.on_event("startup")
+def _start_shared_price_refresh() -> None:
+    start_shared_price_scheduler(get_settings())
+
+
+@api.on_event("startup")
+def _start_indicator_refresh() -> None:
+    start_indicator_scheduler(get_settings())
+
+
+@api.on_event("shutdown")
+def _close_shared_repositories() -> None:
+    stop_indicator_scheduler()
+    stop_shared_price_scheduler()
+    close_shared_repositories()
+    close_compute_pools()
+
+
+def _fresh_indicator(
+    store: IndicatorStore, key: IndicatorKey, settings: AppSettings
+) -> Optional[Any]:
+    entry = store.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry.computed_at > settings.INDICATOR_MAX_AGE_SECONDS:
+        return None
+    return entry.value
+
+
+@api.post("/stocks/stop-loss:batch", response_model=StopLossBatchResponse)
+async def get_stop_loss_batch_endpoint(
+    request: StopLossBatchRequest,
     data_repository=Depends(get_data_repository),
     strategy=Depends(get_stop_loss_strategy),
+    settings: AppSettings = Depends(get_settings),
 ):
     """
-    Retrieve stop loss information for a given stock symbol.
+    Retrieve stop loss information for many symbols in one request.
+
+    Symbols are fetched concurrently; per-symbol failures are reported in
+    ``errors`` instead of failing the whole batch.
     """
-    rows = uc_get_stop_loss(
+    if len(request.symbols) > settings.BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.BATCH_MAX_SYMBOLS} symbols per batch",
+        )
+    return await run_in_threadpool(
+        uc_get_stop_loss_batch,
         data_repository,
-        symbols=[symbol],
-        periodicity="MS",
-        num_elements=10,
+        symbols=request.symbols,
+        periodicity=request.periodicity,
+        num_elements=request.num_elements,
         strategy=strategy,
+        days=request.days,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+        strategies=request.strategies,
     )
-    first = rows[0] if rows else {"stop_loss": None, "stop_loss_date": None}
-    return StopLossResponse(
-        symbol=symbol,
-        stop_loss=first.get("stop_loss"),
-        stop_loss_date=first.get("stop_loss_date"),
+
+
+@api.post("/stocks/stop-loss:stream")
+async def stream_stop_loss_endpoint(
+    request: StopLossBatchRequest,
+    data_repository=Depends(get_async_data_repository),
+    strategy=Depends(get_stop_loss_strategy),
+    settings: AppSettings = Depends(get_settings),
+    compute: Optional[ComputePool] = Depends(get_compute_pool),
+):
+    """
+    Stream stop loss rows for many symbols as NDJSON, one line per symbol in
+    the order they finish.
+
+    Takes the same body as ``/stocks/stop-loss:batch``. A symbol that fails
+    produces ``{"symbol", "detail"}`` instead of a row, like a batch ``errors``
+    entry.
+    """
+    if len(request.symbols) > settings.BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.BATCH_MAX_SYMBOLS} symbols per batch",
+        )
+    rows = uc_iter_stop_loss_rows(
+        data_repository,
+        symbols=request.symbols,
+        periodicity=request.periodicity,
+        num_elements=request.num_elements,
+        strategy=strategy,
+        days=request.days,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+        offload=compute.run if compute is not None else None,
+        strategies=request.strategies,
+    )
+    return StreamingResponse(_ndjson_stop_loss(rows), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def _ndjson_stop_loss(rows: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    async for row in rows:
+        if "detail" in row:
+            yield dumps(jsonable_encoder(SymbolError(**row))) + b"\n"
+        else:
+            yield dumps(jsonable_encoder(StopLossRow(**row))) + b"\n"
+
+
+@api.post("/stocks/stop-loss:backtest", response_model=StopLossBacktestResponse)
+async def backtest_stop_loss_endpoint(
+    request: StopLossBacktestRequest,
+    data_repository=Depends(get_data_repository),
+    settings: AppSettings = Depends(get_settings),
+):
+    """
+    Backtest a stop-loss strategy over each symbol's price history.
+
+    Every bar's stop is the one the strategy would have given as of that
+    bar; the summary reports stop hits, time in position and the drawdown
+    avoided against buy-and-hold. Per-symbol failures are reported in
+    ``errors``.
+    """
+    if len(request.symbols) > settings.BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.BATCH_MAX_SYMBOLS} symbols per batch",
+        )
+    return await run_in_threadpool(
+        uc_backtest_stop_loss,
+        data_repository,
+        symbols=request.symbols,
+        periodicity=request.periodicity,
+        num_elements=request.num_elements,
+        strategy=request.strategy,
+        days=request.days,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
     )
 
 
-@api.get("/stocks/{symbol}/macd-minima", response_model=List[MacdMinimaRow])
+@api.get("/stocks/{symbol}", response_model=StopLossResponse)
+async def get_stop_loss_endpoint(
+    symbol: str,
+    strategy_name: str = Query(
+        MACD_STRATEGY,
+        alias="strategy",
+        regex=f"^({'|'.join(STOP_LOSS_STRATEGIES)})$",
+    ),
+    data_repository=Depends(get_async_data_repository),
+    strategy=Depends(get_stop_loss_strategy),
+    store: IndicatorStore = Depends(get_indicator_store),
+    settings: AppSettings = Depends(get_settings),
+    compute: Optional[ComputePool] = Depends(get_compute_pool),
+):
+    """
+    Retrieve stop loss information for a given stock symbol.
+
+    ``strategy`` selects the policy: the MACD anchor search (default) or one
+    of the trailing stops. MACD results are served from the indicator store
+    when the symbol was refreshed recently over the same history, computed
+    live otherwise.
+    """
+    first = None
+    if strategy_name == MACD_STRATEGY:
+        if settings.INDICATOR_DAYS == STOP_LOSS_DAYS:
+            key = IndicatorKey(
+                symbol, STOP_LOSS_PERIODICITY, num_elements=STOP_LOSS_NUM_ELEMENTS
+            )
+            first = _fresh_indicator(store, key, settings)
+    else:
+        strategy = trailing_stop_strategy(strategy_name)
+    if first is None:
+        try:
+            rows = await uc_get_stop_loss(
+                data_repository,
+                symbols=[symbol],
+                periodicity=STOP_LOSS_PERIODICITY,
+                num_elements=STOP_LOSS_NUM_ELEMENTS,
+                strategy=strategy,
+                days=STOP_LOSS_DAYS,
+                offload=compute.run if compute is not None else None,
+            )
+        except InsufficientHistoryError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+            )
+        first = rows[0] if rows else {"stop_loss": None, "stop_loss_date": None}
+    with span("response"):
+        return StopLossResponse(
+            symbol=symbol,
+            stop_loss=first.get("stop_loss"),
+            stop_loss_date=first.get("stop_loss_date"),
+        )
+
+
+@api.get(
+    "/stocks/{symbol}/macd-minima",
+    response_model=Union[List[MacdMinimaRow], MacdMinimaColumns],
+    responses={
+        200: {
+            "description": "A list of rows (`format=records`), one object of "
+            "arrays (`format=columns`) or one row per line (`format=ndjson`)",
+            "content": {
+                NDJSON_MEDIA_TYPE: {
+                    "schema": {"$ref": "#/components/schemas/MacdMinimaRow"}
+                }
+            },
+        }
+    },
+)
 async def get_macd_minima_endpoint(
     symbol: str,
     period: str = "W",
     window: int = 1,
     days: int = 3650,
-    data_repository=Depends(get_data_repository),
+    response_format: str = Query(
+        "records", alias="format", regex=f"^({'|'.join(RESPONSE_FORMATS)})$"
+    ),
+    calculator: FusedMacdCalculator = Depends(get_macd_calculator),
+    data_repository=Depends(get_async_data_repository),
+    store: IndicatorStore = Depends(get_indicator_store),
+    settings: AppSettings = Depends(get_settings),
+    compute: Optional[ComputePool] = Depends(get_compute_pool),
 ):
     """
     Retrieve MACD minima rows for a given stock symbol.
+
+    Served from the indicator store when it holds a recent result for the same
+    period, window and history length and the MACD uses the default source
+    and periods, computed live otherwise. The minima are encoded column by
+    column without per-row models; ``format=columns`` returns the compact
+    column-oriented body and ``format=ndjson`` streams one row per line.
+    """
+    rows = None
+    if days == settings.INDICATOR_DAYS and is_default_macd(calculator):
+        key = IndicatorKey(symbol, period, window=window)
+        rows = _fresh_indicator(store, key, settings)
+    if rows is None:
+        frame = await uc_get_macd_minima_frame(
+            data_repository,
+            symbol=symbol,
+            days=days,
+            periodicity=period,
+            window=window,
+            offload=compute.run if compute is not None else None,
+            calculator=calculator,
+        )
+    with span("response"):
+        columns = (
+            MinimaColumns.from_rows(rows)
+            if rows is not None
+            else MinimaColumns.from_frame(frame)
+        )
+        if response_format == "ndjson":
+            return StreamingResponse(
+                minima_ndjson(symbol, period, columns), media_type=NDJSON_MEDIA_TYPE
+            )
+        return minima_response(symbol, period, columns, fmt=response_format)
+
+
+@api.get("/stocks/{symbol}/macd")
+async def get_macd_endpoint(
+    symbol: str,
+    period: str = "W",
+    days: int = 3650,
+    calculator: FusedMacdCalculator = Depends(get_macd_calculator),
+    data_repository=Depends(get_async_data_repository),
+    compute: Optional[ComputePool] = Depends(get_compute_pool),
+):
     """
-    rows = uc_get_macd_minima(
-        data_repository, symbol=symbol, days=days, periodicity=period, window=window
+    Retrieve the MACD line, signal line and histogram of a stock symbol,
+    one array per line.
+    """
+    frame = await uc_get_macd_lines(
+        data_repository,
+        symbol=symbol,
+        days=days,
+        periodicity=period,
+        calculator=calculator,
+        offload=compute.run if compute is not None else None,
     )
-    return [MacdMinimaRow(**r) for r in rows]
+    with span("response"):
+        return macd_lines_response(symbol, period, frame)
+
+
+@api.get("/screener/macd-minima", response_model=MacdMinimaScreenResponse)
+async def screen_macd_minima_endpoint(
+    period: str = "W",
+    window: int = Query(1, gt=0),
+    within: int = Query(5, gt=0),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, gt=0, le=SCREENER_MAX_LIMIT),
+    data_repository=Depends(get_data_repository),
+    index: LatestMinimaIndex = Depends(get_latest_minima_index),
+    flights: SingleFlight = Depends(get_latest_minima_flights),
+    settings: AppSettings = Depends(get_settings),
+):
+    """
+    List the ``INDICATOR_SYMBOLS`` whose latest MACD minimum is at most
+    ``within`` bars old, freshest first, one page at a time.
+
+    Served from the latest-minimum index kept by the indicator refresh. Only
+    the configured ``INDICATOR_MINIMA_PERIODS`` x ``INDICATOR_MINIMA_WINDOWS``
+    pairs can be screened; one that is not indexed yet (or is stale) is
+    indexed for the whole universe on the first request, once however many
+    requests arrive meanwhile.
+    """
+    symbols = indicator_symbols(settings)
+    if not symbols:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No screener universe configured (INDICATOR_SYMBOLS)",
+        )
+    pairs = indicator_minima_params(settings)
+    if (period, window) not in pairs:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="period and window must be one of: "
+            + ", ".join(f"{p}/{w}" for p, w in pairs),
+        )
+    page, errors = await run_in_threadpool(
+        uc_screen_macd_minima,
+        data_repository,
+        index,
+        symbols,
+        periodicity=period,
+        window=window,
+        within=within,
+        offset=offset,
+        limit=limit,
+        days=settings.INDICATOR_DAYS,
+        max_concurrency=settings.BATCH_MAX_CONCURRENCY,
+        dtype=settings.INDICATOR_MACD_DTYPE,
+        max_age_seconds=settings.INDICATOR_MAX_AGE_SECONDS,
+        coalesce=flights.do,
+    )
+    next_offset = offset + len(page.entries)
+    return {
+        "period": period,
+        "window": window,
+        "within": within,
+        "total": page.total,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if next_offset < page.total else None,
+        "computed_at": page.computed_at,
+        "results": [entry._asdict() for entry in page.entries],
+        "errors": errors,
+    }
+
+
+@api.get("/compute/stats")
+async def get_compute_stats_endpoint(
+    compute: Optional[ComputePool] = Depends(get_compute_pool),
+):
+    """
+    Report load, rejections and queue-wait / compute-time histograms of the
+    pool running CPU-bound indicator work in this worker.
+    """
+    if compute is None:
+        return {"enabled": False}
+    return {"enabled": True, **compute.stats()}
+
+
+@api.get("/cache/stats")
+async def get_cache_stats_endpoint(shared=Depends(get_shared_repositories)):
+    """
+    Report price-history, shared-segment, resample and request-coalescing
+    counters for sizing the caches.
+    """
+    return _cache_stats(shared)
+
+
+def _cache_stats(shared) -> Dict[str, Dict[str, Any]]:
+    price_history = {"enabled": shared.cache is not None}
+    if shared.cache is not None:
+        price_history.update(shared.cache.stats().as_dict())
+    shared_segment = {"enabled": shared.segment is not None}
+    if shared.segment is not None:
+        shared_segment.update(shared.segment.segment.stats())
+        shared_segment.update(shared.segment.stats().as_dict())
+    return {
+        "price_history": price_history,
+        "shared_segment": shared_segment,
+        "resample": get_default_resampler().stats().as_dict(),
+        "single_flight": shared.flights.stats().as_dict(),
+    }
+
+
+# Stats keys that are current levels rather than running counts
+_STATS_GAUGES = (
+    "memory_entries",
+    "entries",
+    "bytes",
+    "in_flight",
+    "symbols",
+    "written_at",
+)
+
+
+def _collect_stats() -> List[MetricFamily]:
+    settings = get_settings()
+    families: List[MetricFamily] = []
+    try:
+        shared = get_shared_repositories(settings)
+    except HTTPException:
+        shared = None
+    if shared is not None:
+        for section, values in _cache_stats(shared).items():
+            families.extend(
+                stats_families(f"app_{section}", values, gauges=_STATS_GAUGES)
+            )
+    compute = get_compute_pool(settings)
+    if compute is not None:
+        families.extend(compute.metric_families())
+    return families
+
+
+@api.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics_endpoint(settings: AppSettings = Depends(get_settings)):
+    """
+    Prometheus text exposition of timing spans, upstream response counts,
+    cache and compute pool counters for this worker.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@api.get("/indicators/status")
+async def get_indicator_status_endpoint(
+    store: IndicatorStore = Depends(get_indicator_store),
+    settings: AppSettings = Depends(get_settings),
+):
+    """
+    Report the indicator store contents, staleness and the last refresh run.
+    """
+    now = time.time()
+    ages = []
+    for key in store.keys():
+        entry = store.get(key)
+        if entry is not None:
+            ages.append(now - entry.computed_at)
+
+    scheduler = get_indicator_scheduler()
+    last_run = None
+    next_run_at = None
+    if scheduler is not None:
+        next_run_at = scheduler.next_run_at
+        if scheduler.last_result is not None:
+            last_run = scheduler.last_result.as_dict()
+
+    return {
+        "enabled": scheduler is not None,
+        "symbols": len(indicator_symbols(settings)),
+        "entries": len(ages),
+        "stale_entries": sum(age > settings.INDICATOR_MAX_AGE_SECONDS for age in ages),
+        "oldest_age_seconds": max(ages) if ages else None,
+        "newest_age_seconds": min(ages) if ages else None,
+        "last_run": last_run,
+        "next_run_at": next_run_at,
+    }
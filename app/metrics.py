@@ -0,0 +1,315 @@
+"""Process-local metrics: timing spans, counters and Prometheus text output.
+
+Standard library only, so domain services can open spans without depending
+on a framework. Everything is off until ``set_enabled(True)``; a disabled
+span costs one global lookup and returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds in seconds; the last bucket is +Inf
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_enabled = False
+_NOOP: ContextManager[None] = nullcontext()
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@dataclass
+class LatencyHistogram:
+    """Cumulative-bucket histogram of durations in seconds."""
+
+    buckets: Sequence[float] = LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def copy(self) -> "LatencyHistogram":
+        return LatencyHistogram(self.buckets, list(self.counts), self.total, self.count)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, running = [], 0
+        for bound, n in zip([*map(_format_value, self.buckets), "+Inf"], self.counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+@dataclass
+class MetricFamily:
+    """One metric name with its samples, ready to render.
+
+    ``samples`` maps label values (in ``labels`` order) to a number, or to a
+    ``LatencyHistogram`` for histograms.
+    """
+
+    name: str
+    kind: str
+    help: str
+    labels: Tuple[str, ...] = ()
+    samples: Dict[Tuple[str, ...], Any] = field(default_factory=dict)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, sample in sorted(self.samples.items()):
+            pairs = list(zip(self.labels, values))
+            if isinstance(sample, LatencyHistogram):
+                for bound, count in sample.cumulative():
+                    labels = _labels(pairs + [("le", bound)])
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(
+                    f"{self.name}_sum{_labels(pairs)} {_format_value(sample.total)}"
+                )
+                lines.append(f"{self.name}_count{_labels(pairs)} {sample.count}")
+            else:
+                lines.append(f"{self.name}{_labels(pairs)} {_format_value(sample)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> None:
+        self._family = MetricFamily(name, "histogram", help, labels)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        with self._lock:
+            histogram = self._family.samples.get(label_values)
+            if histogram is None:
+                histogram = self._family.samples[label_values] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = {key: h.copy() for key, h in self._family.samples.items()}
+        family = self._family
+        return MetricFamily(
+            family.name, family.kind, family.help, family.labels, samples
+        )
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> None:
+        self._family = MetricFamily(name, "counter", help, labels)
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            samples = self._family.samples
+            samples[label_values] = samples.get(label_values, 0) + amount
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            samples = dict(self._family.samples)
+        family = self._family
+        return MetricFamily(
+            family.name, family.kind, family.help, family.labels, samples
+        )
+
+
+class Registry:
+    """Metrics owned by this module plus collectors registered by the app.
+
+    Collectors are called at scrape time and return ``MetricFamily`` objects,
+    which is how existing ``stats()`` counters are exported without
+    duplicating their bookkeeping.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._collectors: Dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self, name: str, help: str, labels: Tuple[str, ...] = ()
+    ) -> Histogram:
+        metric = Histogram(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+        self, name: str, collector: Callable[[], Iterable[MetricFamily]]
+    ) -> None:
+        """Add or replace the collector called ``name``."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def collect(self) -> List[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        with self._lock:
+            collectors = list(self._collectors.values())
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        lines: List[str] = []
+        for family in self.collect():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+SPAN_SECONDS = REGISTRY.histogram(
+    "app_span_duration_seconds", "Time spent in instrumented code paths", ("span",)
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "app_request_duration_seconds",
+    "Endpoint latency including response serialization",
+    ("route",),
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "app_upstream_responses_total",
+    "FMP responses by HTTP status; 'error' for connection failures",
+    ("status",),
+)
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        SPAN_SECONDS.observe(time.perf_counter() - self.started, self.name)
+
+
+def span(name: str) -> ContextManager[None]:
+    """Time the ``with`` block into ``app_span_duration_seconds{span=name}``."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of ``span``; the function stays picklable by name."""
+
+    def decorate(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                SPAN_SECONDS.observe(time.perf_counter() - started, name)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def count_upstream(status: str) -> None:
+    if _enabled:
+        UPSTREAM_RESPONSES.inc(status)
+
+
+def stats_families(
+    prefix: str, values: Dict[str, Any], gauges: Iterable[str] = ()
+) -> List[MetricFamily]:
+    """Export the numeric entries of a ``stats()`` dict.
+
+    Keys listed in ``gauges`` become ``<prefix>_<key>`` gauges; the others are
+    monotonic counts and become ``<prefix>_<key>_total`` counters.
+    """
+    gauges = set(gauges)
+    families = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in gauges:
+            name, kind = f"{prefix}_{key}", "gauge"
+        else:
+            name, kind = f"{prefix}_{key}_total", "counter"
+        help = f"{key.replace('_', ' ').capitalize()} ({prefix})"
+        families.append(MetricFamily(name, kind, help, (), {(): value}))
+    return families
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
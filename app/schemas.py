@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import math
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from pydantic import BaseModel, validator
+import numpy as np
+from pydantic import BaseModel, Field, validator
+
+from app.domain.services.stop_loss_strategies import MACD_STRATEGY, validate_strategy
 
 
 def _coerce_non_finite(value: Optional[float]) -> Optional[float]:
@@ -13,6 +16,16 @@ def _coerce_non_finite(value: Optional[float]) -> Optional[float]:
     return value
 
 
+def coerce_non_finite_column(
+    values: Sequence[Optional[float]],
+) -> List[Optional[float]]:
+    """``_coerce_non_finite`` for a whole column: floats, with NaN/inf as ``None``."""
+    array = np.asarray(values, dtype=float)
+    out = array.astype(object)
+    out[~np.isfinite(array)] = None
+    return out.tolist()
+
+
 class StopLossResponse(BaseModel):
     symbol: str
     stop_loss: Optional[float]
@@ -33,3 +46,136 @@ class MacdMinimaRow(BaseModel):
     @validator("macd", "price", pre=True)
     def _coerce_non_finite_fields(cls, v):
         return _coerce_non_finite(v)
+
+
+class MacdMinimaColumns(BaseModel):
+    """``format=columns`` body of the minima endpoint: one array per field."""
+
+    symbol: str
+    period: str
+    date: List[datetime]
+    macd: List[Optional[float]]
+    price: List[Optional[float]]
+
+
+class StopLossBatchRequest(BaseModel):
+    symbols: List[str] = Field(..., min_items=1)
+    periodicity: str = "MS"
+    num_elements: int = Field(10, gt=0)
+    days: int = Field(3650, gt=0)
+    strategies: Optional[List[str]] = Field(None, min_items=1)
+
+    @validator("strategies")
+    def _known_strategies(cls, v):
+        if v is None:
+            return v
+        return [validate_strategy(name) for name in dict.fromkeys(v)]
+
+
+class StopLossRow(BaseModel):
+    symbol: str
+    current_price: Optional[float]
+    stop_loss: Optional[float]
+    stop_loss_date: Optional[datetime]
+    max_macd_date: Optional[datetime]
+    period: str
+    strategy: Optional[str]
+
+    @validator("current_price", "stop_loss", pre=True)
+    def _coerce_non_finite_fields(cls, v):
+        return _coerce_non_finite(v)
+
+
+class SymbolError(BaseModel):
+    symbol: str
+    detail: str
+
+
+class StopLossBatchResponse(BaseModel):
+    results: List[StopLossRow]
+    errors: List[SymbolError]
+
+
+class StopLossBacktestRequest(BaseModel):
+    symbols: List[str] = Field(..., min_items=1)
+    periodicity: str = "MS"
+    num_elements: int = Field(10, gt=0)
+    days: int = Field(3650, gt=0)
+    strategy: str = MACD_STRATEGY
+
+    @validator("strategy")
+    def _known_strategy(cls, v):
+        return validate_strategy(v)
+
+
+class StopHitRow(BaseModel):
+    date: datetime
+    stop_loss: Optional[float]
+    fill_price: Optional[float]
+    reentry_date: Optional[datetime]
+    further_decline: Optional[float]
+
+    @validator("stop_loss", "fill_price", "further_decline", pre=True)
+    def _coerce_non_finite_fields(cls, v):
+        return _coerce_non_finite(v)
+
+
+class StopLossBacktestRow(BaseModel):
+    symbol: str
+    period: str
+    strategy: str
+    bars: int
+    first_date: Optional[datetime]
+    last_date: Optional[datetime]
+    stop_hits: int
+    bars_in_position: int
+    time_in_position: Optional[float]
+    total_return: Optional[float]
+    buy_hold_return: Optional[float]
+    max_drawdown: Optional[float]
+    buy_hold_max_drawdown: Optional[float]
+    drawdown_avoided: Optional[float]
+    hits: List[StopHitRow]
+
+    @validator(
+        "time_in_position",
+        "total_return",
+        "buy_hold_return",
+        "max_drawdown",
+        "buy_hold_max_drawdown",
+        "drawdown_avoided",
+        pre=True,
+    )
+    def _coerce_non_finite_fields(cls, v):
+        return _coerce_non_finite(v)
+
+
+class StopLossBacktestResponse(BaseModel):
+    results: List[StopLossBacktestRow]
+    errors: List[SymbolError]
+
+
+class ScreenedMinimum(BaseModel):
+    symbol: str
+    date: datetime
+    macd: Optional[float]
+    price: Optional[float]
+    bars_since: int
+    last_bar_date: datetime
+
+    @validator("macd", "price", pre=True)
+    def _coerce_non_finite_fields(cls, v):
+        return _coerce_non_finite(v)
+
+
+class MacdMinimaScreenResponse(BaseModel):
+    period: str
+    window: int
+    within: int
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int]
+    computed_at: float
+    results: List[ScreenedMinimum]
+    errors: List[SymbolError]
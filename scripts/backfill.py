@@ -0,0 +1,95 @@
+"""Bulk-download price history into a local columnar store.
+
+Fetches every symbol of a universe from FMP once and writes it under
+``--root`` as ``symbol=<SYMBOL>/`` partitions plus ``manifest.jsonl``.
+Re-running the same command resumes: symbols already in the manifest are
+skipped unless ``--refresh`` is passed.
+
+Point ``PRICE_STORE_PATH`` (or ``--store`` on the QA scripts) at the same
+directory to serve or plot from the local dataset without network calls.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.application.use_cases.backfill_prices import backfill_prices
+from app.infrastructure.adapters.columnar_price_store import (
+    FORMATS,
+    ColumnarPriceStore,
+)
+from app.interface.deps import build_fmp_repository
+from app.interface.settings import get_settings
+
+
+def read_symbols(path: Path) -> List[str]:
+    """One or more comma-separated tickers per line; ``#`` starts a comment."""
+    symbols: List[str] = []
+    for line in path.read_text().splitlines():
+        line = line.split("#", 1)[0]
+        symbols.extend(s.strip().upper() for s in line.split(",") if s.strip())
+    return list(dict.fromkeys(symbols))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Backfill price history into a local columnar store"
+    )
+    parser.add_argument(
+        "--symbols-file", required=True, type=Path, help="File listing the tickers"
+    )
+    parser.add_argument("--root", default="data/prices", help="Store directory")
+    parser.add_argument(
+        "--days", type=int, default=3650, help="Days of history to fetch"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent FMP requests"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="npy", help="Partition file format"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-download symbols already recorded in the manifest",
+    )
+    args = parser.parse_args(argv)
+
+    symbols = read_symbols(args.symbols_file)
+    store = ColumnarPriceStore(args.root, fmt=args.format)
+    repo = build_fmp_repository(get_settings())
+    progress = {"done": 0}
+
+    def on_progress(symbol: str, error: Optional[str]) -> None:
+        progress["done"] += 1
+        status = f"failed: {error}" if error else "ok"
+        print(f"[{progress['done']}] {symbol}: {status}", flush=True)
+
+    try:
+        report = backfill_prices(
+            repo,
+            store,
+            symbols,
+            days=args.days,
+            max_concurrency=args.concurrency,
+            refresh=args.refresh,
+            on_progress=on_progress,
+        )
+    finally:
+        repo.close()
+
+    print(
+        f"{report.written} written ({report.rows} rows), {report.skipped} skipped, "
+        f"{len(report.errors)} failed of {report.requested} in "
+        f"{report.duration_seconds:.1f}s"
+    )
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
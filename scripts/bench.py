@@ -0,0 +1,418 @@
+"""Micro-benchmarks for the domain hot paths.
+
+Usage:
+  python scripts/bench.py run --output benchmarks/baseline.json
+  python scripts/bench.py run --output current.json --sizes 100,10000
+  python scripts/bench.py compare benchmarks/baseline.json current.json --threshold 0.25
+
+``run`` times every case on synthetic OHLCV series and writes a JSON report.
+``compare`` exits with status 1 when any case present in both reports got
+slower than the baseline by more than ``threshold`` (a fraction). Baselines
+are machine specific and not committed; see docs/benchmarks.md for how CI
+records one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Ensure project root is importable
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# The legacy adapter refuses to start without a key; benchmarks never call FMP
+os.environ.setdefault("FINANCIALMODELINGPREP_API_KEY", "benchmark")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator  # noqa: E402
+from app.domain.services.local_minima import find_local_minima  # noqa: E402
+from app.domain.services.macd_minima import get_macd_minima_from_macd  # noqa: E402
+from app.domain.services.resample import (  # noqa: E402
+    CachedResampler,
+    resample_ohlcv,
+    set_default_resampler,
+)
+from app.domain.services.stop_loss import get_stop_loss  # noqa: E402
+from app.infrastructure.adapters.fmp_columnar import (  # noqa: E402
+    historical_to_frame,
+    loads,
+)
+from app.infrastructure.financialmodelingprep import (  # noqa: E402
+    Financialmodelingprep,
+)
+
+DEFAULT_SIZES = (100, 10_000, 100_000, 1_000_000)
+REPORT_VERSION = 1
+
+
+def synthetic_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV bars, newest first like FMP.
+
+    Daily bars up to 100k rows; larger series use hourly bars so the dates stay
+    inside the pandas timestamp range.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    freq = "D" if n <= 100_000 else "H"
+    dates = pd.date_range(end="2024-01-01", periods=n, freq=freq)
+    df = pd.DataFrame(
+        {
+            "date": dates,
+            "open": close + rng.normal(0, 0.002, n) * close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 1_000_000, n).astype(float),
+        }
+    )
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def synthetic_fmp_body(df: pd.DataFrame) -> bytes:
+    """Encode ``df`` as an FMP ``historical-price-full`` response body."""
+    records = [
+        {
+            "date": day,
+            "open": o,
+            "high": h,
+            "low": lo,
+            "close": c,
+            "adjClose": c,
+            "volume": int(v),
+            "unadjustedVolume": int(v),
+            "change": c - o,
+            "changePercent": (c - o) / o * 100,
+            "vwap": (h + lo + c) / 3,
+            "label": day,
+            "changeOverTime": (c - o) / o,
+        }
+        for day, o, h, lo, c, v in zip(
+            df["date"].dt.strftime("%Y-%m-%d"),
+            df["open"],
+            df["high"],
+            df["low"],
+            df["close"],
+            df["volume"],
+        )
+    ]
+    return json.dumps({"symbol": "BENCH", "historical": records}).encode()
+
+
+@dataclass
+class Case:
+    """One benchmark: ``build(df)`` returns the zero-argument callable to time."""
+
+    name: str
+    build: Callable[[pd.DataFrame], Callable[[], object]]
+    params: Dict[str, object] = field(default_factory=dict)
+    max_size: Optional[int] = None
+
+    def key(self, size: int) -> str:
+        parts = [f"n={size}"] + [f"{k}={v}" for k, v in self.params.items()]
+        return f"{self.name}[{','.join(parts)}]"
+
+
+def _minima_case(window: int, engine: str) -> Callable:
+    def build(df: pd.DataFrame) -> Callable[[], object]:
+        macd = EmaMacdCalculator().get_macd(df.iloc[::-1].reset_index(drop=True))
+        return lambda: find_local_minima(macd, window=window, engine=engine)
+
+    return build
+
+
+def _ingest_case(engine: str) -> Callable:
+    def build(df: pd.DataFrame) -> Callable[[], object]:
+        body = synthetic_fmp_body(df)
+        if engine == "records":
+
+            def run() -> object:
+                # The previous path: dict per bar, then parse dates downstream
+                frame = pd.DataFrame(json.loads(body)["historical"])
+                frame["date"] = pd.to_datetime(frame["date"])
+                return frame
+
+            return run
+        return lambda: historical_to_frame(loads(body)["historical"])
+
+    return build
+
+
+def _macd_case(df: pd.DataFrame) -> Callable[[], object]:
+    chronological = df.iloc[::-1].reset_index(drop=True)
+    return lambda: EmaMacdCalculator().get_macd(chronological)
+
+
+def _macd_minima_case(window: int) -> Callable:
+    def build(df: pd.DataFrame) -> Callable[[], object]:
+        chronological = df.iloc[::-1].reset_index(drop=True)
+        macd = EmaMacdCalculator().get_macd(chronological)
+        return lambda: get_macd_minima_from_macd(chronological, macd, window=window)
+
+    return build
+
+
+def _resample_case(periodicity: str) -> Callable:
+    def build(df: pd.DataFrame) -> Callable[[], object]:
+        return lambda: resample_ohlcv(df, periodicity)
+
+    return build
+
+
+def _stop_loss_case(periodicity: str, num_elements: int, engine: str) -> Callable:
+    def build(df: pd.DataFrame) -> Callable[[], object]:
+        # A fresh resampler per call keeps the resample cost in the measurement
+        if engine == "legacy":
+            fmp = Financialmodelingprep()
+
+            def run() -> object:
+                set_default_resampler(CachedResampler())
+                return fmp.get_stop_loss("BENCH", df, False, periodicity, num_elements)
+
+        else:
+
+            def run() -> object:
+                set_default_resampler(CachedResampler())
+                return get_stop_loss("BENCH", df, periodicity, num_elements)
+
+        return run
+
+    return build
+
+
+def default_cases() -> List[Case]:
+    cases: List[Case] = []
+    for window in (1, 5, 20):
+        cases.append(
+            Case(
+                "find_local_minima",
+                _minima_case(window, "numpy"),
+                {"window": window, "engine": "numpy"},
+            )
+        )
+        cases.append(
+            Case(
+                "find_local_minima",
+                _minima_case(window, "python"),
+                {"window": window, "engine": "python"},
+                max_size=100_000,
+            )
+        )
+    for engine in ("columnar", "records"):
+        cases.append(
+            Case(
+                "fmp_ingest", _ingest_case(engine), {"engine": engine}, max_size=100_000
+            )
+        )
+    cases.append(Case("EmaMacdCalculator.get_macd", _macd_case))
+    for window in (1, 5):
+        cases.append(
+            Case(
+                "get_macd_minima_from_macd",
+                _macd_minima_case(window),
+                {"window": window},
+            )
+        )
+    for periodicity in ("W", "MS"):
+        cases.append(
+            Case("resample_ohlcv", _resample_case(periodicity), {"period": periodicity})
+        )
+    for num_elements in (5, 20):
+        for engine in ("numpy", "legacy"):
+            cases.append(
+                Case(
+                    "get_stop_loss",
+                    _stop_loss_case("W", num_elements, engine),
+                    {"period": "W", "num_elements": num_elements, "engine": engine},
+                )
+            )
+    return cases
+
+
+def measure(
+    func: Callable[[], object], repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, float]:
+    """Time ``func``: calibrate a loop count, then keep the best of ``repeat`` runs.
+
+    One extra untimed call under ``tracemalloc`` records the peak Python and
+    NumPy heap usage of a single call.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "min": min(timings),
+        "median": float(np.median(timings)),
+        "number": number,
+        "repeat": repeat,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def run(
+    sizes: Iterable[int],
+    cases: List[Case],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    pattern: Optional[str] = None,
+) -> Dict:
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        df = synthetic_ohlcv(size)
+        for case in cases:
+            key = case.key(size)
+            if case.max_size is not None and size > case.max_size:
+                continue
+            if pattern and pattern not in key:
+                continue
+            results[key] = measure(case.build(df), repeat=repeat, min_time=min_time)
+            print(
+                f"{key:<75} {results[key]['min'] * 1e3:>12.3f} ms"
+                f" {results[key]['peak_bytes'] / 2**20:>10.2f} MiB",
+                flush=True,
+            )
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Print time and peak-memory ratios and return the keys that regressed.
+
+    A case regresses when either ratio exceeds ``1 + threshold``; reports
+    without ``peak_bytes`` are compared on time only.
+    """
+    regressions: List[str] = []
+    base_results = baseline["results"]
+    print(f"{'case':<75} {'time':>12} {'memory':>10}")
+    for key, result in current["results"].items():
+        if key not in base_results:
+            print(f"{key:<75} {'new':>12}")
+            continue
+        before = base_results[key]
+        time_ratio = _ratio(result["min"], before["min"])
+        memory_ratio = None
+        if "peak_bytes" in result and "peak_bytes" in before:
+            memory_ratio = _ratio(result["peak_bytes"], before["peak_bytes"])
+
+        flag = ""
+        if time_ratio > 1 + threshold or (
+            memory_ratio is not None and memory_ratio > 1 + threshold
+        ):
+            regressions.append(key)
+            flag = "  REGRESSION"
+        memory = f"{memory_ratio:>9.2f}x" if memory_ratio is not None else f"{'-':>10}"
+        print(f"{key:<75} {time_ratio:>11.2f}x {memory}{flag}")
+    return regressions
+
+
+def _ratio(after: float, before: float) -> float:
+    if before > 0:
+        return after / before
+    return 1.0 if after <= 0 else float("inf")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark domain hot paths")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Time every case and write a JSON report")
+    run_parser.add_argument(
+        "--output", default="benchmarks/baseline.json", help="Report path"
+    )
+    run_parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated series lengths",
+    )
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    run_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Seconds each timed run should last at least",
+    )
+    run_parser.add_argument(
+        "-k", dest="pattern", default=None, help="Only run cases containing this text"
+    )
+
+    compare_parser = sub.add_parser(
+        "compare", help="Fail when a case got slower than the baseline"
+    )
+    compare_parser.add_argument("baseline", help="Baseline report")
+    compare_parser.add_argument("current", help="Report to check")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown as a fraction of the baseline time",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        report = run(
+            sizes,
+            default_cases(),
+            repeat=args.repeat,
+            min_time=args.min_time,
+            pattern=args.pattern,
+        )
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, sort_keys=True))
+        print(f"Saved: {output}")
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
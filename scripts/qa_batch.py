@@ -32,7 +32,14 @@ def main():
     parser.add_argument(
         "--outdir", default="plots", help="Directory to save PNG outputs"
     )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Read history from a local backfilled store instead of FMP",
+    )
     args = parser.parse_args()
+    if args.store:
+        os.environ.setdefault("FINANCIALMODELINGPREP_API_KEY", "offline")
 
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
@@ -44,13 +51,17 @@ def main():
         stop_path = outdir / f"{sym.lower()}_stop_loss.png"
 
         try:
-            p1 = plot_macd_with_minima(sym, args.days, args.window, str(macd_path))
+            p1 = plot_macd_with_minima(
+                sym, args.days, args.window, str(macd_path), store=args.store
+            )
             print(f"Saved: {p1}")
         except Exception as e:
             print(f"Failed macd minima for {sym}: {e}")
 
         try:
-            p2 = plot_stop_loss(sym, args.days, args.period, 20, str(stop_path))
+            p2 = plot_stop_loss(
+                sym, args.days, args.period, 20, str(stop_path), store=args.store
+            )
             print(f"Saved: {p2}")
         except Exception as e:
             print(f"Failed stop loss for {sym}: {e}")
@@ -2,6 +2,7 @@ import argparse
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -11,19 +12,28 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.fused_macd import FusedMacdCalculator
+from app.infrastructure.adapters.columnar_price_store import (
+    ColumnarPriceDataRepository,
+)
 from app.infrastructure.financialmodelingprep import (
     Financialmodelingprep,
     find_local_minima,
 )
 
 
-def plot_macd_with_minima(symbol: str, days: int, window: int, output: str) -> str:
+def plot_macd_with_minima(
+    symbol: str, days: int, window: int, output: str, store: Optional[str] = None
+) -> str:
     f = Financialmodelingprep()
 
-    df = f.getStockData(symbol, days)
+    if store:
+        df = ColumnarPriceDataRepository(store).get_stock_data(symbol, days)
+    else:
+        df = f.getStockData(symbol, days)
     df_weekly = f.resample(df, "W")
-    macd = EmaMacdCalculator().get_macd(df_weekly)
+    lines = FusedMacdCalculator().lines(df_weekly)
+    macd = pd.Series(lines.macd, index=df_weekly.index)
 
     minima_indices = find_local_minima(macd, window=window)
 
@@ -35,12 +45,8 @@ def plot_macd_with_minima(symbol: str, days: int, window: int, output: str) -> s
     plt.figure(figsize=(12, 6))
     plt.plot(dates, macd_vals, label="MACD", color="#1f77b4")
 
-    # Optional signal line for context
-    try:
-        signal = f.getExp(macd_vals, 9)
-        plt.plot(dates, signal, label="Signal (9)", color="#ff7f0e")
-    except Exception:
-        pass
+    # Signal line for context, from the same pass as the MACD
+    plt.plot(dates, lines.signal, label="Signal (9)", color="#ff7f0e")
 
     if minima_indices:
         plt.scatter(
@@ -94,9 +100,18 @@ def main():
         default="plots/macd_minima.png",
         help="Path to save the PNG plot",
     )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Read history from a local backfilled store instead of FMP",
+    )
     args = parser.parse_args()
+    if args.store:
+        os.environ.setdefault("FINANCIALMODELINGPREP_API_KEY", "offline")
 
-    out_path = plot_macd_with_minima(args.symbol, args.days, args.window, args.output)
+    out_path = plot_macd_with_minima(
+        args.symbol, args.days, args.window, args.output, store=args.store
+    )
     print(f"Saved plot to: {out_path}")
 
 
@@ -2,6 +2,7 @@ import argparse
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import pandas as pd
@@ -11,17 +12,28 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.fused_macd import FusedMacdCalculator
+from app.infrastructure.adapters.columnar_price_store import (
+    ColumnarPriceDataRepository,
+)
 from app.infrastructure.financialmodelingprep import Financialmodelingprep
 
 
 def plot_stop_loss(
-    symbol: str, days: int, period: str, num_elements: int, output: str
+    symbol: str,
+    days: int,
+    period: str,
+    num_elements: int,
+    output: str,
+    store: Optional[str] = None,
 ) -> str:
     f = Financialmodelingprep()
 
     # Fetch raw historical data and compute stop loss using existing logic
-    df_raw = f.getStockData(symbol, days)
+    if store:
+        df_raw = ColumnarPriceDataRepository(store).get_stock_data(symbol, days)
+    else:
+        df_raw = f.getStockData(symbol, days)
     result = f.get_stop_loss(
         symbol, df_raw, plotData=False, periodicity=period, num_elements=num_elements
     )
@@ -36,7 +48,8 @@ def plot_stop_loss(
 
     # Build weekly data for plotting (chronological)
     df_weekly = f.resample(df_raw.copy(), period)
-    macd = EmaMacdCalculator().get_macd(df_weekly)
+    lines = FusedMacdCalculator().lines(df_weekly)
+    macd = pd.Series(lines.macd, index=df_weekly.index)
 
     dates = pd.to_datetime(df_weekly["date"])  # ensure datetime
 
@@ -64,11 +77,7 @@ def plot_stop_loss(
 
     # MACD panel
     ax_macd.plot(dates, macd, label="MACD", color="#9467bd")
-    try:
-        signal = f.getExp(macd, 9)
-        ax_macd.plot(dates, signal, label="Signal (9)", color="#ff7f0e")
-    except Exception:
-        pass
+    ax_macd.plot(dates, lines.signal, label="Signal (9)", color="#ff7f0e")
     ax_macd.axvline(
         max_macd_date,
         color="#8c564b",
@@ -116,10 +125,22 @@ def main():
     parser.add_argument(
         "--output", default="plots/stop_loss.png", help="Path to save the PNG plot"
     )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Read history from a local backfilled store instead of FMP",
+    )
     args = parser.parse_args()
+    if args.store:
+        os.environ.setdefault("FINANCIALMODELINGPREP_API_KEY", "offline")
 
     out_path = plot_stop_loss(
-        args.symbol, args.days, args.period, args.num_elements, args.output
+        args.symbol,
+        args.days,
+        args.period,
+        args.num_elements,
+        args.output,
+        store=args.store,
     )
     print(f"Saved plot to: {out_path}")
 
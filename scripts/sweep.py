@@ -0,0 +1,124 @@
+"""Evaluate MACD minima and stop-loss parameter grids for a universe.
+
+Loads every symbol once (from FMP, or from a local store written by
+``scripts/backfill.py`` with ``--store``), resamples it once per periodicity
+and evaluates every window and ``num_elements`` on the same MACD. Writes
+``stop_loss.<fmt>`` and ``macd_minima.<fmt>`` tidy tables under ``--out``;
+Parquet needs ``pyarrow``, CSV is the fallback.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.application.use_cases.sweep_parameters import SweepGrid, sweep_parameters
+from app.infrastructure.adapters.columnar_price_store import (
+    ColumnarPriceDataRepository,
+)
+from app.infrastructure.adapters.sweep_results import (
+    DEFAULT_FORMAT,
+    FORMATS,
+    write_tables,
+)
+from app.interface.deps import build_fmp_repository
+from app.interface.settings import get_settings
+from scripts.backfill import read_symbols
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _ints(value: str) -> List[int]:
+    try:
+        return [int(item) for item in _split(value)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers: {value}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Sweep MACD minima and stop-loss parameters over a universe"
+    )
+    universe = parser.add_mutually_exclusive_group(required=True)
+    universe.add_argument("--symbols", help="Comma-separated list of tickers")
+    universe.add_argument("--symbols-file", type=Path, help="File listing the tickers")
+    parser.add_argument(
+        "--periodicities", default="W,MS", help="Comma-separated resampling periods"
+    )
+    parser.add_argument(
+        "--windows", type=_ints, default=[1, 2, 3], help="Local-minima windows"
+    )
+    parser.add_argument(
+        "--num-elements",
+        type=_ints,
+        default=[5, 10, 20],
+        help="Stop-loss lowest-low neighborhoods",
+    )
+    parser.add_argument(
+        "--days", type=int, default=3650, help="Days of history to fetch"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Symbols evaluated at once"
+    )
+    parser.add_argument("--out", default="sweeps", help="Output directory")
+    parser.add_argument(
+        "--format", choices=FORMATS, default=DEFAULT_FORMAT, help="Output file format"
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Read history from a local backfilled store instead of FMP",
+    )
+    args = parser.parse_args(argv)
+
+    symbols = (
+        read_symbols(args.symbols_file)
+        if args.symbols_file
+        else [s.upper() for s in _split(args.symbols)]
+    )
+    try:
+        grid = SweepGrid(_split(args.periodicities), args.windows, args.num_elements)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.store:
+        repo = ColumnarPriceDataRepository(args.store)
+        close = None
+    else:
+        repo = build_fmp_repository(get_settings())
+        close = repo.close
+
+    def on_progress(symbol: str, error: Optional[str]) -> None:
+        print(f"{symbol}: {'failed: ' + error if error else 'ok'}", flush=True)
+
+    try:
+        report = sweep_parameters(
+            repo,
+            symbols,
+            grid,
+            days=args.days,
+            max_concurrency=args.concurrency,
+            on_progress=on_progress,
+        )
+    finally:
+        if close is not None:
+            close()
+
+    for path in write_tables(report.tables(), args.out, fmt=args.format):
+        print(f"Saved: {path}")
+    print(
+        f"{len(report.stop_loss)} stop-loss and {len(report.macd_minima)} minima "
+        f"rows, {len(report.errors)} failed of {report.requested} in "
+        f"{report.duration_seconds:.1f}s"
+    )
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
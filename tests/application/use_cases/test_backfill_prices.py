@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from app.application.use_cases.backfill_prices import backfill_prices
+from app.domain.repositories import PriceDataRepository
+from app.infrastructure.adapters.columnar_price_store import ColumnarPriceStore
+
+
+class FakeRepo(PriceDataRepository):
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        self.calls.append(symbol)
+        if symbol in self.failing:
+            raise RuntimeError(f"no data for {symbol}")
+        return pd.DataFrame(
+            {
+                "date": pd.date_range("2022-01-01", periods=5)[::-1],
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 10,
+            }
+        )
+
+
+def test_backfill_writes_symbols_and_records_failures(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    progress = []
+
+    report = backfill_prices(
+        FakeRepo(failing={"BAD"}),
+        store,
+        ["AAPL", "MSFT", "BAD", "AAPL"],
+        max_concurrency=2,
+        on_progress=lambda symbol, error: progress.append((symbol, error)),
+    )
+
+    assert report.requested == 3
+    assert report.written == 2
+    assert report.rows == 10
+    assert report.errors == [{"symbol": "BAD", "detail": "no data for BAD"}]
+    assert sorted(store.completed()) == ["AAPL", "MSFT"]
+    assert store.manifest()["failures"] == {"BAD": "no data for BAD"}
+    assert sorted(symbol for symbol, _ in progress) == ["AAPL", "BAD", "MSFT"]
+
+
+def test_backfill_resumes_and_retries_failures(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    backfill_prices(FakeRepo(failing={"BAD"}), store, ["AAPL", "BAD"])
+
+    repo = FakeRepo()
+    report = backfill_prices(repo, store, ["AAPL", "BAD"])
+
+    assert repo.calls == ["BAD"]
+    assert report.skipped == 1
+    assert report.written == 1
+    assert store.manifest()["failures"] == {}
+
+
+def test_backfill_refresh_refetches_everything(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    backfill_prices(FakeRepo(), store, ["AAPL"])
+
+    repo = FakeRepo()
+    report = backfill_prices(repo, store, ["AAPL"], refresh=True)
+
+    assert repo.calls == ["AAPL"]
+    assert report.skipped == 0
+
+
+def test_backfill_rejects_non_positive_concurrency(tmp_path):
+    with pytest.raises(ValueError):
+        backfill_prices(
+            FakeRepo(), ColumnarPriceStore(tmp_path), ["AAPL"], max_concurrency=0
+        )
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.application.use_cases.backtest_stop_loss import (
+    backtest_frame,
+    backtest_stop_loss,
+)
+
+
+class FakeRepo:
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        if symbol not in self._mapping:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return self._mapping[symbol]
+
+
+def _make_daily_df(seed: int, n: int = 700) -> pd.DataFrame:
+    # Newest first, as FMP returns it
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, size=n))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2019-01-01", periods=n, freq="B")[::-1],
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+
+
+def test_backtest_frame_summarises_the_resampled_history():
+    row = backtest_frame("AAA", _make_daily_df(1), "W", 10, "macd")
+
+    assert row["symbol"] == "AAA"
+    assert row["period"] == "W"
+    assert row["strategy"] == "macd"
+    assert row["bars"] == 141
+    assert row["first_date"] < row["last_date"]
+    assert row["stop_hits"] == len(row["hits"])
+
+
+def test_backtest_stop_loss_isolates_failures_and_keeps_input_order():
+    repo = FakeRepo({"AAA": _make_daily_df(1), "BBB": _make_daily_df(2)})
+
+    out = backtest_stop_loss(
+        repo, ["BBB", "ZZZ", "AAA", "BBB"], periodicity="W", strategy="atr"
+    )
+
+    assert [row["symbol"] for row in out["results"]] == ["BBB", "AAA"]
+    assert {row["strategy"] for row in out["results"]} == {"atr"}
+    assert out["errors"][0]["symbol"] == "ZZZ"
+    assert out["results"][1] == backtest_frame("AAA", _make_daily_df(1), "W", 20, "atr")
+
+
+def test_backtest_stop_loss_validates_arguments():
+    with pytest.raises(ValueError, match="Unknown stop-loss strategy"):
+        backtest_stop_loss(FakeRepo({}), ["AAA"], strategy="moon")
+    with pytest.raises(ValueError, match="max_concurrency"):
+        backtest_stop_loss(FakeRepo({}), ["AAA"], max_concurrency=0)
+    assert backtest_stop_loss(FakeRepo({}), []) == {"results": [], "errors": []}
@@ -42,3 +42,95 @@ def test_use_case_returns_rows_in_order_with_expected_fields():
     # Price maps to close values at those dates
     assert all(isinstance(r["price"], float) for r in rows)
     assert all(r["symbol"] == "ABC" and r["period"] == "W" for r in rows)
+
+
+def test_panel_use_case_matches_single_symbol_use_case_and_isolates_errors():
+    from app.application.use_cases.get_macd_minima import (
+        get_macd_minima,
+        get_macd_minima_panel,
+    )
+
+    frames = {
+        "ABC": _make_weekly_df([5, 4, 3, 4, 3, 4, 5, 6, 5, 4, 5]),
+        "XYZ": _make_weekly_df([9, 8, 9, 10, 9, 8, 7, 8]),
+    }
+
+    class PanelRepo:
+        def get_stock_data(self, symbol, days):
+            if symbol not in frames:
+                raise RuntimeError(f"no data for {symbol}")
+            return frames[symbol]
+
+    repo = PanelRepo()
+    out = get_macd_minima_panel(
+        repo, ["ABC", "MISSING", "XYZ", "ABC"], days=100, periodicity="W"
+    )
+
+    expected = get_macd_minima(
+        FakeRepo(frames["ABC"]), "ABC", days=100, periodicity="W"
+    ) + get_macd_minima(FakeRepo(frames["XYZ"]), "XYZ", days=100, periodicity="W")
+    assert out["results"] == expected
+    assert out["errors"] == [{"symbol": "MISSING", "detail": "no data for MISSING"}]
+
+
+def test_panel_use_case_float32_selects_the_same_minima():
+    from app.application.use_cases.get_macd_minima import get_macd_minima_panel
+
+    frame = _make_weekly_df([5, 4, 3, 4, 3, 4, 5, 6, 5, 4, 5])
+
+    class PanelRepo:
+        def get_stock_data(self, symbol, days):
+            return frame
+
+    wide = get_macd_minima_panel(PanelRepo(), ["ABC"], days=100, periodicity="W")
+    narrow = get_macd_minima_panel(
+        PanelRepo(), ["ABC"], days=100, periodicity="W", dtype="float32"
+    )
+
+    assert [r["date"] for r in narrow["results"]] == [
+        r["date"] for r in wide["results"]
+    ]
+    for a, b in zip(narrow["results"], wide["results"]):
+        assert abs(a["macd"] - b["macd"]) < 1e-5
+
+
+def test_panel_use_case_with_macd_states_matches_the_stateless_run():
+    import numpy as np
+
+    from app.application.use_cases.get_macd_minima import get_macd_minima_panel
+    from app.infrastructure.adapters.in_memory_indicator_store import (
+        InMemoryIndicatorStore,
+    )
+
+    rng = np.random.default_rng(4)
+
+    def daily(start, n):
+        close = 50 + np.cumsum(rng.normal(0, 1, n))
+        return pd.DataFrame(
+            {
+                "date": pd.bdate_range(start, periods=n),
+                "open": close,
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": 1000,
+            }
+        )
+
+    full = {"AAA": daily("2019-01-01", 600), "BBB": daily("2019-06-03", 400)}
+    frames = {symbol: df.iloc[:-20] for symbol, df in full.items()}
+
+    class PanelRepo:
+        def get_stock_data(self, symbol, days):
+            return frames[symbol]
+
+    states = InMemoryIndicatorStore()
+    get_macd_minima_panel(PanelRepo(), ["AAA", "BBB"], 1000, macd_states=states)
+    frames = full
+    resumed = get_macd_minima_panel(
+        PanelRepo(), ["AAA", "BBB"], 1000, macd_states=states
+    )
+    stateless = get_macd_minima_panel(PanelRepo(), ["AAA", "BBB"], 1000)
+
+    assert resumed["results"] == stateless["results"]
+    assert len(resumed["results"]) > 0
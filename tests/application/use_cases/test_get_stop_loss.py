@@ -57,3 +57,211 @@ def test_use_case_get_stop_loss_with_strategy_callable():
     assert rows[1]["current_price"] == float(df_abc.iloc[0].close)
     assert rows[1]["stop_loss"] == 67.89
     assert rows[1]["period"] == "W"
+
+
+def _fake_strategy(symbol, stock_data, periodicity, num_elements):
+    return {
+        "stop_loss": float(stock_data.iloc[-1].low),
+        "stop_loss_date": stock_data.iloc[-1].date,
+        "max_macd_date": stock_data.iloc[0].date,
+    }
+
+
+def test_use_case_get_stop_loss_batch_isolates_errors_and_keeps_order():
+    from app.application.use_cases.get_stop_loss import get_stop_loss_batch
+
+    mapping = {
+        f"S{i}": _make_daily_df([10 + i, 11 + i, 12 + i], start="2020-01-01")
+        for i in range(10)
+    }
+    repo = FakeRepo(mapping)
+
+    out = get_stop_loss_batch(
+        repo,
+        symbols=["S3", "MISSING", "S1", "S3", "S7"],
+        periodicity="W",
+        num_elements=10,
+        strategy=_fake_strategy,
+        max_concurrency=3,
+    )
+
+    assert [r["symbol"] for r in out["results"]] == ["S3", "S1", "S7"]
+    assert out["results"][0]["current_price"] == 13.0
+    assert out["results"][0]["stop_loss"] == 14.0
+    assert out["results"][0]["period"] == "W"
+    assert [e["symbol"] for e in out["errors"]] == ["MISSING"]
+
+
+def test_use_case_get_stop_loss_batch_bounds_concurrency():
+    import threading
+    import time
+
+    from app.application.use_cases.get_stop_loss import get_stop_loss_batch
+
+    df = _make_daily_df([10, 11, 12])
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    class SlowRepo:
+        def get_stock_data(self, symbol, days):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.01)
+            with lock:
+                state["in_flight"] -= 1
+            return df
+
+    out = get_stop_loss_batch(
+        SlowRepo(),
+        symbols=[f"S{i}" for i in range(20)],
+        strategy=_fake_strategy,
+        max_concurrency=4,
+    )
+
+    assert len(out["results"]) == 20
+    assert out["errors"] == []
+    assert 1 < state["peak"] <= 4
+
+
+def test_async_use_case_computes_rows_through_offload():
+    import asyncio
+
+    from app.application.use_cases.get_stop_loss import get_stop_loss_async
+
+    df = _make_daily_df([10, 11, 12])
+
+    class AsyncRepo:
+        async def get_stock_data(self, symbol, days):
+            return df
+
+    offloaded = []
+
+    async def offload(fn, *args):
+        offloaded.append(fn.__name__)
+        return fn(*args)
+
+    def fake_strategy(symbol, stock_data, periodicity, num_elements):
+        return {"stop_loss": 9.0, "stop_loss_date": None, "max_macd_date": None}
+
+    loop = asyncio.new_event_loop()
+    try:
+        rows = loop.run_until_complete(
+            get_stop_loss_async(
+                AsyncRepo(), ["FB"], strategy=fake_strategy, offload=offload
+            )
+        )
+    finally:
+        loop.close()
+
+    assert offloaded == ["_stop_loss_rows_from_frames"]
+    assert rows[0]["symbol"] == "FB"
+    assert rows[0]["stop_loss"] == 9.0
+
+
+def test_iter_stop_loss_rows_streams_in_completion_order_with_errors():
+    import asyncio
+
+    from app.application.use_cases.get_stop_loss import iter_stop_loss_rows
+
+    df = _make_daily_df([10, 11, 12])
+    delays = {"SLOW": 0.05, "FAST": 0.0, "BAD": 0.01}
+
+    class AsyncRepo:
+        async def get_stock_data(self, symbol, days):
+            await asyncio.sleep(delays[symbol])
+            if symbol == "BAD":
+                raise RuntimeError("no data for BAD")
+            return df
+
+    async def collect():
+        return [
+            row
+            async for row in iter_stop_loss_rows(
+                AsyncRepo(),
+                ["SLOW", "FAST", "BAD", "FAST"],
+                strategy=_fake_strategy,
+            )
+        ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        rows = loop.run_until_complete(collect())
+    finally:
+        loop.close()
+
+    assert [row["symbol"] for row in rows] == ["FAST", "BAD", "SLOW"]
+    assert rows[0]["current_price"] == 10.0
+    assert rows[1] == {"symbol": "BAD", "detail": "no data for BAD"}
+
+
+def test_iter_stop_loss_rows_bounds_the_window_and_cancels_on_close():
+    import asyncio
+
+    from app.application.use_cases.get_stop_loss import iter_stop_loss_rows
+
+    df = _make_daily_df([10, 11, 12])
+    state = {"in_flight": 0, "peak": 0, "started": 0, "cancelled": 0}
+
+    class AsyncRepo:
+        async def get_stock_data(self, symbol, days):
+            state["started"] += 1
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            try:
+                await asyncio.sleep(0.001 if symbol != "S0" else 10)
+            except asyncio.CancelledError:
+                state["cancelled"] += 1
+                raise
+            finally:
+                state["in_flight"] -= 1
+            return df
+
+    async def read_some():
+        rows = iter_stop_loss_rows(
+            AsyncRepo(),
+            [f"S{i}" for i in range(50)],
+            strategy=_fake_strategy,
+            max_concurrency=3,
+        )
+        got = [await rows.__anext__() for _ in range(5)]
+        await rows.aclose()
+        await asyncio.sleep(0)
+        return got
+
+    loop = asyncio.new_event_loop()
+    try:
+        got = loop.run_until_complete(read_some())
+    finally:
+        loop.close()
+
+    assert len(got) == 5
+    assert state["peak"] <= 3
+    assert state["started"] < 50
+    assert state["cancelled"] >= 1
+    assert state["in_flight"] == 0
+
+
+def test_use_case_get_stop_loss_batch_with_named_strategies():
+    from app.application.use_cases.get_stop_loss import get_stop_loss_batch
+
+    df = _make_daily_df([float(v) for v in range(100, 40, -1)])
+
+    out = get_stop_loss_batch(
+        FakeRepo({"AAA": df}),
+        symbols=["AAA", "ZZZ"],
+        periodicity="W",
+        num_elements=3,
+        strategy=_fake_strategy,
+        strategies=["macd", "donchian"],
+    )
+
+    rows = out["results"]
+    assert [(row["symbol"], row["strategy"]) for row in rows] == [
+        ("AAA", "macd"),
+        ("AAA", "donchian"),
+    ]
+    assert rows[0]["stop_loss"] == _fake_strategy("AAA", df, "W", 3)["stop_loss"]
+    assert rows[1]["current_price"] == 100.0
+    assert rows[1]["max_macd_date"] is None
+    assert [error["symbol"] for error in out["errors"]] == ["ZZZ"]
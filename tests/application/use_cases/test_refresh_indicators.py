@@ -0,0 +1,144 @@
+import pandas as pd
+
+from app.application.use_cases.refresh_indicators import refresh_indicators
+from app.domain.repositories import IndicatorKey
+from app.domain.services.streaming_macd import StreamingMacdCalculator
+from app.infrastructure.adapters.in_memory_indicator_store import (
+    InMemoryIndicatorStore,
+)
+from app.infrastructure.adapters.in_memory_latest_minima_index import (
+    InMemoryLatestMinimaIndex,
+)
+
+
+class FakeRepo:
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        if symbol not in self._mapping:
+            raise RuntimeError(f"no data for {symbol}")
+        return self._mapping[symbol]
+
+
+def _make_weekly_df(values: list[float]) -> pd.DataFrame:
+    n = len(values)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=n, freq="W"),
+            "open": values,
+            "high": [v + 1 for v in values],
+            "low": [v - 1 for v in values],
+            "close": values,
+            "volume": [1000] * n,
+        }
+    )
+
+
+def test_refresh_stores_stop_loss_and_minima_and_reports_run():
+    repo = FakeRepo(
+        {
+            "ABC": _make_weekly_df([5, 4, 3, 4, 3, 4, 5, 6, 5, 4, 5]),
+            "XYZ": _make_weekly_df([9, 8, 9, 10, 9, 8, 7, 8]),
+        }
+    )
+    store = InMemoryIndicatorStore()
+    ticks = iter(range(100, 200))
+
+    def fake_strategy(symbol, stock_data, periodicity, num_elements):
+        return {"stop_loss": 1.0, "stop_loss_date": None, "max_macd_date": None}
+
+    report = refresh_indicators(
+        repo,
+        store,
+        ["ABC", "XYZ", "BAD"],
+        strategy=fake_strategy,
+        stop_loss_params=[("MS", 10)],
+        minima_params=[("W", 1), ("W", 2)],
+        clock=lambda: float(next(ticks)),
+    )
+
+    stop_loss = store.get(IndicatorKey("ABC", "MS", num_elements=10))
+    assert stop_loss.value["stop_loss"] == 1.0
+    assert stop_loss.computed_at == 101.0
+    minima = store.get(IndicatorKey("XYZ", "W", window=1))
+    assert minima.value and all(row["symbol"] == "XYZ" for row in minima.value)
+    assert store.get(IndicatorKey("ABC", "W", window=2)) is not None
+    assert store.get(IndicatorKey("BAD", "MS", num_elements=10)) is None
+
+    assert report.symbols == 3
+    assert report.stored == 6
+    assert {error["symbol"] for error in report.errors} == {"BAD"}
+    assert report.duration_seconds == report.finished_at - report.started_at > 0
+    assert report.as_dict()["duration_seconds"] == report.duration_seconds
+
+
+def test_refresh_indexes_the_latest_minimum_of_each_symbol():
+    repo = FakeRepo({"ABC": _make_weekly_df([5, 4, 3, 4, 3, 4, 5, 6, 5, 4, 5])})
+    index = InMemoryLatestMinimaIndex()
+
+    def fake_strategy(symbol, stock_data, periodicity, num_elements):
+        return {"stop_loss": 1.0, "stop_loss_date": None, "max_macd_date": None}
+
+    refresh_indicators(
+        repo,
+        InMemoryIndicatorStore(),
+        ["ABC", "BAD"],
+        strategy=fake_strategy,
+        stop_loss_params=[],
+        minima_params=[("W", 1)],
+        clock=lambda: 50.0,
+        minima_index=index,
+    )
+
+    page = index.screen("W", 1, within=100)
+    assert [entry.symbol for entry in page.entries] == ["ABC"]
+    assert page.computed_at == 50.0
+    assert index.screen("W", 2, within=100) is None
+
+
+def test_refresh_resumes_macd_from_saved_checkpoints(monkeypatch):
+    values = [20 - i for i in range(10)] + [11 + i for i in range(15)]
+    repo = FakeRepo({"ABC": _make_weekly_df(values)})
+    states = InMemoryIndicatorStore()
+    store = InMemoryIndicatorStore()
+
+    def run(store):
+        refresh_indicators(
+            repo,
+            store,
+            ["ABC"],
+            strategy=None,
+            stop_loss_params=[],
+            minima_params=[("W", 1)],
+            macd_states=states,
+        )
+
+    run(store)
+    assert len(states.get(IndicatorKey("ABC", "W")).value["closes"]) == 24
+
+    seeds = []
+    seed = StreamingMacdCalculator.seed
+    monkeypatch.setattr(
+        StreamingMacdCalculator,
+        "seed",
+        lambda self, closes: seeds.append(len(closes)) or seed(self, closes),
+    )
+
+    # A new weekly bar: the checkpoint advances by one closed bar
+    repo._mapping["ABC"] = _make_weekly_df(values + [30, 28])
+    run(store)
+    fresh = InMemoryIndicatorStore()
+    refresh_indicators(
+        repo,
+        fresh,
+        ["ABC"],
+        strategy=None,
+        stop_loss_params=[],
+        minima_params=[("W", 1)],
+    )
+
+    assert len(states.get(IndicatorKey("ABC", "W")).value["closes"]) == 26
+    assert seeds == []
+    key = IndicatorKey("ABC", "W", window=1)
+    assert store.get(key).value == fresh.get(key).value
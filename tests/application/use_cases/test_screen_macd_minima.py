@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from app.application.use_cases.get_macd_minima import get_macd_minima
+from app.application.use_cases.screen_macd_minima import screen_macd_minima
+from app.infrastructure.adapters.in_memory_latest_minima_index import (
+    InMemoryLatestMinimaIndex,
+)
+from app.infrastructure.adapters.single_flight import SingleFlight
+
+
+class FakeRepo:
+    def __init__(self, mapping):
+        self._mapping = mapping
+        self.calls = []
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        self.calls.append(symbol)
+        if symbol not in self._mapping:
+            raise RuntimeError(f"no data for {symbol}")
+        return self._mapping[symbol]
+
+
+def _make_weekly_df(values: list[float]) -> pd.DataFrame:
+    n = len(values)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=n, freq="W"),
+            "open": values,
+            "high": [v + 1 for v in values],
+            "low": [v - 1 for v in values],
+            "close": values,
+            "volume": [1000] * n,
+        }
+    )
+
+
+FRAMES = {
+    # Ten bars down, fifteen up: the MACD bottoms 13 bars before the end
+    "ABC": _make_weekly_df([20 - i for i in range(10)] + [11 + i for i in range(15)]),
+    # Twenty bars down, four up: the MACD bottoms 3 bars before the end
+    "XYZ": _make_weekly_df([30 - i for i in range(20)] + [11 + i for i in range(4)]),
+    # Monotonic: no minimum at all
+    "UPP": _make_weekly_df([float(v) for v in range(1, 12)]),
+}
+
+
+def test_screen_indexes_the_universe_once_and_filters_by_age():
+    repo = FakeRepo(FRAMES)
+    index = InMemoryLatestMinimaIndex()
+    clock = iter([100.0, 101.0, 102.0]).__next__
+
+    page, errors = screen_macd_minima(
+        repo, index, ["ABC", "XYZ", "UPP", "BAD"], within=3, clock=clock
+    )
+
+    assert sorted(repo.calls) == ["ABC", "BAD", "UPP", "XYZ"]
+    assert [error["symbol"] for error in errors] == ["BAD"]
+    assert [entry.symbol for entry in page.entries] == ["XYZ"]
+    entry = page.entries[0]
+    assert entry.bars_since == 3
+    expected = get_macd_minima(FakeRepo(FRAMES), "XYZ", days=3650)[-1]
+    assert (entry.date, entry.macd, entry.price) == (
+        expected["date"],
+        expected["macd"],
+        expected["price"],
+    )
+    assert entry.last_bar_date == FRAMES["XYZ"]["date"].iloc[-1]
+
+    repo.calls.clear()
+    page, errors = screen_macd_minima(
+        repo, index, ["ABC", "XYZ", "UPP"], within=13, clock=clock
+    )
+    assert repo.calls == []
+    assert errors == []
+    assert [entry.symbol for entry in page.entries] == ["XYZ", "ABC"]
+    assert page.total == 2
+
+
+def test_stale_index_is_rebuilt():
+    repo = FakeRepo(FRAMES)
+    index = InMemoryLatestMinimaIndex()
+    screen_macd_minima(repo, index, ["ABC"], clock=lambda: 0.0)
+    repo.calls.clear()
+
+    page, _ = screen_macd_minima(
+        repo, index, ["ABC"], max_age_seconds=60, clock=lambda: 61.0
+    )
+
+    assert repo.calls == ["ABC"]
+    assert page.computed_at == 61.0
+
+
+def test_concurrent_cold_screens_share_one_rebuild():
+    release = threading.Event()
+
+    class SlowRepo(FakeRepo):
+        def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+            release.wait(5)
+            return super().get_stock_data(symbol, days)
+
+    repo = SlowRepo(FRAMES)
+    index = InMemoryLatestMinimaIndex()
+    flights = SingleFlight()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(
+                screen_macd_minima,
+                repo,
+                index,
+                ["ABC", "XYZ"],
+                within=13,
+                coalesce=flights.do,
+            )
+            for _ in range(2)
+        ]
+        deadline = time.monotonic() + 5
+        while flights.stats().calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        pages = [future.result()[0] for future in futures]
+
+    assert sorted(repo.calls) == ["ABC", "XYZ"]
+    assert flights.stats().shared == 1
+    assert [page.total for page in pages] == [2, 2]
+
+
+def test_screen_validates_paging_arguments():
+    index = InMemoryLatestMinimaIndex()
+    with pytest.raises(ValueError, match="within"):
+        screen_macd_minima(FakeRepo({}), index, ["ABC"], within=0)
+    with pytest.raises(ValueError, match="limit"):
+        screen_macd_minima(FakeRepo({}), index, ["ABC"], limit=0)
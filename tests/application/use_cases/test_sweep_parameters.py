@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.application.use_cases.get_macd_minima import macd_minima_frame
+from app.application.use_cases.sweep_parameters import (
+    MINIMA_COLUMNS,
+    STOP_LOSS_COLUMNS,
+    SweepGrid,
+    sweep_parameters,
+)
+from app.domain.services.stop_loss import get_stop_loss
+
+
+class FakeRepo:
+    def __init__(self, mapping):
+        self._mapping = mapping
+        self.calls = []
+
+    def get_stock_data(self, symbol: str, days: int) -> pd.DataFrame:
+        self.calls.append(symbol)
+        if symbol not in self._mapping:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return self._mapping[symbol]
+
+
+def _make_daily_df(seed: int, n: int = 800) -> pd.DataFrame:
+    # Newest first, as FMP returns it
+    rng = np.random.default_rng(seed)
+    close = 60 + np.cumsum(rng.normal(0, 1, size=n))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2019-01-01", periods=n, freq="B")[::-1],
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+
+
+def test_sweep_parameters_loads_each_symbol_once_and_matches_the_api():
+    frames = {"AAA": _make_daily_df(1), "BBB": _make_daily_df(2)}
+    repo = FakeRepo(frames)
+    grid = SweepGrid(periodicities=["W", "MS"], windows=[1, 2], num_elements=[5, 10])
+
+    report = sweep_parameters(repo, ["BBB", "ZZZ", "AAA", "BBB"], grid)
+
+    assert sorted(repo.calls) == ["AAA", "BBB", "ZZZ"]
+    assert report.requested == 3
+    assert report.errors[0]["symbol"] == "ZZZ"
+    assert list(report.stop_loss.columns) == list(STOP_LOSS_COLUMNS)
+    assert list(report.macd_minima.columns) == list(MINIMA_COLUMNS)
+    assert list(report.stop_loss["symbol"].unique()) == ["BBB", "AAA"]
+    assert len(report.stop_loss) == 2 * 2 * 2
+
+    stops = report.stop_loss.set_index(["symbol", "periodicity", "num_elements"])
+    minima = report.macd_minima
+    for symbol, df in frames.items():
+        for periodicity in ("W", "MS"):
+            for k in (5, 10):
+                expected = get_stop_loss(symbol, df, periodicity, k)
+                row = stops.loc[(symbol, periodicity, k)]
+                assert row["stop_loss"] == expected["stop_loss"]
+                assert row["stop_loss_date"] == expected["stop_loss_date"]
+                assert row["current_price"] == df.iloc[0].close
+            for window in (1, 2):
+                expected = macd_minima_frame(df, symbol, periodicity, window)
+                got = minima[
+                    (minima["symbol"] == symbol)
+                    & (minima["periodicity"] == periodicity)
+                    & (minima["window"] == window)
+                ]
+                np.testing.assert_array_equal(got["macd"], expected["macd"])
+                np.testing.assert_array_equal(got["date"], expected["date"])
+
+
+def test_sweep_parameters_with_no_results_returns_empty_tables():
+    report = sweep_parameters(FakeRepo({}), ["ZZZ"], SweepGrid())
+
+    assert report.stop_loss.empty
+    assert list(report.stop_loss.columns) == list(STOP_LOSS_COLUMNS)
+    assert report.macd_minima.empty
+    assert len(report.errors) == 1
+
+
+def test_sweep_grid_validates_values():
+    assert SweepGrid(["W", "W"], [2, 2], [5]).periodicities == ["W"]
+    with pytest.raises(ValueError, match="periodicities"):
+        SweepGrid(periodicities=[])
+    with pytest.raises(ValueError, match="num_elements"):
+        SweepGrid(num_elements=[0])
+    with pytest.raises(ValueError, match="max_concurrency"):
+        sweep_parameters(FakeRepo({}), ["AAA"], SweepGrid(), max_concurrency=0)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.fused_macd import (
+    FusedMacdCalculator,
+    fused_macd,
+    source_values,
+)
+
+
+def _closes(n: int, seed: int = 0) -> np.ndarray:
+    values = 100 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+    values[[0, 1, n // 3, n // 3 + 1]] = np.nan
+    return values
+
+
+def _pandas_lines(values, fast=12, slow=26, signal=9):
+    series = pd.Series(values)
+    macd = (
+        series.ewm(span=fast, adjust=False).mean()
+        - series.ewm(span=slow, adjust=False).mean()
+    )
+    sig = macd.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return macd.to_numpy(), sig.to_numpy(), (macd - sig).to_numpy()
+
+
+@pytest.mark.parametrize("n", [5, 120, 2600])
+def test_fused_macd_matches_pandas_bit_for_bit(n):
+    values = _closes(n)
+
+    lines = fused_macd(values)
+
+    for got, expected in zip(lines, _pandas_lines(values)):
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_fused_macd_with_custom_periods():
+    values = _closes(300)
+
+    lines = fused_macd(values, fast_period=5, slow_period=35, signal_period=5)
+
+    for got, expected in zip(lines, _pandas_lines(values, 5, 35, 5)):
+        np.testing.assert_array_equal(got, expected)
+
+
+def test_panel_columns_match_single_series():
+    panel = np.column_stack([_closes(200, seed) for seed in range(4)])
+
+    lines = fused_macd(panel)
+
+    for col in range(panel.shape[1]):
+        single = fused_macd(panel[:, col])
+        for got, expected in zip(lines, single):
+            np.testing.assert_array_equal(got[:, col], expected)
+
+
+def test_macd_only_and_preallocated_output():
+    values = _closes(150)
+    out = np.empty((1, 150))
+
+    lines = fused_macd(values, signal_period=None, out=out)
+
+    assert lines.signal is None and lines.histogram is None
+    assert np.shares_memory(lines.macd, out)
+    np.testing.assert_array_equal(lines.macd, _pandas_lines(values)[0])
+    with pytest.raises(ValueError, match="out must have shape"):
+        fused_macd(values, out=out)
+
+
+def test_float32_output():
+    values = _closes(150)
+
+    lines = fused_macd(values, dtype="float32")
+
+    assert lines.macd.dtype == np.float32
+    for got, expected in zip(lines, _pandas_lines(values)):
+        np.testing.assert_allclose(got, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        fused_macd(_closes(10), fast_period=26, slow_period=12)
+    with pytest.raises(ValueError):
+        fused_macd(_closes(10), dtype="float16")
+    with pytest.raises(ValueError):
+        fused_macd(_closes(10), signal_period=0)
+    with pytest.raises(ValueError):
+        FusedMacdCalculator(source="volume")
+
+
+def test_calculator_sources_and_get_macd():
+    n = 80
+    rng = np.random.default_rng(1)
+    close = 50 + np.cumsum(rng.normal(size=n))
+    df = pd.DataFrame(
+        {"open": close + 0.5, "high": close + 1, "low": close - 1, "close": close},
+        index=range(1, n + 1),
+    )
+
+    np.testing.assert_allclose(source_values(df, "hl2"), close)
+    np.testing.assert_allclose(source_values(df, "ohlc4"), close + 0.125)
+    pd.testing.assert_series_equal(
+        FusedMacdCalculator().get_macd(df), EmaMacdCalculator().get_macd(df)
+    )
+    lines = FusedMacdCalculator(source="high").lines(df)
+    np.testing.assert_array_equal(lines.macd, _pandas_lines(close + 1)[0])
@@ -1,6 +1,8 @@
 import math
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from app.domain.services.local_minima import find_local_minima
 
@@ -34,3 +36,35 @@ def test_find_local_minima_multiple_minima_in_order():
     s = pd.Series([5, 4, 3, 4, 3, 4, 5])
     idxs = find_local_minima(s, window=1)
     assert idxs == [2, 4]
+
+
+def _random_series(rng, n: int) -> pd.Series:
+    # Small integer alphabet produces plenty of ties/plateaus; sprinkle NaNs
+    values = rng.integers(0, 5, size=n).astype(float)
+    values[rng.random(n) < 0.15] = math.nan
+    # Occasionally force an explicit flat run
+    if n > 6:
+        start = int(rng.integers(0, n - 4))
+        values[start : start + int(rng.integers(2, 5))] = values[start]
+    return pd.Series(values)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_numpy_engine_matches_python_engine_on_random_series(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        s = _random_series(rng, int(rng.integers(0, 60)))
+        for window in range(0, 8):
+            expected = find_local_minima(s, window=window, engine="python")
+            assert find_local_minima(s, window=window, engine="numpy") == expected
+
+
+def test_find_local_minima_long_plateau_matches_reference():
+    s = pd.Series([9, 1, 1, 1, 1, 9, 9])
+    expected = find_local_minima(s, window=2, engine="python")
+    assert find_local_minima(s, window=2, engine="numpy") == expected
+
+
+def test_find_local_minima_unknown_engine():
+    with pytest.raises(ValueError):
+        find_local_minima(pd.Series([3, 2, 1, 2, 3]), engine="fortran")
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.fused_macd import fused_macd
+from app.domain.services.macd_minima import get_macd_minima_from_macd
+from app.domain.services.panel_macd import (
+    build_close_panel,
+    macd_panel,
+    panel_latest_minima,
+    panel_macd_minima,
+)
+from app.domain.services.resample import resample_ohlcv
+
+
+def _random_frame(seed: int, start: str, n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 50 + np.cumsum(rng.normal(0, 1, n))
+    # Business days leave weekend gaps, like FMP data; newest first like FMP
+    dates = pd.bdate_range(start, periods=n)
+    return pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000,
+        }
+    ).iloc[::-1]
+
+
+def test_panel_ema_matches_pandas_ewm_with_nans():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 1, (200, 6))
+    values[:15, 1] = np.nan
+    values[rng.random((200, 6)) < 0.1] = np.nan
+    values[120:, 3] = np.nan
+
+    frame = pd.DataFrame(values)
+    expected = (
+        frame.ewm(span=12, adjust=False).mean()
+        - frame.ewm(span=26, adjust=False).mean()
+    ).to_numpy()
+
+    np.testing.assert_array_equal(fused_macd(values, signal_period=None).macd, expected)
+
+
+@pytest.mark.parametrize("periodicity", ["D", "W", "MS"])
+def test_panel_matches_per_symbol_pipeline(periodicity):
+    frames = {
+        "AAA": _random_frame(1, "2015-01-01", 900),
+        "BBB": _random_frame(2, "2016-03-15", 500),
+        "CCC": _random_frame(3, "2015-06-01", 300),
+    }
+
+    panel = build_close_panel(frames, periodicity)
+    minima = panel_macd_minima(panel, macd_panel(panel), window=2)
+
+    assert panel.symbols == list(frames)
+    assert sum(len(rows) for rows in minima.values()) > 0
+    for symbol, df in frames.items():
+        resampled = resample_ohlcv(df, periodicity)
+        macd = EmaMacdCalculator().get_macd(resampled)
+        expected = get_macd_minima_from_macd(resampled, macd, window=2)
+
+        got = minima[symbol]
+        assert list(got["date"]) == list(expected["date"])
+        np.testing.assert_array_equal(got["price"], expected["price"])
+        np.testing.assert_array_equal(got["macd"], expected["macd"])
+
+
+def test_empty_frames_are_left_out_of_the_panel():
+    frames = {
+        "AAA": _random_frame(1, "2020-01-01", 50),
+        "EMPTY": pd.DataFrame(columns=["date", "close"]),
+    }
+
+    panel = build_close_panel(frames, "W")
+
+    assert panel.symbols == ["AAA"]
+    assert panel.closes.shape == (len(panel.dates), 1)
+
+
+@pytest.mark.parametrize("periodicity", ["W", "MS"])
+def test_latest_minima_are_the_last_per_symbol_minimum_with_its_age(periodicity):
+    frames = {
+        "AAA": _random_frame(1, "2015-01-01", 900),
+        "BBB": _random_frame(2, "2016-03-15", 500),
+        "CCC": _random_frame(4, "2015-06-01", 2),
+    }
+
+    panel = build_close_panel(frames, periodicity)
+    latest = panel_latest_minima(panel, panel_macd_minima(panel, macd_panel(panel)))
+
+    assert latest["CCC"] is None
+    for symbol in ("AAA", "BBB"):
+        resampled = resample_ohlcv(frames[symbol], periodicity)
+        macd = EmaMacdCalculator().get_macd(resampled)
+        expected = get_macd_minima_from_macd(resampled, macd).iloc[-1]
+        entry = latest[symbol]
+        position = resampled.index[resampled["date"] == expected["date"]][0]
+        assert entry.symbol == symbol
+        assert entry.date == expected["date"]
+        assert entry.macd == expected["macd"]
+        assert entry.price == expected["price"]
+        assert entry.bars_since == resampled.index[-1] - position >= 1
+        assert entry.last_bar_date == resampled["date"].iloc[-1]
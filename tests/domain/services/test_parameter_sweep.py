@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.macd_minima import get_macd_minima_from_macd
+from app.domain.services.parameter_sweep import (
+    minima_sweep,
+    stop_loss_sweep,
+    validate_grid,
+)
+from app.domain.services.resample import resample_ohlcv
+from app.domain.services.stop_loss import stop_loss_from_bars
+from app.domain.services.stop_loss_backtest import backtest_stops, stop_levels
+
+
+def _bars(periodicity: str = "W") -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 1200
+    close = 80 + np.cumsum(rng.normal(0, 1, size=n))
+    daily = pd.DataFrame(
+        {
+            "date": pd.date_range("2016-01-01", periods=n, freq="B"),
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+    return resample_ohlcv(daily, periodicity)
+
+
+@pytest.mark.parametrize("periodicity", ["W", "MS"])
+def test_stop_loss_sweep_matches_single_parameter_runs(periodicity):
+    bars = _bars(periodicity)
+    macd = EmaMacdCalculator().get_macd(bars)
+    num_elements = [1, 4, 10, 20]
+
+    columns = stop_loss_sweep(bars, macd, num_elements)
+
+    assert columns["num_elements"] == num_elements
+    for i, k in enumerate(num_elements):
+        expected = stop_loss_from_bars(bars, k)
+        assert columns["stop_loss"][i] == expected["stop_loss"]
+        assert columns["stop_loss_date"][i] == expected["stop_loss_date"]
+        assert columns["max_macd_date"][i] == expected["max_macd_date"]
+        result = backtest_stops(bars, stop_levels(bars, "macd", k))
+        assert columns["total_return"][i] == result.total_return
+        assert columns["stop_hits"][i] == result.stop_hits
+
+
+def test_stop_loss_sweep_rejects_empty_macd():
+    bars = _bars().iloc[:0]
+    with pytest.raises(ValueError, match="no values"):
+        stop_loss_sweep(bars, EmaMacdCalculator().get_macd(bars), [5])
+
+
+def test_minima_sweep_matches_single_window_runs():
+    bars = _bars()
+    macd = EmaMacdCalculator().get_macd(bars)
+
+    columns = minima_sweep(bars, macd, [1, 3])
+
+    for window in (1, 3):
+        expected = get_macd_minima_from_macd(bars, macd, window=window)
+        mask = columns["window"] == window
+        np.testing.assert_array_equal(columns["date"][mask], expected["date"])
+        np.testing.assert_array_equal(columns["macd"][mask], expected["macd"])
+        np.testing.assert_array_equal(columns["price"][mask], expected["price"])
+
+
+def test_validate_grid():
+    assert validate_grid("windows", [3, 1, 3]) == [3, 1]
+    with pytest.raises(ValueError, match="must not be empty"):
+        validate_grid("windows", [])
+    with pytest.raises(ValueError, match="positive integers"):
+        validate_grid("windows", [1, 0])
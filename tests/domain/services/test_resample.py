@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.resample import CachedResampler, resample_ohlcv
+
+LOGIC = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+def _make_fmp_daily_df(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    # Newest first with string dates and an unused column, as FMP returns it
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2019-01-01", periods=n, freq="B")[::-1]
+    values = 100 + rng.random(n) * 10
+    return pd.DataFrame(
+        {
+            "date": [d.strftime("%Y-%m-%d") for d in dates],
+            "open": values,
+            "high": values + 1,
+            "low": values - 1,
+            "close": values + 0.5,
+            "volume": rng.integers(1, 1000, n),
+            "vwap": values,
+        }
+    )
+
+
+def _legacy_resample(df: pd.DataFrame, periodicity: str) -> pd.DataFrame:
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    out = df.set_index("date")[list(LOGIC)].resample(periodicity).apply(LOGIC)
+    out["date"] = out.index
+    out.index = range(1, len(out) + 1)
+    return out
+
+
+@pytest.mark.parametrize("periodicity", ["D", "W", "MS", "M", "Q"])
+def test_resample_ohlcv_matches_legacy_apply(periodicity):
+    df = _make_fmp_daily_df()
+    pd.testing.assert_frame_equal(
+        resample_ohlcv(df, periodicity), _legacy_resample(df, periodicity)
+    )
+
+
+def test_cached_resampler_reuses_result_for_same_history():
+    df = _make_fmp_daily_df()
+    resampler = CachedResampler()
+
+    first = resampler.resample(df, "W", symbol="ABC")
+    first["close"] = 0.0
+    second = resampler.resample(df.copy(), "W", symbol="ABC")
+    resampler.resample(df, "MS", symbol="ABC")
+
+    pd.testing.assert_frame_equal(second, resample_ohlcv(df, "W"))
+    stats = resampler.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+
+def test_cached_resampler_misses_when_trailing_bar_changes():
+    df = _make_fmp_daily_df()
+    resampler = CachedResampler()
+    resampler.resample(df, "W", symbol="ABC")
+
+    revised = df.copy()
+    revised.loc[0, "close"] += 1.0
+    out = resampler.resample(revised, "W", symbol="ABC")
+
+    assert out["close"].iloc[-1] == revised.loc[0, "close"]
+    assert resampler.stats().misses == 2
+
+
+def test_cached_resampler_is_bounded_by_bytes():
+    df = _make_fmp_daily_df()
+    one_entry = int(resample_ohlcv(df, "W").memory_usage(index=True, deep=True).sum())
+    resampler = CachedResampler(max_bytes=one_entry * 2)
+
+    for symbol in ["A", "B", "C"]:
+        resampler.resample(df, "W", symbol=symbol)
+
+    stats = resampler.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 1
+    assert stats.bytes <= one_entry * 2
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.stop_loss import (
+    find_lowest,
+    get_stop_loss,
+    lower_than_previous,
+    lower_than_previous_grid,
+    previous_blocker_distance,
+)
+from app.infrastructure.financialmodelingprep import Financialmodelingprep
+
+
+def _legacy():
+    # Skip __init__: the policy itself needs no API key
+    return Financialmodelingprep.__new__(Financialmodelingprep)
+
+
+def _make_fmp_daily_df(seed: int, n: int = 900) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2016-01-01", periods=n, freq="B")[::-1]
+    close = 50 + np.cumsum(rng.normal(0, 1, size=n))
+    return pd.DataFrame(
+        {
+            "date": [d.strftime("%Y-%m-%d") for d in dates],
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "values,start,num_elements,expected_value",
+    [
+        ([1, 2, 3, 1], 3, 2, 1),
+        ([1, 2, 3, 5], 2, 4, 1),
+        ([5, 3, 2, 1], 2, 4, 2),
+    ],
+)
+def test_find_lowest_matches_legacy_fixtures(
+    values, start, num_elements, expected_value
+):
+    arr = np.array(values, dtype=float)
+    legacy_index = _legacy().findTheLowest(pd.Series(values), start, num_elements)
+
+    assert arr[find_lowest(arr, start, num_elements)] == expected_value
+    assert values[legacy_index] == expected_value
+
+
+@pytest.mark.parametrize("periodicity", ["D", "W", "MS"])
+@pytest.mark.parametrize("num_elements", [2, 5, 10, 20])
+def test_get_stop_loss_matches_legacy_policy(periodicity, num_elements):
+    for seed in range(8):
+        df = _make_fmp_daily_df(seed)
+        try:
+            expected = _legacy().get_stop_loss(
+                "SYM", df.copy(), False, periodicity, num_elements
+            )
+        except KeyError:
+            # The legacy scan fails when it walks past the first bar
+            continue
+
+        actual = get_stop_loss("SYM", df.copy(), periodicity, num_elements)
+
+        assert actual == expected
+
+
+def test_get_stop_loss_handles_single_bar_history():
+    df = _make_fmp_daily_df(0, n=3)
+    out = get_stop_loss("SYM", df, "MS", 10)
+    assert out["stop_loss"] == df["low"].min()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_lower_than_previous_grid_matches_each_num_elements(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 8, size=150).astype(float)
+    values[rng.integers(0, 150, size=12)] = np.nan
+    num_elements = [1, 2, 3, 5, 8, 20, 200]
+
+    grid = lower_than_previous_grid(values, num_elements)
+
+    for row, k in zip(grid, num_elements):
+        np.testing.assert_array_equal(row, lower_than_previous(values, k))
+
+
+def test_previous_blocker_distance():
+    values = np.array([3.0, 5.0, np.nan, 4.0, 5.0, 1.0])
+
+    distance = previous_blocker_distance(values)
+
+    np.testing.assert_array_equal(distance, [np.inf, 1, 1, 3, 1, np.inf])
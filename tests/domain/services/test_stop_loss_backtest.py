@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.resample import resample_ohlcv
+from app.domain.services.stop_loss import find_stop_loss_anchors, stop_loss_from_bars
+from app.domain.services.stop_loss_backtest import (
+    backtest_stops,
+    macd_stop_position_grid,
+    macd_stop_positions,
+    stop_levels,
+)
+from app.domain.services.stop_loss_strategies import STOP_LOSS_STRATEGIES
+
+
+def _make_bars(seed: int = 5, n: int = 160) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 2, size=n))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2015-01-04", periods=n, freq="W"),
+            "open": close + rng.normal(0, 0.5, size=n),
+            "high": close + rng.random(n),
+            "low": close - rng.random(n) * 2,
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+
+
+def _bars(rows) -> pd.DataFrame:
+    # rows of (open, low, close); high is never used by the simulation
+    open_, low, close = (np.array(column, dtype=float) for column in zip(*rows))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=len(rows), freq="W"),
+            "open": open_,
+            "high": np.maximum(open_, close),
+            "low": low,
+            "close": close,
+        }
+    )
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("num_elements", [1, 3, 10])
+def test_macd_stop_positions_match_per_as_of_search(seed, num_elements):
+    bars = _make_bars(seed, n=120)
+    low = bars["low"].to_numpy()
+    if seed % 2:
+        low[[3, 40, 41]] = np.nan
+        bars["close"] = bars["close"].round()
+    macd = EmaMacdCalculator().get_macd(bars).to_numpy()
+
+    positions = macd_stop_positions(macd, low, num_elements)
+
+    expected = [
+        find_stop_loss_anchors(macd[: t + 1], low[: t + 1], num_elements)[1]
+        for t in range(len(macd))
+    ]
+    np.testing.assert_array_equal(positions, expected)
+
+
+def test_macd_stop_position_grid_matches_each_num_elements():
+    bars = _make_bars(n=200)
+    low = bars["low"].to_numpy()
+    macd = EmaMacdCalculator().get_macd(bars).to_numpy()
+
+    grid = macd_stop_position_grid(macd, low, [2, 10, 30])
+
+    for row, k in zip(grid, [2, 10, 30]):
+        np.testing.assert_array_equal(row, macd_stop_positions(macd, low, k))
+
+
+def test_macd_stop_positions_are_undefined_before_the_first_macd():
+    macd = np.array([np.nan, np.nan, 1.0, 2.0])
+    low = np.array([5.0, 4.0, 3.0, 6.0])
+
+    assert list(macd_stop_positions(macd, low, 3)) == [-1, -1, 2, 2]
+    assert len(macd_stop_positions(np.array([]), np.array([]), 3)) == 0
+
+
+def test_macd_stop_levels_end_at_the_current_stop_loss():
+    bars = _make_bars()
+
+    levels = stop_levels(bars, "macd", 10)
+
+    assert levels[-1] == stop_loss_from_bars(bars, 10)["stop_loss"]
+    for t in (30, 90):
+        assert levels[t] == stop_loss_from_bars(bars.iloc[: t + 1], 10)["stop_loss"]
+
+
+@pytest.mark.parametrize("strategy", STOP_LOSS_STRATEGIES)
+def test_stop_levels_are_causal(strategy):
+    bars = _make_bars(n=100)
+
+    levels = stop_levels(bars, strategy, 10)
+    truncated = stop_levels(bars.iloc[:60], strategy, 10)
+
+    np.testing.assert_array_equal(levels[:60], truncated)
+
+
+def test_stop_levels_rejects_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown stop-loss strategy"):
+        stop_levels(_make_bars(), "moon", 10)
+
+
+def test_backtest_exits_at_the_stop_and_reenters_on_a_new_stop():
+    bars = _bars(
+        [
+            (10, 9, 10),  # enter at 10, stop 8
+            (10, 9, 11),
+            (11, 7, 8),  # stop hit, filled at 8
+            (8, 6, 7),
+            (7, 6, 9),  # new stop 8.5, close above: re-enter at 9
+            (9, 8.7, 9.9),
+        ]
+    )
+    levels = np.array([8, 8, 8, 8, 8.5, 8.5])
+
+    result = backtest_stops(bars, levels)
+
+    assert result.stop_hits == 1
+    hit = result.hits[0]
+    assert (hit.date, hit.stop_loss, hit.fill_price) == (bars["date"][2], 8, 8)
+    assert hit.reentry_date == bars["date"][4]
+    assert hit.further_decline == pytest.approx(1 - 6 / 8)
+    assert result.bars_in_position == 2
+    assert result.time_in_position == pytest.approx(2 / 5)
+    assert result.total_return == pytest.approx(0.8 * 9.9 / 9 - 1)
+    assert result.buy_hold_return == pytest.approx(-0.01)
+    assert result.buy_hold_max_drawdown == pytest.approx(1 - 7 / 11)
+    assert result.max_drawdown == pytest.approx(1 - 8 / 11)
+    assert result.drawdown_avoided == pytest.approx(1 / 11)
+
+
+def test_backtest_fills_at_the_open_when_a_bar_gaps_through_the_stop():
+    bars = _bars([(10, 9, 10), (6, 5, 6), (6, 5, 6)])
+
+    result = backtest_stops(bars, np.array([8.0, 8.0, 8.0]))
+
+    assert result.hits[0].fill_price == 6
+    assert result.hits[0].reentry_date is None
+    assert result.total_return == pytest.approx(-0.4)
+    assert result.time_in_position == 0
+
+
+def test_backtest_without_a_stop_never_enters():
+    bars = _bars([(10, 9, 10), (10, 9, 11)])
+
+    result = backtest_stops(bars, np.array([np.nan, 12.0]))
+
+    assert result.bars == 2
+    assert result.stop_hits == 0
+    assert result.total_return == 0.0
+    assert result.first_date == bars["date"][0]
+
+
+def test_backtest_on_resampled_history_reports_consistent_summary():
+    daily = _make_bars(n=900)
+    daily["date"] = pd.date_range("2015-01-01", periods=900, freq="B")
+    bars = resample_ohlcv(daily, "W")
+
+    result = backtest_stops(bars, stop_levels(bars, "macd", 10))
+
+    assert result.stop_hits == len(result.hits)
+    assert 0 <= result.time_in_position <= 1
+    assert 0 <= result.max_drawdown <= 1
+    assert result.drawdown_avoided == pytest.approx(
+        result.buy_hold_max_drawdown - result.max_drawdown
+    )
+    assert all(hit.fill_price <= hit.stop_loss for hit in result.hits)
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services import resample as resample_module
+from app.domain.services.resample import resample_ohlcv
+from app.domain.services.stop_loss import get_stop_loss
+from app.domain.services.stop_loss_strategies import (
+    ATR_MULTIPLIER,
+    STOP_LOSS_STRATEGIES,
+    TRAILING_PERCENT,
+    InsufficientHistoryError,
+    average_true_range,
+    evaluate_stop_loss_strategies,
+    trailing_max,
+    trailing_min,
+    trailing_stop_from_bars,
+    trailing_stop_strategy,
+    validate_strategy,
+)
+
+
+def _make_daily_df(seed: int = 3, n: int = 600) -> pd.DataFrame:
+    # Newest first, as FMP returns it
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2018-01-01", periods=n, freq="B")[::-1]
+    close = 80 + np.cumsum(rng.normal(0, 1, size=n))
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 1000, n),
+        }
+    )
+
+
+@pytest.mark.parametrize("lookback", [1, 2, 5, 30])
+def test_trailing_extremes_match_rolling_windows(lookback):
+    values = np.random.default_rng(lookback).normal(size=200)
+    values[[7, 8, 50]] = np.nan
+
+    series = pd.Series(values)
+    expected_max = series.rolling(lookback, min_periods=1).max().to_numpy()
+    expected_min = series.rolling(lookback, min_periods=1).min().to_numpy()
+
+    np.testing.assert_allclose(trailing_max(values, lookback), expected_max)
+    np.testing.assert_allclose(trailing_min(values, lookback), expected_min)
+
+
+def test_average_true_range_matches_reference_loop():
+    bars = resample_ohlcv(_make_daily_df(), "W")
+    high, low, close = (bars[c].to_numpy(dtype=float) for c in ("high", "low", "close"))
+
+    expected = []
+    for i in range(len(close)):
+        tr = high[i] - low[i]
+        if i:
+            tr = max(tr, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        expected.append(tr if i == 0 else expected[-1] + (tr - expected[-1]) / 14)
+
+    np.testing.assert_allclose(average_true_range(high, low, close), expected)
+
+
+def test_trailing_stops_at_last_bar_match_definitions():
+    bars = resample_ohlcv(_make_daily_df(), "W")
+    lookback = 10
+    tail = bars.iloc[-lookback:]
+    high, low, close = (bars[c].to_numpy(dtype=float) for c in ("high", "low", "close"))
+    atr = average_true_range(high, low, close)
+
+    donchian = trailing_stop_from_bars("donchian", bars, lookback)
+    assert donchian["stop_loss"] == tail["low"].min()
+    assert donchian["stop_loss_date"] == tail["date"].loc[tail["low"].idxmin()]
+    assert donchian["max_macd_date"] is None
+
+    percent = trailing_stop_from_bars("percent", bars, lookback)
+    assert percent["stop_loss"] == pytest.approx(
+        tail["close"].max() * (1 - TRAILING_PERCENT)
+    )
+
+    chandelier = trailing_stop_from_bars("chandelier", bars, lookback)
+    assert chandelier["stop_loss"] == pytest.approx(
+        tail["high"].max() - ATR_MULTIPLIER * atr[-1]
+    )
+    assert chandelier["stop_loss_date"] == tail["date"].loc[tail["high"].idxmax()]
+
+    atr_stop = trailing_stop_from_bars("atr", bars, lookback)
+    anchors = close - ATR_MULTIPLIER * atr
+    assert atr_stop["stop_loss"] == pytest.approx(anchors[-lookback:].max())
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown stop-loss strategy"):
+        validate_strategy("magic")
+    with pytest.raises(ValueError):
+        trailing_stop_strategy("magic")
+
+
+def test_trailing_stop_strategy_matches_use_case_signature():
+    import pickle
+
+    df = _make_daily_df()
+    strategy = pickle.loads(pickle.dumps(trailing_stop_strategy("donchian")))
+
+    row = strategy("ABC", df, "W", 10)
+
+    assert row["symbol"] == "ABC"
+    assert row["current_price"] == df.iloc[0].close
+    assert row["period"] == "W"
+    bars = resample_ohlcv(df, "W")
+    assert row["stop_loss"] == bars["low"].iloc[-10:].min()
+
+
+def test_evaluate_strategies_resamples_once(monkeypatch):
+    calls = []
+
+    class CountingResampler:
+        def resample(self, df, periodicity, symbol=None):
+            calls.append((symbol, periodicity))
+            return resample_ohlcv(df, periodicity)
+
+    monkeypatch.setattr(resample_module, "_default_resampler", CountingResampler())
+    df = _make_daily_df()
+
+    results = evaluate_stop_loss_strategies("ABC", df, "W", 10, STOP_LOSS_STRATEGIES)
+
+    assert calls == [("ABC", "W")]
+    assert len(results) == len(STOP_LOSS_STRATEGIES)
+    macd = get_stop_loss("ABC", df, "W", 10)
+    assert results[0]["stop_loss"] == macd["stop_loss"]
+    assert results[0]["max_macd_date"] == macd["max_macd_date"]
+    for name, result in zip(STOP_LOSS_STRATEGIES[1:], results[1:]):
+        assert result == trailing_stop_from_bars(name, resample_ohlcv(df, "W"), 10)
+
+
+def test_evaluate_strategies_calls_macd_override_on_raw_history():
+    df = _make_daily_df()
+    seen = []
+
+    def legacy(symbol, stock_data, periodicity, num_elements):
+        seen.append(stock_data)
+        return {"stop_loss": 1.0, "stop_loss_date": None, "max_macd_date": None}
+
+    results = evaluate_stop_loss_strategies(
+        "ABC", df, "W", 10, ["donchian", "macd"], macd_strategy=legacy
+    )
+
+    assert seen == [df]
+    assert results[1]["stop_loss"] == 1.0
+    assert results[0]["max_macd_date"] is None
+
+
+def test_trailing_stop_without_bars_is_insufficient_history():
+    bars = resample_ohlcv(_make_daily_df(n=5), "W").iloc[:0]
+
+    with pytest.raises(InsufficientHistoryError, match="Not enough bars"):
+        trailing_stop_from_bars("atr", bars, 20)
@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.ema_macd_calculator import EmaMacdCalculator
+from app.domain.services.streaming_macd import StreamingMacdCalculator, resume_macd
+
+
+def _closes(seed: int, n: int, with_nans: bool = False) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    values = 100 + np.cumsum(rng.normal(0, 1, size=n))
+    # Repeated prices exercise pandas' equal-value shortcut
+    values[rng.random(n) < 0.1] = values[0]
+    if with_nans:
+        values[rng.random(n) < 0.1] = math.nan
+    return pd.Series(values)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("with_nans", [False, True])
+def test_seed_matches_batch_macd_exactly(seed, with_nans):
+    closes = _closes(seed, 300, with_nans)
+    df = pd.DataFrame({"close": closes})
+
+    expected = EmaMacdCalculator().get_macd(df)
+    actual = StreamingMacdCalculator().get_macd(df)
+
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+
+
+def test_update_after_seed_matches_batch_on_extended_history():
+    closes = _closes(7, 200)
+    calc = StreamingMacdCalculator(fast_period=5, slow_period=13)
+    calc.seed(closes.iloc[:150])
+
+    streamed = [calc.update(v) for v in closes.iloc[150:]]
+    batch = EmaMacdCalculator(5, 13).get_macd(pd.DataFrame({"close": closes}))
+
+    assert streamed == batch.iloc[150:].tolist()
+
+
+def test_state_round_trip_and_peek_do_not_drift():
+    closes = _closes(3, 120)
+    calc = StreamingMacdCalculator()
+    calc.seed(closes.iloc[:100])
+
+    restored = StreamingMacdCalculator.from_dict(calc.to_dict())
+    tentative = restored.peek(closes.iloc[100] + 5)
+    committed = restored.update(closes.iloc[100])
+
+    assert tentative != committed
+    assert committed == calc.update(closes.iloc[100])
+    assert restored.state == calc.state
+    assert restored.state.bars == 101
+
+
+def test_seed_state_continues_exactly_after_trailing_nans():
+    closes = _closes(11, 160, with_nans=True)
+    closes.iloc[117:120] = math.nan
+    calc = StreamingMacdCalculator()
+    calc.seed(closes.iloc[:120])
+
+    streamed = [calc.update(v) for v in closes.iloc[120:]]
+    batch = EmaMacdCalculator().get_macd(pd.DataFrame({"close": closes}))
+
+    np.testing.assert_array_equal(streamed, batch.iloc[120:].to_numpy())
+
+
+def test_resume_steps_only_new_bars_and_matches_batch():
+    closes = _closes(5, 140, with_nans=True).to_numpy()
+    first, saved, reused = resume_macd(closes[:100])
+    assert not reused
+    assert len(saved["closes"]) == 99
+
+    # Two bars closed since, and the forming bar moved
+    forming = closes[:103].copy()
+    forming[-1] += 3.0
+    macd, saved, reused = resume_macd(forming, saved)
+
+    assert reused
+    batch = EmaMacdCalculator().get_macd(pd.DataFrame({"close": forming}))
+    np.testing.assert_array_equal(macd, batch.to_numpy())
+    np.testing.assert_array_equal(macd[:99], first[:99])
+
+
+def test_resume_reseeds_when_history_no_longer_extends_the_checkpoint():
+    closes = _closes(6, 120).to_numpy()
+    _, saved, _ = resume_macd(closes[:100])
+
+    # The window slid: the oldest bars dropped off
+    macd, _, reused = resume_macd(closes[5:110], saved)
+
+    assert not reused
+    batch = EmaMacdCalculator().get_macd(pd.DataFrame({"close": closes[5:110]}))
+    np.testing.assert_array_equal(macd, batch.to_numpy())
+    _, _, reused = resume_macd(closes[:110], saved, fast_period=5, slow_period=13)
+    assert not reused
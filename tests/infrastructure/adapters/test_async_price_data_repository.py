@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.adapters.async_price_data_repository import (
+    ExecutorAsyncPriceDataRepository,
+)
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.infrastructure.http_session import build_session
+
+PAYLOAD = {
+    "symbol": "ABC",
+    "historical": [
+        {
+            "date": "2020-01-02",
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.5,
+            "volume": 1000,
+        },
+        {
+            "date": "2020-01-01",
+            "open": 9.0,
+            "high": 10.0,
+            "low": 8.0,
+            "close": 9.5,
+            "volume": 900,
+        },
+    ],
+}
+
+
+@pytest.fixture
+def stub_server():
+    """Local FMP stand-in that records client connections and delays replies."""
+    connections = set()
+    state = {"delay": 0.0, "requests": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                connections.add(self.client_address)
+                state["requests"] += 1
+            time.sleep(state["delay"])
+            body = json.dumps(PAYLOAD).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/historical-price-full"
+    try:
+        yield base_url, connections, state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pooled_session_reuses_keep_alive_connection(stub_server):
+    base_url, connections, state = stub_server
+    repo = FmpPriceDataRepository(
+        api_key="dummy", session=build_session(pool_size=2), base_url=base_url
+    )
+    try:
+        for _ in range(5):
+            df = repo.get_stock_data("ABC", days=2)
+    finally:
+        repo.close()
+
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 2
+    assert state["requests"] == 5
+    assert len(connections) == 1
+
+
+def test_async_repository_overlaps_slow_upstream_calls(stub_server):
+    base_url, connections, state = stub_server
+    state["delay"] = 0.2
+    fmp = FmpPriceDataRepository(
+        api_key="dummy", session=build_session(pool_size=8), base_url=base_url
+    )
+    repo = ExecutorAsyncPriceDataRepository(fmp, max_workers=8)
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(repo.get_stock_data("ABC", days=2) for _ in range(8))
+        )
+
+    # A private loop keeps the global event loop policy untouched for TestClient
+    loop = asyncio.new_event_loop()
+    try:
+        started = time.perf_counter()
+        frames = loop.run_until_complete(fetch_all())
+        elapsed = time.perf_counter() - started
+    finally:
+        loop.close()
+        repo.close()
+        fmp.close()
+
+    assert len(frames) == 8
+    assert all(len(df) == 2 for df in frames)
+    # Sequential calls would take ~1.6s
+    assert elapsed < 1.0
+
+
+def test_build_session_rejects_non_positive_pool():
+    with pytest.raises(ValueError):
+        build_session(pool_size=0)
@@ -0,0 +1,254 @@
+import pandas as pd
+
+from app.domain.repositories import RangePriceDataRepository
+from app.infrastructure.adapters.cached_price_data_repository import (
+    CachedPriceDataRepository,
+    FreshnessPolicy,
+)
+from app.interface.deps import build_price_cache
+from app.interface.settings import AppSettings
+
+DAY = 86400.0
+
+
+def _make_fmp_df(start: str, periods: int, base: float = 10.0) -> pd.DataFrame:
+    # FMP returns newest bars first with ISO date strings
+    dates = pd.date_range(start, periods=periods, freq="D")[::-1]
+    values = [base + i for i in range(periods)][::-1]
+    return pd.DataFrame(
+        {
+            "date": [d.strftime("%Y-%m-%d") for d in dates],
+            "open": values,
+            "high": [v + 1 for v in values],
+            "low": [v - 1 for v in values],
+            "close": values,
+            "volume": [1000] * periods,
+        }
+    )
+
+
+class RecordingRepo:
+    def __init__(self, frame):
+        self.frame = frame
+        self.calls = []
+
+    def get_stock_data(self, symbol, days):
+        self.calls.append((symbol, days))
+        return self.frame.head(days)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_hit_skips_inner_and_returns_copy():
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    repo = CachedPriceDataRepository(inner, clock=Clock(0.0))
+
+    first = repo.get_stock_data("ABC", 5)
+    first["close"] = -1.0
+    second = repo.get_stock_data("ABC", 5)
+
+    assert inner.calls == [("ABC", 5)]
+    assert (second["close"] > 0).all()
+    assert pd.api.types.is_datetime64_any_dtype(second["date"])
+    stats = repo.stats()
+    assert stats.misses == 1
+    assert stats.memory_hits == 1
+
+
+def test_lru_evicts_least_recently_used():
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    repo = CachedPriceDataRepository(inner, max_entries=2, clock=Clock(0.0))
+
+    repo.get_stock_data("A", 5)
+    repo.get_stock_data("B", 5)
+    repo.get_stock_data("A", 5)
+    repo.get_stock_data("C", 5)  # evicts B
+    repo.get_stock_data("B", 5)
+
+    assert [c[0] for c in inner.calls] == ["A", "B", "C", "B"]
+    assert repo.stats().evictions == 2
+    assert repo.stats().memory_entries == 2
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "prices.sqlite")
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    clock = Clock(0.0)
+    worker_a = CachedPriceDataRepository(inner, disk_path=path, clock=clock)
+    worker_b = CachedPriceDataRepository(inner, disk_path=path, clock=clock)
+    try:
+        a = worker_a.get_stock_data("ABC", 10)
+        b = worker_b.get_stock_data("ABC", 10)
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+    assert inner.calls == [("ABC", 10)]
+    pd.testing.assert_frame_equal(a, b)
+    assert worker_b.stats().disk_hits == 1
+
+
+def test_memory_ttl_falls_back_to_disk(tmp_path):
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    clock = Clock(0.0)
+    repo = CachedPriceDataRepository(
+        inner,
+        ttl_seconds=10,
+        disk_path=str(tmp_path / "prices.sqlite"),
+        freshness=FreshnessPolicy(trailing_ttl_seconds=DAY),
+        clock=clock,
+    )
+    repo.get_stock_data("ABC", 10)
+    clock.now = 60.0
+    repo.get_stock_data("ABC", 10)
+    repo.close()
+
+    assert len(inner.calls) == 1
+    stats = repo.stats()
+    assert stats.disk_hits == 1
+    assert stats.evictions == 1
+
+
+def test_stale_entry_refreshes_only_trailing_bars():
+    # History up to 2020-01-10; two more days pass before the next request
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    start = pd.Timestamp("2020-01-10 18:00").timestamp()
+    clock = Clock(start)
+    repo = CachedPriceDataRepository(
+        inner,
+        ttl_seconds=10 * DAY,
+        freshness=FreshnessPolicy(trailing_ttl_seconds=60),
+        clock=clock,
+    )
+    repo.get_stock_data("ABC", 10)
+
+    inner.frame = _make_fmp_df("2020-01-01", 12)
+    inner.frame.loc[inner.frame["date"] == "2020-01-10", "close"] = 99.0
+    clock.now = start + 2 * DAY
+    df = repo.get_stock_data("ABC", 10)
+
+    assert inner.calls == [("ABC", 10), ("ABC", 3)]
+    assert len(df) == 10
+    assert df["date"].iloc[0] == pd.Timestamp("2020-01-12")
+    assert df["date"].is_monotonic_decreasing
+    assert df.loc[df["date"] == pd.Timestamp("2020-01-10"), "close"].item() == 99.0
+    assert repo.stats().refreshes == 1
+
+
+def test_memory_only_stale_entry_is_topped_up_not_refetched():
+    # No disk tier and default TTLs: the entry must outlive its freshness
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    start = pd.Timestamp("2020-01-10 18:00").timestamp()
+    clock = Clock(start)
+    repo = CachedPriceDataRepository(inner, clock=clock)
+    repo.get_stock_data("ABC", 10)
+
+    inner.frame = _make_fmp_df("2020-01-01", 11)
+    clock.now = start + DAY
+    df = repo.get_stock_data("ABC", 10)
+
+    assert inner.calls == [("ABC", 10), ("ABC", 2)]
+    assert df["date"].iloc[0] == pd.Timestamp("2020-01-11")
+    stats = repo.stats()
+    assert stats.refreshes == 1
+    assert stats.evictions == 0
+
+
+class RangeRepo(RecordingRepo):
+    def get_stock_data_range(self, symbol, start, end=None):
+        self.calls.append((symbol, "range", start.isoformat()))
+        dates = pd.to_datetime(self.frame["date"])
+        return self.frame[dates >= pd.Timestamp(start)]
+
+
+# Registering keeps the stub free of the ABC plumbing while passing isinstance
+RangePriceDataRepository.register(RangeRepo)
+
+
+def test_smaller_days_are_sliced_from_stored_history():
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    repo = CachedPriceDataRepository(inner, clock=Clock(0.0))
+
+    full = repo.get_stock_data("ABC", 10)
+    recent = repo.get_stock_data("ABC", 4)
+
+    assert inner.calls == [("ABC", 10)]
+    pd.testing.assert_frame_equal(recent, full.head(4))
+
+
+def test_larger_days_refetch_and_keep_serving_smaller_windows():
+    inner = RecordingRepo(_make_fmp_df("2020-01-01", 10))
+    repo = CachedPriceDataRepository(inner, clock=Clock(0.0))
+
+    repo.get_stock_data("ABC", 4)
+    wide = repo.get_stock_data("ABC", 8)
+    narrow = repo.get_stock_data("ABC", 6)
+
+    assert inner.calls == [("ABC", 4), ("ABC", 8)]
+    assert len(wide) == 8
+    pd.testing.assert_frame_equal(narrow, wide.head(6))
+
+
+def test_stale_entry_requests_only_missing_date_range():
+    inner = RangeRepo(_make_fmp_df("2020-01-01", 10))
+    start = pd.Timestamp("2020-01-10 18:00").timestamp()
+    clock = Clock(start)
+    repo = CachedPriceDataRepository(
+        inner,
+        ttl_seconds=10 * DAY,
+        freshness=FreshnessPolicy(trailing_ttl_seconds=60),
+        clock=clock,
+    )
+    repo.get_stock_data("ABC", 10)
+
+    inner.frame = _make_fmp_df("2020-01-01", 12)
+    clock.now = start + 2 * DAY
+    df = repo.get_stock_data("ABC", 12)
+    recent = repo.get_stock_data("ABC", 5)
+
+    assert inner.calls == [("ABC", 10), ("ABC", 12)]
+    assert df["date"].iloc[0] == pd.Timestamp("2020-01-12")
+
+    inner.frame = _make_fmp_df("2020-01-01", 13)
+    clock.now = start + 3 * DAY
+    refreshed = repo.get_stock_data("ABC", 5)
+
+    assert inner.calls[-1] == ("ABC", "range", "2020-01-12")
+    assert refreshed["date"].iloc[0] == pd.Timestamp("2020-01-13")
+    assert refreshed["date"].is_unique
+    assert len(recent) == 5
+
+
+def test_ascending_inner_order_is_preserved():
+    frame = _make_fmp_df("2020-01-01", 6).iloc[::-1].reset_index(drop=True)
+    inner = RecordingRepo(frame)
+    repo = CachedPriceDataRepository(inner, clock=Clock(0.0))
+
+    repo.get_stock_data("ABC", 6)
+    df = repo.get_stock_data("ABC", 3)
+
+    assert df["date"].is_monotonic_increasing
+    assert df["date"].iloc[-1] == pd.Timestamp("2020-01-06")
+
+
+def test_default_settings_refresh_stale_entry_with_a_range_fetch():
+    inner = RangeRepo(_make_fmp_df("2020-01-01", 10))
+    start = pd.Timestamp("2020-01-10 18:00").timestamp()
+    clock = Clock(start)
+    settings = AppSettings(FINANCIALMODELINGPREP_API_KEY="dummy")
+    repo = build_price_cache(inner, settings, clock=clock)
+    repo.get_stock_data("ABC", 10)
+
+    inner.frame = _make_fmp_df("2020-01-01", 11)
+    clock.now = start + settings.PRICE_CACHE_TRAILING_TTL_SECONDS + 1
+    df = repo.get_stock_data("ABC", 10)
+
+    assert inner.calls == [("ABC", 10), ("ABC", "range", "2020-01-10")]
+    assert df["date"].iloc[0] == pd.Timestamp("2020-01-11")
+    assert repo.stats().refreshes == 1
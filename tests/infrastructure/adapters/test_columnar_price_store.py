@@ -0,0 +1,129 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.infrastructure.adapters.columnar_price_store import (
+    CURRENT_NAME,
+    KEEP_VERSIONS,
+    MANIFEST_NAME,
+    ColumnarPriceDataRepository,
+    ColumnarPriceStore,
+)
+
+
+def _bars(n=10):
+    dates = pd.date_range("2021-01-01", periods=n, freq="D")
+    df = pd.DataFrame(
+        {
+            "date": dates,
+            "open": np.arange(n, dtype=float),
+            "high": np.arange(n, dtype=float) + 1,
+            "low": np.arange(n, dtype=float) - 1,
+            "close": np.arange(n, dtype=float) + 0.5,
+            "volume": np.arange(n, dtype=np.int64) * 100,
+        }
+    )
+    # FMP order: newest first
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def test_write_then_read_round_trips_oldest_first(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    entry = store.write("AAPL", _bars())
+
+    df = store.read("AAPL")
+    assert entry["rows"] == 10
+    assert entry["first_date"].startswith("2021-01-01")
+    assert df["date"].is_monotonic_increasing
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["volume"].dtype == np.int64
+    assert list(df["close"]) == [i + 0.5 for i in range(10)]
+    assert store.read("MSFT") is None
+
+
+def test_rewrite_replaces_partition(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    store.write("AAPL", _bars(10))
+    store.write("AAPL", _bars(4))
+
+    assert len(store.read("AAPL")) == 4
+    assert store.manifest()["symbols"]["AAPL"]["rows"] == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == [MANIFEST_NAME, "symbol=AAPL"]
+
+
+def test_rewrite_publishes_a_new_version_without_disturbing_readers(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    store.write("AAPL", _bars(10))
+    before = store.read_columns("AAPL")
+
+    for n in (6, 5, 4):
+        store.write("AAPL", _bars(n))
+
+    # A reader holding the old version keeps consistent columns of one length
+    assert {len(values) for values in before.values()} == {10}
+    part = store.partition("AAPL")
+    versions = [p for p in part.iterdir() if p.is_dir()]
+    assert len(versions) == KEEP_VERSIONS
+    assert (part / CURRENT_NAME).read_text() in {p.name for p in versions}
+    assert len(ColumnarPriceDataRepository(tmp_path).get_stock_data("AAPL", 100)) == 4
+
+
+def test_unversioned_partition_is_still_read(tmp_path):
+    part = ColumnarPriceStore(tmp_path).partition("AAPL")
+    part.mkdir()
+    frame = _bars(3).iloc[::-1]
+    for column in frame.columns:
+        np.save(part / f"{column}.npy", frame[column].to_numpy())
+    store = ColumnarPriceStore(tmp_path)
+
+    assert list(store.read("AAPL")["close"]) == [0.5, 1.5, 2.5]
+    store.write("AAPL", _bars(2))
+    assert len(store.read("AAPL")) == 2
+    assert not list(part.glob("*.npy"))
+
+
+def test_repository_returns_newest_days_newest_first(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    store.write("AAPL", _bars(10))
+    repo = ColumnarPriceDataRepository(tmp_path)
+
+    df = repo.get_stock_data("AAPL", 3)
+
+    assert list(df["date"]) == list(pd.date_range("2021-01-08", periods=3)[::-1])
+    assert len(repo.get_stock_data("AAPL", 100)) == 10
+
+
+def test_repository_range_is_inclusive(tmp_path):
+    ColumnarPriceStore(tmp_path).write("AAPL", _bars(10))
+    repo = ColumnarPriceDataRepository(tmp_path)
+
+    df = repo.get_stock_data_range("AAPL", date(2021, 1, 3), date(2021, 1, 5))
+
+    assert list(df["date"]) == list(pd.date_range("2021-01-03", "2021-01-05")[::-1])
+    assert len(repo.get_stock_data_range("AAPL", date(2021, 1, 9))) == 2
+
+
+def test_repository_missing_symbol_raises(tmp_path):
+    with pytest.raises(RuntimeError, match="No historical data"):
+        ColumnarPriceDataRepository(tmp_path).get_stock_data("NOPE", 10)
+
+
+def test_manifest_tracks_failures_and_ignores_torn_lines(tmp_path):
+    store = ColumnarPriceStore(tmp_path)
+    store.record_failure("AAPL", "boom")
+    store.record_failure("MSFT", "boom")
+    store.write("AAPL", _bars(3))
+    with (tmp_path / MANIFEST_NAME).open("a") as fh:
+        fh.write('{"symbol": "GOOG", "sta')
+
+    manifest = store.manifest()
+
+    assert store.completed() == ["AAPL"]
+    assert manifest["failures"] == {"MSFT": "boom"}
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarPriceStore(tmp_path, fmt="csv")
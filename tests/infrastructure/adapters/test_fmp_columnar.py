@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.adapters.fmp_columnar import decode_json, historical_to_frame
+
+ROWS = [
+    {
+        "date": "2020-01-03",
+        "open": 10.0,
+        "high": 11.0,
+        "low": 9.0,
+        "close": 10.5,
+        "adjClose": 10.5,
+        "volume": 1000,
+        "vwap": 10.2,
+        "label": "January 03, 20",
+        "changeOverTime": 0.01,
+    },
+    {
+        "date": "2020-01-02",
+        "open": 9,
+        "high": 10,
+        "low": 8,
+        "close": 9.5,
+        "volume": 900,
+        "label": "January 02, 20",
+    },
+]
+
+
+def test_historical_to_frame_keeps_only_typed_ohlcv_columns():
+    df = historical_to_frame(ROWS)
+
+    assert list(df.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert df["date"].dtype == "datetime64[ns]"
+    assert all(df[c].dtype == np.float64 for c in ["open", "high", "low", "close"])
+    assert df["volume"].dtype == np.int64
+    assert list(df["date"]) == [pd.Timestamp("2020-01-03"), pd.Timestamp("2020-01-02")]
+    assert df["close"].tolist() == [10.5, 9.5]
+
+
+def test_historical_to_frame_matches_dataframe_of_records():
+    df = historical_to_frame(ROWS)
+
+    expected = pd.DataFrame(ROWS)[list(df.columns)]
+    expected["date"] = pd.to_datetime(expected["date"])
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_historical_to_frame_tolerates_nulls_and_fractional_volume():
+    rows = [
+        {
+            "date": "2020-01-02 15:30:00",
+            "open": None,
+            "high": 2.0,
+            "low": 1.0,
+            "close": "1.5",
+            "volume": 10.5,
+        },
+        {"date": "2020-01-01", "high": 2.0, "low": 1.0, "close": 1.0, "volume": 3},
+    ]
+
+    df = historical_to_frame(rows)
+
+    assert df["date"].iloc[0] == pd.Timestamp("2020-01-02 15:30:00")
+    assert np.isnan(df["open"]).all()
+    assert df["close"].tolist() == [1.5, 1.0]
+    assert df["volume"].dtype == np.float64
+
+
+def test_historical_to_frame_empty():
+    df = historical_to_frame([])
+
+    assert df.empty
+    assert df["date"].dtype == "datetime64[ns]"
+
+
+def test_decode_json_prefers_raw_bytes_and_falls_back_to_json_method():
+    class BytesResponse:
+        content = json.dumps({"historical": ROWS}).encode()
+
+        def json(self):
+            raise AssertionError("raw bytes should be decoded directly")
+
+    class JsonOnlyResponse:
+        def json(self):
+            return {"historical": []}
+
+    from app.infrastructure.adapters import fmp_columnar
+
+    if fmp_columnar.orjson is not None:
+        assert decode_json(BytesResponse())["historical"][0]["close"] == 10.5
+    assert decode_json(JsonOnlyResponse()) == {"historical": []}
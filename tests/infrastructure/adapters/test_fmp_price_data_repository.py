@@ -60,3 +60,190 @@ def test_get_stock_data(monkeypatch):
     assert isinstance(df, pd.DataFrame)
     assert set(["date", "open", "high", "low", "close", "volume"]) <= set(df.columns)
     assert len(df) == 2
+
+
+def test_get_stock_data_range_sends_from_to_params(monkeypatch):
+    from datetime import date
+
+    from app.infrastructure.adapters.fmp_price_data_repository import (
+        FmpPriceDataRepository,
+    )
+
+    seen = {}
+    payload = {
+        "historical": [
+            {
+                "date": "2020-01-03",
+                "open": 10.0,
+                "high": 11.0,
+                "low": 9.0,
+                "close": 10.5,
+                "volume": 1000,
+            }
+        ]
+    }
+
+    def fake_get(url, params=None, timeout=None):
+        seen.update(params)
+        return DummyResponse(payload)
+
+    import requests
+
+    monkeypatch.setattr(requests, "get", fake_get)
+
+    repo = FmpPriceDataRepository(api_key="dummy")
+    df = repo.get_stock_data_range("FB", date(2020, 1, 2), date(2020, 1, 3))
+
+    assert seen["from"] == "2020-01-02"
+    assert seen["to"] == "2020-01-03"
+    assert "timeseries" not in seen
+    assert len(df) == 1
+
+
+def test_get_stock_data_range_empty_payload_returns_empty_frame(monkeypatch):
+    from datetime import date
+
+    import requests
+
+    from app.infrastructure.adapters.fmp_price_data_repository import (
+        FmpPriceDataRepository,
+    )
+
+    monkeypatch.setattr(
+        requests, "get", lambda url, params=None, timeout=None: DummyResponse({})
+    )
+
+    repo = FmpPriceDataRepository(api_key="dummy")
+    df = repo.get_stock_data_range("FB", date(2020, 1, 4))
+
+    assert df.empty
+    assert "close" in df.columns
+
+
+class HeaderResponse(DummyResponse):
+    def __init__(self, payload, status_code=200, headers=None):
+        super().__init__(payload, status_code)
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        import requests
+
+        if not (200 <= self.status_code < 300):
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+OK_PAYLOAD = {
+    "historical": [
+        {
+            "date": "2020-01-02",
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.5,
+            "volume": 1000,
+        }
+    ]
+}
+
+
+def _scripted_repo(monkeypatch, responses, **kwargs):
+    import requests
+
+    from app.infrastructure.adapters.fmp_price_data_repository import (
+        FmpPriceDataRepository,
+    )
+
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(url)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    sleeps = []
+    repo = FmpPriceDataRepository(api_key="dummy", sleep=sleeps.append, **kwargs)
+    return repo, calls, sleeps
+
+
+def test_retries_throttled_and_failed_requests_with_backoff(monkeypatch):
+    import requests
+
+    from app.infrastructure.http_resilience import RetryPolicy
+
+    responses = [
+        HeaderResponse({}, 429, {"Retry-After": "2"}),
+        requests.ConnectionError("reset by peer"),
+        HeaderResponse({"Error Message": "Limit Reach . Please upgrade"}),
+        HeaderResponse(OK_PAYLOAD),
+    ]
+    repo, calls, sleeps = _scripted_repo(
+        monkeypatch, responses, retry=RetryPolicy(max_attempts=4, random=lambda: 1.0)
+    )
+
+    df = repo.get_stock_data("FB", days=1)
+
+    assert len(df) == 1
+    assert len(calls) == 4
+    assert sleeps == [2.0, 1.0, 2.0]
+
+
+def test_does_not_retry_client_errors(monkeypatch):
+    from app.infrastructure.http_resilience import RetryPolicy
+
+    repo, calls, sleeps = _scripted_repo(
+        monkeypatch, [HeaderResponse({}, 401)], retry=RetryPolicy(max_attempts=4)
+    )
+
+    with pytest.raises(RuntimeError, match="HTTP 401"):
+        repo.get_stock_data("FB", days=1)
+    assert len(calls) == 1 and sleeps == []
+
+
+def test_circuit_opens_after_exhausted_retries_and_fails_fast(monkeypatch):
+    from app.infrastructure.http_resilience import (
+        CircuitBreaker,
+        CircuitOpenError,
+        RetryPolicy,
+    )
+
+    responses = [HeaderResponse({}, 503) for _ in range(4)]
+    repo, calls, _ = _scripted_repo(
+        monkeypatch,
+        responses,
+        retry=RetryPolicy(max_attempts=2, random=lambda: 0.0),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="HTTP 503"):
+            repo.get_stock_data("FB", days=1)
+    with pytest.raises(CircuitOpenError):
+        repo.get_stock_data("FB", days=1)
+    assert len(calls) == 4
+
+
+def test_counts_upstream_responses_by_status(monkeypatch):
+    import requests
+
+    from app import metrics
+    from app.infrastructure.http_resilience import RetryPolicy
+
+    monkeypatch.setattr(metrics, "_enabled", True)
+    before = dict(metrics.UPSTREAM_RESPONSES.collect().samples)
+    responses = [
+        HeaderResponse({}, 503),
+        requests.ConnectionError("reset by peer"),
+        HeaderResponse(OK_PAYLOAD),
+    ]
+    repo, _, _ = _scripted_repo(
+        monkeypatch, responses, retry=RetryPolicy(max_attempts=3, random=lambda: 0.0)
+    )
+
+    repo.get_stock_data("FB", days=1)
+
+    after = metrics.UPSTREAM_RESPONSES.collect().samples
+    for status in ("503", "error", "200"):
+        assert after[(status,)] - before.get((status,), 0) == 1
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from app.domain.repositories import LatestMinimum
+from app.infrastructure.adapters.in_memory_latest_minima_index import (
+    InMemoryLatestMinimaIndex,
+)
+
+
+def _entry(symbol: str, bars_since: int) -> LatestMinimum:
+    date = pd.Timestamp("2024-01-07")
+    return LatestMinimum(symbol, date, -1.0, 10.0, bars_since, date)
+
+
+def test_screen_returns_matches_freshest_first_with_pagination():
+    index = InMemoryLatestMinimaIndex()
+    index.update(
+        "W",
+        1,
+        {
+            s: _entry(s, age)
+            for s, age in [("DDD", 2), ("AAA", 7), ("CCC", 1), ("BBB", 2)]
+        },
+        100.0,
+    )
+
+    page = index.screen("W", 1, within=2)
+    assert [e.symbol for e in page.entries] == ["CCC", "BBB", "DDD"]
+    assert (page.total, page.computed_at) == (3, 100.0)
+
+    second = index.screen("W", 1, within=5, offset=1, limit=1)
+    assert [e.symbol for e in second.entries] == ["BBB"]
+    assert second.total == 3
+    assert index.screen("W", 1, within=10, offset=3, limit=5).entries[0].symbol == "AAA"
+    assert index.screen("W", 1, within=10, offset=9).entries == []
+
+
+def test_update_replaces_given_symbols_and_keeps_the_others():
+    index = InMemoryLatestMinimaIndex()
+    index.update("W", 1, {"AAA": _entry("AAA", 1), "BBB": _entry("BBB", 3)}, 1.0)
+
+    index.update("W", 1, {"AAA": None, "CCC": _entry("CCC", 2)}, 2.0)
+
+    page = index.screen("W", 1, within=10)
+    assert [e.symbol for e in page.entries] == ["CCC", "BBB"]
+    assert page.computed_at == 2.0
+
+
+def test_pairs_are_indexed_separately():
+    index = InMemoryLatestMinimaIndex()
+    index.update("W", 1, {"AAA": _entry("AAA", 1)}, 1.0)
+
+    assert index.screen("W", 2, within=5) is None
+    assert index.screen("MS", 1, within=5) is None
+    index.clear()
+    assert index.screen("W", 1, within=5) is None
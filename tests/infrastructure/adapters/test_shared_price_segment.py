@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.repositories import PriceDataRepository
+from app.infrastructure.adapters.cached_price_data_repository import FreshnessPolicy
+from app.infrastructure.adapters.shared_price_segment import (
+    CURRENT_NAME,
+    SharedPriceSegment,
+    SharedSegmentPriceDataRepository,
+)
+
+
+def _bars(n, start="2022-01-03", base=100.0):
+    dates = pd.date_range(start, periods=n, freq="D")
+    df = pd.DataFrame(
+        {
+            "date": dates,
+            "open": base + np.arange(n),
+            "high": base + np.arange(n) + 1,
+            "low": base + np.arange(n) - 1,
+            "close": base + np.arange(n) + 0.5,
+            "volume": np.arange(n, dtype=np.int64) * 10,
+        }
+    )
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRepo(PriceDataRepository):
+    def __init__(self):
+        self.calls = []
+
+    def get_stock_data(self, symbol, days):
+        self.calls.append((symbol, days))
+        return _bars(3, base=1.0)
+
+
+def _publish(segment, frames, days=10):
+    builder = segment.builder(days)
+    for symbol, df in frames.items():
+        builder.write(symbol, df)
+    return builder, builder.commit()
+
+
+def test_lookup_returns_views_of_each_symbol(tmp_path):
+    segment = SharedPriceSegment(tmp_path)
+    _publish(segment, {"AAA": _bars(5), "BBB": _bars(3, base=50.0)})
+
+    hit = segment.lookup("BBB")
+    frame = hit.frame(2)
+
+    assert isinstance(hit.columns["close"], np.memmap)
+    assert list(frame["close"]) == [52.5, 51.5]
+    assert frame["volume"].dtype == np.int64
+    assert frame["date"].iloc[0] == pd.Timestamp("2022-01-05")
+    assert segment.lookup("CCC") is None
+    assert segment.stats()["symbols"] == 2
+
+
+def test_readers_pick_up_new_generation_after_check_interval(tmp_path):
+    clock = Clock()
+    writer = SharedPriceSegment(tmp_path)
+    reader = SharedPriceSegment(tmp_path, check_interval=5, clock=clock)
+    _publish(writer, {"AAA": _bars(5)})
+    first = reader.current().name
+
+    _publish(writer, {"AAA": _bars(6)})
+    assert reader.current().name == first
+    clock.now = 5
+    assert reader.current().name != first
+    assert len(reader.lookup("AAA").columns["date"]) == 6
+
+
+def test_failed_symbol_keeps_previous_bars(tmp_path):
+    segment = SharedPriceSegment(tmp_path)
+    _publish(segment, {"AAA": _bars(5), "BBB": _bars(4)})
+    fetched_at = segment.lookup("BBB").fetched_at
+
+    builder = segment.builder(10)
+    builder.write("AAA", _bars(6))
+    builder.record_failure("BBB", "boom")
+    builder.record_failure("CCC", "boom")
+    builder.commit()
+
+    generation = segment.reload()
+    assert sorted(generation.symbols) == ["AAA", "BBB"]
+    assert segment.lookup("BBB").fetched_at == fetched_at
+    assert segment.lookup("BBB").frame(10)["volume"].dtype == np.int64
+
+
+def test_old_generations_are_pruned(tmp_path):
+    segment = SharedPriceSegment(tmp_path)
+    for n in range(2, 6):
+        _publish(segment, {"AAA": _bars(n)})
+
+    generations = sorted(p.name for p in tmp_path.glob("gen-*"))
+    assert len(generations) == 2
+    assert (tmp_path / CURRENT_NAME).read_text() == generations[-1]
+
+
+def test_repository_serves_fresh_symbols_and_falls_through(tmp_path):
+    clock = Clock(1000.0)
+    segment = SharedPriceSegment(tmp_path)
+    builder = segment.builder(5)
+    builder._clock = clock
+    builder.write("AAA", _bars(5))
+    builder.commit()
+    inner = FakeRepo()
+    repo = SharedSegmentPriceDataRepository(inner, segment, 60, clock=clock)
+
+    assert len(repo.get_stock_data("AAA", 3)) == 3
+    repo.get_stock_data("AAA", 10)  # deeper than the segment
+    repo.get_stock_data("ZZZ", 3)  # not in the segment
+    clock.now = 1061
+    repo.get_stock_data("AAA", 3)  # stale
+
+    assert inner.calls == [("AAA", 10), ("ZZZ", 3), ("AAA", 3)]
+    assert repo.stats().as_dict() == {"hits": 1, "misses": 3, "refreshes": 0}
+
+
+class TailRepo(PriceDataRepository):
+    """Upstream whose newest bar has moved on since the segment was written."""
+
+    def __init__(self, tail):
+        self.tail = tail
+        self.calls = []
+
+    def get_stock_data(self, symbol, days):
+        self.calls.append((symbol, days))
+        return self.tail.head(days).assign(date=lambda df: df["date"].astype(str))
+
+
+def test_repository_refreshes_stale_trailing_bar_from_inner(tmp_path):
+    # Segment written on 2022-01-07 with bars through that day
+    written = pd.Timestamp("2022-01-07 12:00").timestamp()
+    clock = Clock(written)
+    segment = SharedPriceSegment(tmp_path)
+    builder = segment.builder(5)
+    builder._clock = clock
+    builder.write("AAA", _bars(5))
+    builder.commit()
+    upstream = _bars(6).assign(close=lambda df: df["close"] + 1000)
+    inner = TailRepo(upstream)
+    repo = SharedSegmentPriceDataRepository(
+        inner, segment, 36 * 3600, FreshnessPolicy(300), clock=clock
+    )
+
+    assert repo.get_stock_data("AAA", 5)["close"].tolist() == [
+        104.5,
+        103.5,
+        102.5,
+        101.5,
+        100.5,
+    ]
+    assert inner.calls == []
+
+    clock.now = written + 24 * 3600
+    df = repo.get_stock_data("AAA", 5)
+
+    # The bars since the segment's newest date, that one included, come from
+    # inner; older bars stay on the segment
+    assert inner.calls == [("AAA", 2)]
+    assert df["date"].tolist() == list(pd.date_range("2022-01-04", periods=5))[::-1]
+    assert df["close"].tolist() == [1105.5, 1104.5, 103.5, 102.5, 101.5]
+    assert df["volume"].dtype == np.int64
+    assert repo.stats().as_dict() == {"hits": 2, "misses": 0, "refreshes": 1}
+
+
+def test_empty_segment_serves_nothing(tmp_path):
+    segment = SharedPriceSegment(tmp_path)
+    assert segment.current() is None
+    _publish(segment, {})
+    assert segment.lookup("AAA") is None
+
+
+@pytest.mark.parametrize("days", [1, 5])
+def test_frame_matches_source_newest_first(tmp_path, days):
+    segment = SharedPriceSegment(tmp_path)
+    source = _bars(5)
+    _publish(segment, {"AAA": source})
+
+    pd.testing.assert_frame_equal(segment.lookup("AAA").frame(days), source.head(days))
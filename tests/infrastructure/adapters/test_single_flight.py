@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.adapters.async_price_data_repository import (
+    ExecutorAsyncPriceDataRepository,
+)
+from app.infrastructure.adapters.single_flight import (
+    CoalescingPriceDataRepository,
+    SingleFlight,
+)
+
+
+class SlowRepo:
+    def __init__(self, delay=0.2, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_stock_data(self, symbol, days):
+        with self._lock:
+            self.calls.append((symbol, days))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return pd.DataFrame(
+            {"date": pd.date_range("2020-01-01", periods=3), "close": [1.0, 2.0, 3.0]}
+        )
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_concurrent_sync_callers_share_one_fetch_and_get_copies():
+    inner = SlowRepo()
+    repo = CoalescingPriceDataRepository(inner)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(lambda _: repo.get_stock_data("AAA", 10), range(8)))
+
+    assert inner.calls == [("AAA", 10)]
+    assert len({id(frame) for frame in frames}) == 8
+    frames[0].loc[0, "close"] = -1.0
+    assert frames[1].loc[0, "close"] == 1.0
+    stats = repo.flights.stats()
+    assert stats.calls == 8 and stats.shared == 7 and stats.in_flight == 0
+
+
+def test_different_keys_and_sequential_calls_are_not_coalesced():
+    inner = SlowRepo(delay=0.0)
+    repo = CoalescingPriceDataRepository(inner)
+
+    repo.get_stock_data("AAA", 10)
+    repo.get_stock_data("AAA", 10)
+    repo.get_stock_data("AAA", 20)
+
+    assert inner.calls == [("AAA", 10), ("AAA", 10), ("AAA", 20)]
+
+
+def test_errors_reach_every_waiter():
+    inner = SlowRepo(error=RuntimeError("FMP request failed: 429"))
+    repo = CoalescingPriceDataRepository(inner)
+
+    def call(_):
+        try:
+            repo.get_stock_data("AAA", 10)
+        except RuntimeError as exc:
+            return str(exc)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        errors = list(pool.map(call, range(4)))
+
+    assert inner.calls == [("AAA", 10)]
+    assert errors == ["FMP request failed: 429"] * 4
+
+
+def test_async_and_sync_callers_share_one_fetch():
+    inner = SlowRepo(delay=0.3)
+    flights = SingleFlight()
+    sync_repo = CoalescingPriceDataRepository(inner, flights)
+    async_repo = ExecutorAsyncPriceDataRepository(inner, max_workers=2, flights=flights)
+
+    sync_result = {}
+    thread = threading.Thread(
+        target=lambda: sync_result.setdefault("df", sync_repo.get_stock_data("AAA", 10))
+    )
+    thread.start()
+    time.sleep(0.05)
+
+    async def burst():
+        return await asyncio.gather(
+            *(async_repo.get_stock_data("AAA", 10) for _ in range(20))
+        )
+
+    try:
+        frames = _run(burst())
+    finally:
+        thread.join()
+        async_repo.close()
+
+    assert inner.calls == [("AAA", 10)]
+    assert len(frames) == 20
+    assert all(frame["close"].tolist() == [1.0, 2.0, 3.0] for frame in frames)
+    assert flights.stats().shared == 20
+
+
+def test_async_leader_error_propagates():
+    inner = SlowRepo(delay=0.05, error=RuntimeError("boom"))
+    async_repo = ExecutorAsyncPriceDataRepository(inner, flights=SingleFlight())
+
+    async def burst():
+        return await asyncio.gather(
+            *(async_repo.get_stock_data("AAA", 10) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    try:
+        results = _run(burst())
+    finally:
+        async_repo.close()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert inner.calls == [("AAA", 10)]
+
+
+def test_async_scheduling_failure_fails_waiters_and_frees_the_key():
+    flights = SingleFlight()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    repo = SlowRepo(delay=0)
+
+    with pytest.raises(RuntimeError):
+        _run(flights.do_async("AAA", lambda: repo.get_stock_data("AAA", 3), executor))
+
+    assert flights.stats().in_flight == 0
+    assert len(flights.do("AAA", lambda: repo.get_stock_data("AAA", 3))) == 3
+    assert repo.calls == [("AAA", 3)]
@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from app.infrastructure.adapters import sweep_results
+from app.infrastructure.adapters.sweep_results import write_tables
+
+
+def test_write_tables_csv_round_trips(tmp_path):
+    table = pd.DataFrame({"symbol": ["AAA", "BBB"], "window": [1, 2]})
+
+    paths = write_tables({"macd_minima": table}, tmp_path / "out", fmt="csv")
+
+    assert paths == [tmp_path / "out" / "macd_minima.csv"]
+    pd.testing.assert_frame_equal(pd.read_csv(paths[0]), table)
+    assert [p.name for p in (tmp_path / "out").iterdir()] == ["macd_minima.csv"]
+
+
+def test_write_tables_parquet_requires_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep_results, "pq", None)
+
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        write_tables({"stop_loss": pd.DataFrame()}, tmp_path, fmt="parquet")
+
+
+def test_write_tables_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unknown format"):
+        write_tables({}, tmp_path, fmt="xlsx")
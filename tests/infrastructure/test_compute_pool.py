@@ -0,0 +1,96 @@
+import asyncio
+import math
+import threading
+
+import pytest
+
+from app.infrastructure.compute_pool import ComputePool, PoolSaturatedError
+
+
+def _run(coro):
+    # A private loop keeps the global event loop policy untouched for TestClient
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_thread_pool_runs_work_and_records_timings():
+    pool = ComputePool("thread", max_workers=2, max_queue=2)
+    try:
+        result = _run(pool.run(sum, [1, 2, 3]))
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert result == 6
+    assert stats["submitted"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["compute_seconds"]["count"] == 1
+    assert stats["queue_wait_seconds"]["buckets"]["+Inf"] == 1
+
+
+def test_full_pool_rejects_instead_of_queueing():
+    release = threading.Event()
+    pool = ComputePool("thread", max_workers=1, max_queue=1)
+
+    async def scenario():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(PoolSaturatedError):
+            await pool.run(release.wait)
+        release.set()
+        return await asyncio.gather(*running)
+
+    try:
+        assert _run(scenario()) == [True, True]
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert stats["rejected"] == 1
+    assert stats["submitted"] == 2
+    # The second task waited for the first to finish
+    assert stats["queue_wait_seconds"]["count"] == 2
+
+
+def test_failures_release_their_slot():
+    pool = ComputePool("thread", max_workers=1, max_queue=0)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            _run(pool.run(divmod, 1, 0))
+        assert _run(pool.run(divmod, 7, 2)) == (3, 1)
+        stats = pool.stats()
+    finally:
+        pool.close()
+
+    assert stats["failed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_rejected_submission_releases_its_slot():
+    pool = ComputePool("thread", max_workers=1, max_queue=0)
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        _run(pool.run(divmod, 7, 2))
+    stats = pool.stats()
+
+    assert stats["in_flight"] == 0
+    assert stats["failed"] == 1
+
+
+def test_process_pool_runs_picklable_work():
+    pool = ComputePool("process", max_workers=1, max_queue=0)
+    try:
+        assert _run(pool.run(math.fsum, [0.5, 0.25])) == 0.75
+    finally:
+        pool.close()
+
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        ComputePool("fiber")
+    with pytest.raises(ValueError):
+        ComputePool("thread", max_workers=0)
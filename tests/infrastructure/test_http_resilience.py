@@ -0,0 +1,77 @@
+import pytest
+
+from app.infrastructure.http_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    TokenBucket,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces_to_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(120, burst=3, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(7)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([0.5] * 4)
+    assert clock.now == pytest.approx(1002.0)
+
+
+def test_retry_policy_full_jitter_and_retry_after():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, random=lambda: 1.0)
+
+    assert [policy.delay(n) for n in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    assert RetryPolicy(random=lambda: 0.25).delay(2) == 0.5
+    assert policy.delay(0, retry_after=7.0) == 7.0
+    assert RetryPolicy(max_retry_after=10).delay(0, retry_after=600) == 10
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after({"Retry-After": "12"}, now=0) == 12.0
+    assert parse_retry_after(
+        {"Retry-After": "Wed, 21 Oct 2015 07:28:30 GMT"}, now=1445412480.0
+    ) == pytest.approx(30.0)
+    assert parse_retry_after({}, now=0) is None
+    assert parse_retry_after({"Retry-After": "soon"}, now=0) is None
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before_call()
+    assert info.value.retry_in == pytest.approx(30.0)
+
+    clock.sleep(30)
+    assert breaker.state == "half-open"
+    breaker.before_call()  # the single trial call
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.sleep(30)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
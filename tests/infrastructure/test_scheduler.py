@@ -0,0 +1,78 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.infrastructure.scheduler import (
+    DailyScheduler,
+    next_run_at,
+    parse_time_of_day,
+    previous_run_at,
+)
+
+
+def _ts(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_next_run_at_same_day_next_day_and_weekend():
+    at = parse_time_of_day("21:30")
+
+    # Wednesday before and after the run time
+    assert next_run_at(_ts(2024, 1, 3, 12, 0), at) == _ts(2024, 1, 3, 21, 30)
+    assert next_run_at(_ts(2024, 1, 3, 21, 30), at) == _ts(2024, 1, 4, 21, 30)
+    # Friday evening skips to Monday unless weekends are allowed
+    assert next_run_at(_ts(2024, 1, 5, 22, 0), at) == _ts(2024, 1, 8, 21, 30)
+    assert next_run_at(_ts(2024, 1, 5, 22, 0), at, weekdays_only=False) == _ts(
+        2024, 1, 6, 21, 30
+    )
+
+
+def test_previous_run_at_same_day_previous_day_and_weekend():
+    at = parse_time_of_day("21:30")
+
+    assert previous_run_at(_ts(2024, 1, 3, 21, 30), at) == _ts(2024, 1, 3, 21, 30)
+    assert previous_run_at(_ts(2024, 1, 3, 12, 0), at) == _ts(2024, 1, 2, 21, 30)
+    # Monday morning goes back to Friday
+    assert previous_run_at(_ts(2024, 1, 8, 9, 0), at) == _ts(2024, 1, 5, 21, 30)
+
+
+def test_parse_time_of_day_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_time_of_day("after close")
+
+
+def test_run_now_keeps_last_successful_result():
+    results = iter([1, RuntimeError("boom"), 3])
+
+    def job():
+        value = next(results)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    scheduler = DailyScheduler(job, at=parse_time_of_day("21:30"))
+
+    assert scheduler.run_now() == 1
+    assert scheduler.run_now() is None
+    assert scheduler.last_result == 1
+    assert scheduler.run_now() == 3
+
+
+def test_start_runs_on_start_and_stops():
+    calls = []
+    scheduler = DailyScheduler(
+        lambda: calls.append(1) or len(calls),
+        at=parse_time_of_day("21:30"),
+        run_on_start=True,
+    )
+
+    scheduler.start()
+    for _ in range(200):
+        if scheduler.next_run_at is not None:
+            break
+        time.sleep(0.01)
+    scheduler.stop(timeout=5)
+
+    assert calls == [1]
+    assert scheduler.last_result == 1
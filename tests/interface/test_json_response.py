@@ -0,0 +1,136 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from app.interface.json_response import MinimaColumns, minima_ndjson, minima_response
+from app.schemas import MacdMinimaRow, coerce_non_finite_column
+
+
+def _validated_body(rows):
+    # What the endpoint returned through response_model=List[MacdMinimaRow]
+    return json.dumps(
+        jsonable_encoder([MacdMinimaRow(**row) for row in rows]),
+        separators=(",", ":"),
+        allow_nan=False,
+    ).encode()
+
+
+def _rows():
+    return [
+        {
+            "symbol": "ABC",
+            "date": datetime(2020, 1, 19),
+            "macd": -0.125,
+            "price": 78.15,
+            "period": "W",
+        },
+        {
+            "symbol": "ABC",
+            "date": datetime(2020, 2, 2, 15, 30),
+            "macd": float("nan"),
+            "price": float("inf"),
+            "period": "W",
+        },
+        {
+            "symbol": "ABC",
+            "date": datetime(2020, 2, 16),
+            "macd": None,
+            "price": 80.5,
+            "period": "W",
+        },
+    ]
+
+
+def test_coerce_non_finite_column_maps_nan_and_inf_to_none():
+    out = coerce_non_finite_column([1.5, float("nan"), float("-inf"), 2])
+    assert out == [1.5, None, None, 2.0]
+    assert all(v is None or type(v) is float for v in out)
+
+
+def test_records_match_validated_serialization():
+    rows = _rows()
+    response = minima_response("ABC", "W", MinimaColumns.from_rows(rows))
+
+    assert response.media_type == "application/json"
+    assert response.body == _validated_body(rows)
+
+
+def test_from_frame_matches_from_rows():
+    rows = _rows()
+    frame = pd.DataFrame(
+        {
+            "date": pd.to_datetime([row["date"] for row in rows]),
+            "macd": [row["macd"] for row in rows],
+            "price": [row["price"] for row in rows],
+        }
+    )
+
+    assert MinimaColumns.from_frame(frame) == MinimaColumns.from_rows(rows)
+
+
+def test_whole_second_dates_have_no_fraction():
+    columns = MinimaColumns.from_rows(_rows()[:1])
+    assert columns.date == ["2020-01-19T00:00:00"]
+
+
+def test_mixed_precision_dates_match_records_in_every_format():
+    # Whole-second and fractional dates in one column: each value keeps its
+    # own isoformat() text, as the validated records path writes it
+    rows = _rows()
+    rows[0]["date"] = datetime(2020, 1, 19, 9, 30, 0, 250000)
+    columns = MinimaColumns.from_rows(rows)
+    records = json.loads(_validated_body(rows))
+    expected = [record["date"] for record in records]
+
+    assert expected == [
+        "2020-01-19T09:30:00.250000",
+        "2020-02-02T15:30:00",
+        "2020-02-16T00:00:00",
+    ]
+    assert minima_response("ABC", "W", columns).body == _validated_body(rows)
+    body = json.loads(minima_response("ABC", "W", columns, fmt="columns").body)
+    assert body["date"] == expected
+    lines = b"".join(minima_ndjson("ABC", "W", columns)).splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_missing_dates_are_null():
+    dates = pd.Series(pd.to_datetime(["2020-01-19", None, "2020-02-02 15:30:00.5"]))
+    frame = pd.DataFrame({"date": dates, "macd": [1.0, 2.0, 3.0], "price": 1.0})
+
+    assert MinimaColumns.from_frame(frame).date == [
+        "2020-01-19T00:00:00",
+        None,
+        "2020-02-02T15:30:00.500000",
+    ]
+
+
+def test_columns_format():
+    response = minima_response(
+        "ABC", "W", MinimaColumns.from_rows(_rows()), fmt="columns"
+    )
+    body = json.loads(response.body)
+
+    assert body["symbol"] == "ABC"
+    assert body["period"] == "W"
+    assert body["date"][1] == "2020-02-02T15:30:00"
+    assert body["macd"] == [-0.125, None, None]
+    assert body["price"] == [78.15, None, 80.5]
+
+
+def test_empty_minima():
+    columns = MinimaColumns.from_rows([])
+    assert json.loads(minima_response("ABC", "W", columns).body) == []
+
+
+def test_minima_ndjson_chunks_lines():
+    rows = _rows()
+    columns = MinimaColumns.from_rows(rows)
+    chunks = list(minima_ndjson("ABC", "W", columns, chunk_rows=2))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).splitlines()
+    records = json.loads(minima_response("ABC", "W", columns).body)
+    assert [json.loads(line) for line in lines] == records
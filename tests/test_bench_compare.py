@@ -0,0 +1,65 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "scripts" / "bench.py"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _report(**cases):
+    return {
+        "results": {
+            key: (
+                {"min": seconds, "peak_bytes": peak}
+                if peak is not None
+                else {"min": seconds}
+            )
+            for key, (seconds, peak) in cases.items()
+        }
+    }
+
+
+def test_compare_flags_time_and_memory_beyond_threshold(bench):
+    baseline = _report(
+        steady=(1.0, 100),
+        at_limit=(1.0, 100),
+        slower=(1.0, 100),
+        heavier=(1.0, 100),
+        faster=(1.0, 100),
+    )
+    current = _report(
+        steady=(1.1, 110),
+        at_limit=(1.25, 125),
+        slower=(1.26, 100),
+        heavier=(1.0, 126),
+        faster=(0.5, 50),
+    )
+
+    assert bench.compare(baseline, current, 0.25) == ["slower", "heavier"]
+    assert bench.compare(baseline, current, 0.5) == []
+
+
+def test_compare_ignores_new_cases_and_missing_memory(bench):
+    baseline = _report(old=(1.0, None), zero=(0.0, 0))
+    current = _report(old=(1.2, 10_000), zero=(0.0, 0), new=(99.0, 10**9))
+
+    assert bench.compare(baseline, current, 0.25) == []
+
+
+def test_compare_command_exit_status(bench, tmp_path):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report(case=(1.0, 100))))
+    current.write_text(json.dumps(_report(case=(2.0, 100))))
+
+    assert bench.main(["compare", str(baseline), str(current)]) == 1
+    assert bench.main(["compare", str(baseline), str(current), "--threshold", "1"]) == 0
@@ -0,0 +1,47 @@
+import pandas as pd
+from starlette.testclient import TestClient
+
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.infrastructure.compute_pool import PoolSaturatedError
+from app.interface.deps import get_compute_pool
+from app.main import api
+
+
+class SaturatedPool:
+    async def run(self, fn, *args, **kwargs):
+        raise PoolSaturatedError(capacity=3)
+
+
+def test_saturated_pool_maps_to_503(testclient: TestClient, monkeypatch):
+    frame = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=60)[::-1],
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.0,
+            "volume": 100,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: frame
+    )
+    api.dependency_overrides[get_compute_pool] = lambda: SaturatedPool()
+    try:
+        r = testclient.get("/stocks/AAA/macd-minima?days=60")
+    finally:
+        api.dependency_overrides.pop(get_compute_pool, None)
+
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert "saturated" in r.json()["detail"]
+
+
+def test_compute_stats_reports_pool(testclient: TestClient):
+    r = testclient.get("/compute/stats")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["enabled"] is True
+    assert body["kind"] == "thread"
+    assert set(body["compute_seconds"]) == {"count", "sum", "buckets"}
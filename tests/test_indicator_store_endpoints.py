@@ -0,0 +1,129 @@
+import time
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.domain.repositories import IndicatorKey
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.interface.deps import get_indicator_store
+from app.interface.settings import AppSettings, get_settings
+from app.main import api
+
+
+@pytest.fixture
+def store():
+    store = get_indicator_store()
+    store.clear()
+    yield store
+    store.clear()
+
+
+@pytest.fixture
+def no_upstream(monkeypatch):
+    calls = []
+
+    def fake_get_stock_data(self, symbol, days):
+        calls.append(symbol)
+        raise RuntimeError("upstream must not be called")
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+    return calls
+
+
+def test_stop_loss_served_from_store(testclient: TestClient, store, no_upstream):
+    store.put(
+        IndicatorKey("AAA", "MS", num_elements=10),
+        {"symbol": "AAA", "stop_loss": 9.5, "stop_loss_date": "2020-06-01T00:00:00"},
+        time.time(),
+    )
+
+    r = testclient.get("/stocks/AAA")
+
+    assert r.status_code == 200
+    assert r.json()["stop_loss"] == 9.5
+    assert no_upstream == []
+
+
+def test_stale_store_entry_falls_back_to_live(
+    testclient: TestClient, store, no_upstream
+):
+    store.put(
+        IndicatorKey("AAA", "MS", num_elements=10),
+        {"symbol": "AAA", "stop_loss": 9.5, "stop_loss_date": None},
+        time.time() - 10 * 24 * 3600,
+    )
+
+    with pytest.raises(RuntimeError):
+        testclient.get("/stocks/AAA")
+
+    assert no_upstream == ["AAA"]
+
+
+def test_stop_loss_store_is_skipped_when_refresh_used_other_days(
+    testclient: TestClient, store, no_upstream
+):
+    store.put(
+        IndicatorKey("AAA", "MS", num_elements=10),
+        {"symbol": "AAA", "stop_loss": 9.5, "stop_loss_date": None},
+        time.time(),
+    )
+    api.dependency_overrides[get_settings] = lambda: AppSettings(INDICATOR_DAYS=365)
+    try:
+        with pytest.raises(RuntimeError):
+            testclient.get("/stocks/AAA")
+    finally:
+        api.dependency_overrides.pop(get_settings, None)
+
+    assert no_upstream == ["AAA"]
+
+
+def test_macd_minima_served_from_store_only_for_default_days(
+    testclient: TestClient, store, no_upstream
+):
+    rows = [
+        {
+            "symbol": "AAA",
+            "date": "2020-01-19T00:00:00",
+            "macd": -0.5,
+            "price": 3.0,
+            "period": "W",
+        }
+    ]
+    store.put(IndicatorKey("AAA", "W", window=1), rows, time.time())
+
+    r = testclient.get("/stocks/AAA/macd-minima")
+    assert r.status_code == 200
+    assert r.json()[0]["macd"] == -0.5
+    assert no_upstream == []
+
+    with pytest.raises(RuntimeError):
+        testclient.get("/stocks/AAA/macd-minima?days=30")
+    assert no_upstream == ["AAA"]
+
+
+def test_indicator_status_reports_staleness(testclient: TestClient, store):
+    now = time.time()
+    store.put(IndicatorKey("AAA", "W", window=1), [], now - 60)
+    store.put(IndicatorKey("BBB", "W", window=1), [], now - 10 * 24 * 3600)
+
+    r = testclient.get("/indicators/status")
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["enabled"] is False
+    assert data["entries"] == 2
+    assert data["stale_entries"] == 1
+    assert data["oldest_age_seconds"] >= 10 * 24 * 3600
+    assert data["last_run"] is None
+
+
+def test_macd_minima_with_custom_macd_is_computed_live(
+    testclient: TestClient, store, no_upstream
+):
+    store.put(IndicatorKey("AAA", "W", window=1), [], time.time())
+
+    with pytest.raises(RuntimeError):
+        testclient.get("/stocks/AAA/macd-minima?source=hl2")
+    with pytest.raises(RuntimeError):
+        testclient.get("/stocks/AAA/macd-minima?fast=8&slow=21")
+    assert no_upstream == ["AAA", "AAA"]
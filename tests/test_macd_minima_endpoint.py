@@ -1,6 +1,7 @@
 import os
 
 import pandas as pd
+import pytest
 from starlette.testclient import TestClient
 
 from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
@@ -85,3 +86,108 @@ def test_macd_minima_endpoint_returns_rows_ddd_stack(
     assert isinstance(data[0]["macd"], float)
     assert isinstance(data[0]["price"], float)
     assert data[0]["period"] == "W"
+
+
+def test_macd_minima_endpoint_columns_format(testclient: TestClient, monkeypatch):
+    n = 7
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=n, freq="W"),
+            "open": [5, 4, 3, 4, 3, 4, 5],
+            "high": [6, 5, 4, 5, 4, 5, 6],
+            "low": [4, 3, 2, 3, 2, 3, 4],
+            "close": [5, 4, 3, 4, 3, 4, 5],
+            "volume": [1000] * n,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: df
+    )
+
+    url = "/stocks/ABC/macd-minima?period=W&window=2&days=100"
+    records = testclient.get(url).json()
+    r = testclient.get(url + "&format=columns")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["symbol"] == "ABC"
+    assert body["period"] == "W"
+    assert body["date"] == [row["date"] for row in records]
+    assert body["macd"] == [row["macd"] for row in records]
+    assert body["price"] == [row["price"] for row in records]
+    assert testclient.get(url + "&format=csv").status_code == 422
+
+
+def test_macd_minima_endpoint_ndjson_format(testclient: TestClient, monkeypatch):
+    import json
+
+    n = 7
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=n, freq="W"),
+            "open": [5, 4, 3, 4, 3, 4, 5],
+            "high": [6, 5, 4, 5, 4, 5, 6],
+            "low": [4, 3, 2, 3, 2, 3, 4],
+            "close": [5, 4, 3, 4, 3, 4, 5],
+            "volume": [1000] * n,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: df
+    )
+
+    url = "/stocks/ABC/macd-minima?period=W&window=2&days=100"
+    records = testclient.get(url).json()
+    r = testclient.get(url + "&format=ndjson")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in r.text.splitlines()] == records
+
+
+def test_macd_minima_openapi_declares_every_format(testclient: TestClient):
+    responses = testclient.get("/openapi.json").json()["paths"][
+        "/stocks/{symbol}/macd-minima"
+    ]["get"]["responses"]
+    content = responses["200"]["content"]
+
+    shapes = content["application/json"]["schema"]["anyOf"]
+    assert {"$ref": "#/components/schemas/MacdMinimaColumns"} in shapes
+    assert {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/MacdMinimaRow"},
+    } in shapes
+    assert content["application/x-ndjson"]["schema"] == {
+        "$ref": "#/components/schemas/MacdMinimaRow"
+    }
+
+
+def test_macd_endpoint_returns_signal_and_histogram(
+    testclient: TestClient, monkeypatch
+):
+    n = 60
+    closes = [10 + (i % 7) for i in range(n)]
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=n, freq="D")[::-1],
+            "open": closes,
+            "high": [c + 1 for c in closes],
+            "low": [c - 1 for c in closes],
+            "close": closes,
+            "volume": [1000] * n,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: df
+    )
+
+    r = testclient.get("/stocks/ABC/macd?period=D&fast=3&slow=6&signal=4")
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["symbol"] == "ABC" and body["period"] == "D"
+    assert len(body["date"]) == len(body["macd"]) == len(body["signal"]) == n
+    assert body["signal"][:3] == [None, None, None]
+    assert body["histogram"][-1] == pytest.approx(body["macd"][-1] - body["signal"][-1])
+    assert testclient.get("/stocks/ABC/macd?fast=26&slow=12").status_code == 422
+    assert testclient.get("/stocks/ABC/macd?source=volume").status_code == 422
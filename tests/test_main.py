@@ -68,3 +68,47 @@ def test_root_endpoint_ddd_stack(testclient: TestClient, monkeypatch):
         assert "stop_loss_date" in data
     finally:
         os.environ.pop("USE_DDD_STACK", None)
+
+
+def test_stop_loss_endpoint_with_named_strategy(testclient: TestClient, monkeypatch):
+    n = 400
+    dates = pd.date_range("2020-01-01", periods=n, freq="D")[::-1]
+    close = [100.0 + (i % 30) for i in range(n)]
+    df = pd.DataFrame(
+        {
+            "date": dates,
+            "open": close,
+            "high": [v + 1 for v in close],
+            "low": [v - 1 for v in close],
+            "close": close,
+            "volume": [1000] * n,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: df
+    )
+
+    r = testclient.get("/stocks/FB?strategy=donchian")
+
+    assert r.status_code == 200
+    data = r.json()
+    assert data["symbol"] == "FB"
+    assert data["stop_loss"] == 99.0
+    assert testclient.get("/stocks/FB?strategy=magic").status_code == 422
+
+
+def test_stop_loss_endpoint_rejects_history_too_short_for_strategy(
+    testclient: TestClient, monkeypatch
+):
+    empty = pd.DataFrame(
+        columns=["date", "open", "high", "low", "close", "volume"]
+    ).astype({"date": "datetime64[ns]"})
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: empty
+    )
+
+    for strategy in ("atr", "macd"):
+        r = testclient.get(f"/stocks/NEWCO?strategy={strategy}")
+
+        assert r.status_code == 422
+        assert r.json()["detail"] == "No price history for symbol 'NEWCO'"
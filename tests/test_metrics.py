@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+from starlette.testclient import TestClient
+
+from app import metrics
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.interface.settings import AppSettings, get_settings
+from app.main import api
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+
+
+def test_disabled_span_is_a_shared_noop(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", False)
+
+    assert metrics.span("a") is metrics.span("b")
+
+
+def test_timed_records_into_span_histogram(enabled):
+    @metrics.timed("unit_test_span")
+    def work(x):
+        return x * 2
+
+    assert work(21) == 42
+    family = metrics.SPAN_SECONDS.collect()
+    assert family.samples[("unit_test_span",)].count == 1
+
+
+def test_render_uses_prometheus_text_format():
+    registry = metrics.Registry()
+    histogram = registry.histogram("x_seconds", "X", ("span",))
+    counter = registry.counter("y_total", "Y", ("status",))
+    histogram.observe(0.003, "fetch")
+    counter.inc("200")
+    counter.inc("200")
+    registry.register_collector(
+        "stats",
+        lambda: metrics.stats_families("z", {"hits": 3, "entries": 2}, ["entries"]),
+    )
+
+    text = registry.render()
+
+    assert "# TYPE x_seconds histogram" in text
+    assert 'x_seconds_bucket{span="fetch",le="0.001"} 0' in text
+    assert 'x_seconds_bucket{span="fetch",le="0.005"} 1' in text
+    assert 'x_seconds_bucket{span="fetch",le="+Inf"} 1' in text
+    assert 'x_seconds_count{span="fetch"} 1' in text
+    assert 'y_total{status="200"} 2' in text
+    assert "# TYPE z_hits_total counter\nz_hits_total 3" in text
+    assert "# TYPE z_entries gauge\nz_entries 2" in text
+    assert text.endswith("\n")
+
+
+def test_metrics_endpoint_exports_spans_and_stats(testclient: TestClient, monkeypatch):
+    frame = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=200)[::-1],
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": [10.0 + (i % 7) for i in range(200)],
+            "volume": 100,
+        }
+    )
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: frame
+    )
+
+    assert testclient.get("/stocks/AAA/macd-minima?days=200").status_code == 200
+    r = testclient.get("/metrics")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    for span in ("price_data", "resample", "macd", "local_minima", "response"):
+        assert f'app_span_duration_seconds_count{{span="{span}"}}' in r.text
+    assert (
+        'app_request_duration_seconds_count{route="/stocks/{symbol}/macd-minima"}'
+        in r.text
+    )
+    assert "app_single_flight_calls_total" in r.text
+    assert "app_compute_seconds_count" in r.text
+
+
+def test_metrics_endpoint_is_404_when_disabled(testclient: TestClient):
+    api.dependency_overrides[get_settings] = lambda: AppSettings(METRICS_ENABLED=False)
+    try:
+        r = testclient.get("/metrics")
+    finally:
+        api.dependency_overrides.pop(get_settings, None)
+
+    assert r.status_code == 404
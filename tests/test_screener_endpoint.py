@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+from starlette.testclient import TestClient
+
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.interface.deps import get_latest_minima_index
+from app.interface.settings import AppSettings, get_settings
+from app.main import api
+
+
+def _make_weekly_df(values: list[float]) -> pd.DataFrame:
+    n = len(values)
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-05", periods=n, freq="W"),
+            "open": values,
+            "high": [v + 1 for v in values],
+            "low": [v - 1 for v in values],
+            "close": values,
+            "volume": [1000] * n,
+        }
+    )
+
+
+FRAMES = {
+    # The MACD bottoms 13 and 3 bars before the end respectively
+    "ABC": _make_weekly_df([20 - i for i in range(10)] + [11 + i for i in range(15)]),
+    "XYZ": _make_weekly_df([30 - i for i in range(20)] + [11 + i for i in range(4)]),
+}
+
+
+@pytest.fixture
+def universe(monkeypatch):
+    calls = []
+
+    def fake_get_stock_data(self, symbol, days):
+        calls.append(symbol)
+        if symbol not in FRAMES:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return FRAMES[symbol]
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+    index = get_latest_minima_index()
+    index.clear()
+    api.dependency_overrides[get_settings] = lambda: AppSettings(
+        INDICATOR_SYMBOLS="ABC,XYZ,BAD", PRICE_CACHE_ENABLED=False
+    )
+    yield calls
+    api.dependency_overrides.pop(get_settings, None)
+    index.clear()
+
+
+def test_screener_returns_fresh_minima_and_pages(testclient: TestClient, universe):
+    r = testclient.get("/screener/macd-minima", params={"within": 13, "limit": 1})
+
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["period"], data["window"], data["within"]) == ("W", 1, 13)
+    assert (data["total"], data["offset"], data["next_offset"]) == (2, 0, 1)
+    assert [row["symbol"] for row in data["results"]] == ["XYZ"]
+    assert data["results"][0]["bars_since"] == 3
+    assert data["results"][0]["last_bar_date"].startswith("2020-06-14")
+    assert data["errors"][0]["symbol"] == "BAD"
+
+    universe.clear()
+    r = testclient.get(
+        "/screener/macd-minima", params={"within": 13, "limit": 1, "offset": 1}
+    )
+    data = r.json()
+    assert [row["symbol"] for row in data["results"]] == ["ABC"]
+    assert data["next_offset"] is None
+    assert data["errors"] == []
+    assert universe == []
+
+    r = testclient.get("/screener/macd-minima", params={"within": 2})
+    assert r.json()["total"] == 0
+
+
+def test_screener_requires_a_universe(testclient: TestClient):
+    api.dependency_overrides[get_settings] = lambda: AppSettings(INDICATOR_SYMBOLS="")
+    try:
+        r = testclient.get("/screener/macd-minima")
+    finally:
+        api.dependency_overrides.pop(get_settings, None)
+
+    assert r.status_code == 503
+
+
+def test_screener_rejects_pairs_the_refresh_does_not_cover(
+    testclient: TestClient, universe
+):
+    r = testclient.get("/screener/macd-minima", params={"window": 7})
+
+    assert r.status_code == 422
+    assert "W/1" in r.json()["detail"]
+    assert universe == []
+    assert get_latest_minima_index().screen("W", 7, within=100) is None
+
+
+def test_screener_rejects_oversized_pages(testclient: TestClient):
+    r = testclient.get("/screener/macd-minima", params={"limit": 10_000})
+    assert r.status_code == 422
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from app.infrastructure.adapters.columnar_price_store import ColumnarPriceStore
+from app.interface.deps import (
+    build_shared_price_refresh,
+    close_shared_repositories,
+    get_shared_repositories,
+)
+from app.interface.settings import AppSettings
+
+
+def _bars():
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2022-01-01", periods=30)[::-1],
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": 1.5,
+            "volume": 10,
+        }
+    )
+
+
+def test_refresh_writes_once_per_slot_and_serves_from_segment(tmp_path):
+    store = ColumnarPriceStore(tmp_path / "store")
+    store.write("AAA", _bars())
+    settings = AppSettings(
+        PRICE_STORE_PATH=str(tmp_path / "store"),
+        SHARED_PRICE_PATH=str(tmp_path / "shared"),
+        SHARED_PRICE_SYMBOLS="AAA,MISSING",
+        SHARED_PRICE_DAYS=20,
+    )
+    job = build_shared_price_refresh(settings)
+    try:
+        report = job()
+        assert report.written == 1
+        assert [e["symbol"] for e in report.errors] == ["MISSING"]
+        # Another worker running the same slot finds it already written
+        assert job() is None
+
+        shared = get_shared_repositories(settings)
+        assert len(shared.sync.get_stock_data("AAA", 20)) == 20
+        assert shared.segment.stats().hits == 1
+    finally:
+        close_shared_repositories()
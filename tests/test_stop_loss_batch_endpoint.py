@@ -0,0 +1,173 @@
+import math
+
+import pandas as pd
+from starlette.testclient import TestClient
+
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.interface.deps import get_stop_loss_strategy
+from app.main import api
+
+
+def _make_daily_df(values: list[float], start: str = "2020-01-01") -> pd.DataFrame:
+    n = len(values)
+    dates = pd.date_range(start, periods=n, freq="D")
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": values,
+            "high": [v + 1 for v in values],
+            "low": [max(0.0, v - 1) for v in values],
+            "close": values,
+            "volume": [1000] * n,
+        }
+    )
+
+
+def test_stop_loss_batch_endpoint_returns_results_and_errors(
+    testclient: TestClient, monkeypatch
+):
+    frames = {"AAA": _make_daily_df([10, 11, 12]), "BBB": _make_daily_df([20, 21])}
+
+    def fake_get_stock_data(self, symbol, days):
+        if symbol not in frames:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return frames[symbol]
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+
+    def fake_strategy(symbol, stock_data, periodicity, num_elements):
+        return {
+            "stop_loss": 1.5,
+            "stop_loss_date": stock_data.iloc[0].date,
+            "max_macd_date": stock_data.iloc[0].date,
+        }
+
+    api.dependency_overrides[get_stop_loss_strategy] = lambda: fake_strategy
+    try:
+        r = testclient.post(
+            "/stocks/stop-loss:batch",
+            json={"symbols": ["AAA", "ZZZ", "BBB"], "periodicity": "W"},
+        )
+    finally:
+        api.dependency_overrides.pop(get_stop_loss_strategy, None)
+
+    assert r.status_code == 200
+    data = r.json()
+    assert [row["symbol"] for row in data["results"]] == ["AAA", "BBB"]
+    assert data["results"][0]["stop_loss"] == 1.5
+    assert data["results"][0]["current_price"] == 10.0
+    assert data["results"][0]["period"] == "W"
+    assert data["errors"][0]["symbol"] == "ZZZ"
+    assert "ZZZ" in data["errors"][0]["detail"]
+
+
+def test_stop_loss_batch_endpoint_rejects_empty_symbol_list(testclient: TestClient):
+    r = testclient.post("/stocks/stop-loss:batch", json={"symbols": []})
+    assert r.status_code == 422
+
+
+def test_stop_loss_stream_endpoint_yields_ndjson_rows(
+    testclient: TestClient, monkeypatch
+):
+    import json
+
+    frames = {"AAA": _make_daily_df([10, 11, 12]), "BBB": _make_daily_df([20, 21])}
+
+    def fake_get_stock_data(self, symbol, days):
+        if symbol not in frames:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return frames[symbol]
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+
+    def fake_strategy(symbol, stock_data, periodicity, num_elements):
+        return {
+            "stop_loss": float("nan"),
+            "stop_loss_date": stock_data.iloc[0].date,
+            "max_macd_date": None,
+        }
+
+    api.dependency_overrides[get_stop_loss_strategy] = lambda: fake_strategy
+    try:
+        r = testclient.post(
+            "/stocks/stop-loss:stream",
+            json={"symbols": ["AAA", "ZZZ", "BBB"], "periodicity": "W"},
+        )
+    finally:
+        api.dependency_overrides.pop(get_stop_loss_strategy, None)
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    by_symbol = {line["symbol"]: line for line in lines}
+    assert set(by_symbol) == {"AAA", "BBB", "ZZZ"}
+    assert by_symbol["AAA"]["current_price"] == 10.0
+    assert by_symbol["AAA"]["stop_loss"] is None
+    assert by_symbol["AAA"]["stop_loss_date"] == "2020-01-01T00:00:00"
+    assert set(by_symbol["ZZZ"]) == {"symbol", "detail"}
+    assert "ZZZ" in by_symbol["ZZZ"]["detail"]
+
+
+def test_stop_loss_batch_endpoint_evaluates_named_strategies(
+    testclient: TestClient, monkeypatch
+):
+    df = _make_daily_df([float(v) for v in range(100, 40, -1)])
+    monkeypatch.setattr(
+        FmpPriceDataRepository, "get_stock_data", lambda self, symbol, days: df
+    )
+
+    r = testclient.post(
+        "/stocks/stop-loss:batch",
+        json={
+            "symbols": ["AAA"],
+            "periodicity": "W",
+            "num_elements": 3,
+            "strategies": ["donchian", "percent", "donchian"],
+        },
+    )
+
+    assert r.status_code == 200
+    rows = r.json()["results"]
+    assert [row["strategy"] for row in rows] == ["donchian", "percent"]
+    assert all(row["symbol"] == "AAA" for row in rows)
+
+
+def test_stop_loss_batch_endpoint_rejects_unknown_strategy(testclient: TestClient):
+    r = testclient.post(
+        "/stocks/stop-loss:batch", json={"symbols": ["AAA"], "strategies": ["magic"]}
+    )
+    assert r.status_code == 422
+
+
+def test_stop_loss_backtest_endpoint_returns_summaries_and_errors(
+    testclient: TestClient, monkeypatch
+):
+    values = [50 + 10 * math.sin(i / 15) + i / 20 for i in range(400)]
+    frames = {"AAA": _make_daily_df(values)[::-1].reset_index(drop=True)}
+
+    def fake_get_stock_data(self, symbol, days):
+        if symbol not in frames:
+            raise RuntimeError(f"No historical data returned for symbol '{symbol}'")
+        return frames[symbol]
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+
+    r = testclient.post(
+        "/stocks/stop-loss:backtest",
+        json={"symbols": ["AAA", "ZZZ"], "periodicity": "W", "strategy": "donchian"},
+    )
+
+    assert r.status_code == 200
+    data = r.json()
+    row = data["results"][0]
+    assert (row["symbol"], row["period"], row["strategy"]) == ("AAA", "W", "donchian")
+    assert row["stop_hits"] == len(row["hits"]) > 0
+    assert row["hits"][0]["date"].startswith("20")
+    assert data["errors"][0]["symbol"] == "ZZZ"
+
+
+def test_stop_loss_backtest_endpoint_rejects_unknown_strategy(testclient: TestClient):
+    r = testclient.post(
+        "/stocks/stop-loss:backtest", json={"symbols": ["AAA"], "strategy": "moon"}
+    )
+    assert r.status_code == 422
@@ -0,0 +1,17 @@
+from starlette.testclient import TestClient
+
+from app.infrastructure.adapters.fmp_price_data_repository import FmpPriceDataRepository
+from app.infrastructure.http_resilience import CircuitOpenError
+
+
+def test_open_circuit_maps_to_503_with_retry_after(testclient: TestClient, monkeypatch):
+    def fake_get_stock_data(self, symbol, days):
+        raise CircuitOpenError(retry_in=3.2)
+
+    monkeypatch.setattr(FmpPriceDataRepository, "get_stock_data", fake_get_stock_data)
+
+    r = testclient.get("/stocks/AAA/macd-minima?days=30")
+
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "4"
+    assert "circuit open" in r.json()["detail"]